@@ -12,12 +12,13 @@ Autor: Edson Deveza
 
 from __future__ import annotations
 
-import sqlite3
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 import streamlit as st
 
+from src.database import obter_conexao
+
 
 # ============================================================
 # Configurações gerais
@@ -85,7 +86,7 @@ def carregar_metricas_biblia(caminho_banco: Path) -> Tuple[int, int, int]:
     Se algo der errado, retorna (0, 0, 0).
     """
     try:
-        conn = sqlite3.connect(caminho_banco)
+        conn = obter_conexao(str(caminho_banco))
         cur = conn.cursor()
 
         # n_livros
@@ -105,7 +106,6 @@ def carregar_metricas_biblia(caminho_banco: Path) -> Tuple[int, int, int]:
         cur.execute("SELECT COUNT(*) FROM verse;")
         n_versiculos = cur.fetchone()[0] or 0
 
-        conn.close()
         return int(n_livros), int(n_capitulos), int(n_versiculos)
     except Exception:
         # Se quiser, aqui você pode integrar com seu sistema de logger
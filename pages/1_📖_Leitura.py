@@ -14,7 +14,7 @@ from src.ui_utils import garantir_versao_selecionada
 from src.logger import log_leitura, log_erro
 from src.error_handler import handle_database_error, show_connection_error
 from src.database import (
-    conectar_banco,
+    obter_conexao,
     carregar_testamentos,
     carregar_livros_testamento,
     carregar_capitulos,
@@ -46,7 +46,7 @@ caminho_banco = garantir_versao_selecionada()
 
 # Conectar ao banco
 try:
-    conexao = conectar_banco(str(caminho_banco))
+    conexao = obter_conexao(str(caminho_banco))
 except Exception as e:
     log_erro("leitura_conexao", e)
     show_connection_error()
@@ -66,7 +66,6 @@ try:
         testamentos = carregar_testamentos(conexao)
         if testamentos.empty:
             st.error("Nenhum testamento encontrado.")
-            conexao.close()
             st.stop()
 
         testamento = st.selectbox(
@@ -95,7 +94,6 @@ try:
                 "Isso normalmente acontece quando os códigos de testamento "
                 "(1=VT e 2=NT) não batem com a tabela `testament` do banco."
             )
-            conexao.close()
             st.stop()
 
         livro = st.selectbox(
@@ -108,7 +106,6 @@ try:
 except Exception as e:
     log_erro("leitura_navegacao", e)
     handle_database_error(e, "navegação")
-    conexao.close()
     st.stop()
 
 # === LISTA DE CAPÍTULOS ===
@@ -116,7 +113,6 @@ try:
     capitulos = carregar_capitulos(conexao, livro_id)
     if capitulos.empty:
         st.warning("Nenhum capítulo encontrado.")
-        conexao.close()
         st.stop()
 
     lista_caps = sorted(list(capitulos["chapter"]))
@@ -124,7 +120,6 @@ try:
 except Exception as e:
     log_erro("leitura_capitulos", e)
     handle_database_error(e, "carregamento de capítulos")
-    conexao.close()
     st.stop()
 
 # Inicializar capítulo atual no session_state
@@ -212,21 +207,21 @@ espacamentos = {"Compacto": "5px", "Normal": "10px", "Amplo": "15px"}
 st.markdown(f"## {livro} {capitulo}")
 
 try:
-    versiculos = carregar_versiculos(conexao, livro_id, capitulo)
+    # Arrow: colunas lidas direto do cursor, sem DataFrame
+    versiculos = carregar_versiculos(conexao, livro_id, capitulo, formato="arrow")
     log_leitura(livro, capitulo, versao_atual)
 except Exception as e:
     log_erro("leitura_versiculos", e, f"{livro} {capitulo}")
     handle_database_error(e, "carregamento de versículos")
-    conexao.close()
     st.stop()
 
-if versiculos.empty:
+if versiculos.num_rows == 0:
     st.warning("⚠️ Nenhum versículo encontrado.")
 else:
-    for _, row in versiculos.iterrows():
-        versiculo_num = row["Versículo"]
-        texto = row["Texto"]
-
+    for versiculo_num, texto in zip(
+        versiculos.column("Versículo").to_pylist(),
+        versiculos.column("Texto").to_pylist(),
+    ):
         col_texto, col_acoes = st.columns([5, 1])
 
         with col_texto:
@@ -288,7 +283,7 @@ with col1:
     st.metric("Livro", livro)
 
 with col2:
-    total_versiculos = len(versiculos) if not versiculos.empty else 0
+    total_versiculos = versiculos.num_rows
     st.metric("Versículos no capítulo", total_versiculos)
 
 with col3:
@@ -298,5 +293,3 @@ with col3:
         if a["livro"] == livro and a["capitulo"] == capitulo
     ]
     st.metric("Anotações", len(anotacoes_capitulo))
-
-conexao.close()
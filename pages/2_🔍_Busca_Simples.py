@@ -21,16 +21,39 @@ RAIZ_PROJETO = Path(__file__).parent.parent.absolute()
 if str(RAIZ_PROJETO) not in sys.path:
     sys.path.insert(0, str(RAIZ_PROJETO))
 
-from src.database import conectar_banco, buscar_versiculos
+from src.database import (
+    autocompletar,
+    buscar_em_todas_versoes,
+    buscar_referencia,
+    buscar_versiculos,
+    buscar_versiculos_paginado,
+    obter_conexao,
+    sugerir_termos,
+)
 from src.export import (
     exportar_csv,
     exportar_xlsx,
+    exportar_parquet,
     exportar_pdf,
     exportar_html,
 )
-from src.error_handler import handle_database_error, show_connection_error
+from src.error_handler import (
+    handle_database_error,
+    show_connection_error,
+    validate_search_input,
+)
 from src.logger import log_busca, log_erro
-from src.ui_utils import garantir_versao_selecionada
+from src.ui_utils import (
+    garantir_versao_selecionada,
+    nome_amigavel_versao,
+    seletor_completar,
+)
+
+# Versículos exibidos no modo "mais relevantes"
+LIMITE_RELEVANCIA = 50
+
+# Versículos por página na ordem bíblica
+TAMANHO_PAGINA = 50
 
 # === Configuração da página ===
 st.set_page_config(
@@ -49,6 +72,10 @@ if "disparar_busca" not in st.session_state:
 if "historico_buscas" not in st.session_state:
     st.session_state.historico_buscas = []
 
+# Busca na ordem bíblica em andamento: parâmetros e pilha de cursores
+if "busca_paginada" not in st.session_state:
+    st.session_state.busca_paginada = None
+
 # === Título ===
 st.title("🔍 Busca Simples")
 
@@ -57,7 +84,7 @@ caminho_banco = garantir_versao_selecionada()
 
 # === Conectar ao banco ===
 try:
-    conexao = conectar_banco(str(caminho_banco))
+    conexao = obter_conexao(str(caminho_banco))
 except Exception as e:
     log_erro("busca_simples_conexao", e)
     show_connection_error()
@@ -69,8 +96,9 @@ versao_atual = st.session_state.get("versao_biblia") or st.session_state.get(
 st.markdown(f"**Versão atual:** {versao_atual}")
 
 st.info(
-    "💡 **Dica:** Digite uma palavra ou frase para buscar em toda a Bíblia. "
-    "Para mais opções, use a **Busca Avançada**."
+    "💡 **Dica:** Digite uma palavra ou frase para buscar em toda a Bíblia, "
+    "ou uma referência (ex.: Jo 3:16, Sl 23, Rm 8:28-39) para ir direto "
+    "aos versículos. Para mais opções, use a **Busca Avançada**."
 )
 
 # === Preencher campo se veio de sugestões ===
@@ -79,26 +107,162 @@ if st.session_state.sugestao_aplicada:
     st.session_state.sugestao_aplicada = None
 
 
+# ==========================================================
+# SUGESTÕES "VOCÊ QUIS DIZER"
+# ==========================================================
+def aplicar_sugestao(sugestao: str) -> None:
+    """Callback dos botões de sugestão: refaz a busca com o termo."""
+    st.session_state.sugestao_aplicada = sugestao
+    st.session_state.disparar_busca = True
+
+
+def mostrar_sugestoes(termo: str) -> None:
+    """
+    Oferece termos do vocabulário da versão quando a busca não
+    encontra nada: palavras parecidas (erro de digitação) e palavras
+    que completam a última digitada (ex.: "salva" → "salvação").
+    """
+    try:
+        sugestoes_termo = sugerir_termos(conexao, termo)
+        for completo in autocompletar(conexao, termo.strip(), limite=4):
+            if completo not in sugestoes_termo:
+                sugestoes_termo.append(completo)
+    except Exception as e:
+        log_erro("busca_simples_sugestoes", e, termo)
+        return
+
+    if not sugestoes_termo:
+        return
+
+    st.markdown("**Você quis dizer:**")
+    colunas = st.columns(len(sugestoes_termo))
+    for i, sugestao in enumerate(sugestoes_termo):
+        with colunas[i]:
+            # Callback: os botões são criados dentro da busca e não
+            # existem no rerun seguinte
+            st.button(
+                f"🔎 {sugestao}",
+                key=f"voce_quis_dizer_{i}",
+                on_click=aplicar_sugestao,
+                args=(sugestao,),
+            )
+
+
+# ==========================================================
+# REFERÊNCIAS ("Jo 3:16")
+# ==========================================================
+def mostrar_referencia(termo: str, versiculos) -> None:
+    """Exibe os versículos de uma referência digitada na busca."""
+    if versiculos.empty:
+        st.warning(f"A referência '{termo}' não existe nesta versão.")
+        return
+
+    primeiro = versiculos.iloc[0]
+    st.subheader(f"📖 {primeiro['Livro']} {primeiro['Capítulo']}")
+    for _, linha in versiculos.iterrows():
+        st.markdown(f"**{linha['Versículo']}** {linha['Texto']}")
+
+
 # ==========================================================
 # FUNÇÃO PRINCIPAL DA BUSCA
 # ==========================================================
-def executar_busca(termo: str, filtro_testamento: str, testamento_id: int | None):
+LIVROS_VT = [
+    "Gênesis", "Êxodo", "Levítico", "Números", "Deuteronômio",
+    "Josué", "Juízes", "Rute", "1 Samuel", "2 Samuel",
+    "1 Reis", "2 Reis", "1 Crônicas", "2 Crônicas",
+    "Esdras", "Neemias", "Ester", "Jó", "Salmos", "Provérbios",
+    "Eclesiastes", "Cânticos", "Isaías", "Jeremias",
+    "Lamentações", "Ezequiel", "Daniel", "Oséias", "Joel",
+    "Amós", "Obadias", "Jonas", "Miquéias", "Naum",
+    "Habacuque", "Sofonias", "Ageu", "Zacarias", "Malaquias",
+]
+
+
+def com_testamento(resultados):
+    """Acrescenta a coluna 'Testamento' (VT/NT) pelo nome do livro."""
+    resultados = resultados.copy()
+    resultados["Testamento"] = resultados["Livro"].apply(
+        lambda x: "VT" if x in LIVROS_VT else "NT"
+    )
+    return resultados
+
+
+def registrar_historico(
+    termo: str,
+    resultados,
+    filtro_testamento: str,
+    tempo_ms: int,
+) -> None:
+    """Guarda a busca no histórico da sessão (10 mais recentes)."""
+    st.session_state.historico_buscas.insert(
+        0,
+        {
+            "termo": termo,
+            "resultados": resultados,
+            "tipo": "Busca Simples",
+            "testamento": filtro_testamento,
+            "tempo_ms": tempo_ms,
+        },
+    )
+    st.session_state.historico_buscas = st.session_state.historico_buscas[:10]
+
+
+def executar_busca(
+    termo: str,
+    filtro_testamento: str,
+    testamento_id: int | None,
+    por_relevancia: bool = False,
+    por_radical: bool = False,
+):
     """
     Executa a busca simples no banco de dados.
+
+    Na ordem bíblica, a busca só é registrada na sessão e os resultados
+    são mostrados página a página (`mostrar_pagina_busca`); no modo
+    "mais relevantes" vêm de uma vez (no máximo LIMITE_RELEVANCIA).
     """
     import time
 
+    st.session_state.busca_paginada = None
+
     if not termo.strip():
         st.warning("Digite um termo para buscar.")
         return None
 
+    valido, mensagem = validate_search_input(termo)
+    if not valido:
+        st.warning(mensagem)
+        return None
+
     try:
+        # Referência ("Jo 3:16"): vai direto aos versículos
+        versiculos = buscar_referencia(conexao, termo)
+        if versiculos is not None:
+            mostrar_referencia(termo.strip(), versiculos)
+            return None
+
+        if not por_relevancia:
+            st.session_state.busca_paginada = {
+                "termo": termo,
+                "testamento_id": testamento_id,
+                "filtro_testamento": filtro_testamento,
+                "por_radical": por_radical,
+                "cursores": [None],
+                "nova": True,
+                "exportar": False,
+            }
+            return None
+
         inicio = time.time()
 
         resultados = buscar_versiculos(
             conexao,
             termo=termo,
             testamento_id=testamento_id,
+            relevancia=True,
+            limite=LIMITE_RELEVANCIA,
+            destaques=True,
+            por_radical=por_radical,
         )
 
         fim = time.time()
@@ -106,103 +270,276 @@ def executar_busca(termo: str, filtro_testamento: str, testamento_id: int | None
 
         if resultados is None or resultados.empty:
             st.warning("Nenhum versículo encontrado para o termo informado.")
+            mostrar_sugestoes(termo)
             return None
 
         # Registrar log
         log_busca(termo, len(resultados), tempo_ms, tipo="simples")
-
-        # SALVAR NO HISTÓRICO
-        st.session_state.historico_buscas.insert(
-            0,
-            {
-                "termo": termo,
-                "resultados": len(resultados),
-                "tipo": "Busca Simples",
-                "testamento": filtro_testamento,
-                "tempo_ms": tempo_ms,
-            },
-        )
-        st.session_state.historico_buscas = st.session_state.historico_buscas[:10]
+        registrar_historico(termo, len(resultados), filtro_testamento, tempo_ms)
 
         st.success(
-            f"🔎 Encontrados **{len(resultados)}** versículos contendo "
+            f"🔎 Os **{len(resultados)}** versículos mais relevantes para "
             f"'{termo}' em **{tempo_ms}ms**"
         )
+        mostrar_metricas(resultados)
 
-        # MÉTRICAS RÁPIDAS
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.metric("Livros Encontrados", resultados["Livro"].nunique())
-
-        livros_vt = [
-            "Gênesis", "Êxodo", "Levítico", "Números", "Deuteronômio",
-            "Josué", "Juízes", "Rute", "1 Samuel", "2 Samuel",
-            "1 Reis", "2 Reis", "1 Crônicas", "2 Crônicas",
-            "Esdras", "Neemias", "Ester", "Jó", "Salmos", "Provérbios",
-            "Eclesiastes", "Cânticos", "Isaías", "Jeremias",
-            "Lamentações", "Ezequiel", "Daniel", "Oséias", "Joel",
-            "Amós", "Obadias", "Jonas", "Miquéias", "Naum",
-            "Habacuque", "Sofonias", "Ageu", "Zacarias", "Malaquias",
+        # LISTAGEM EM TABELA (já vem do mais para o menos relevante)
+        st.markdown("---")
+        st.subheader("📋 Resultados da Busca")
+        colunas = [
+            "Testamento", "Livro", "Capítulo", "Versículo", "Texto", "Relevância"
         ]
+        st.dataframe(
+            com_testamento(resultados)[colunas].reset_index(drop=True),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        mostrar_exportacao(resultados, termo)
+
+    except Exception as e:
+        log_erro("busca_simples_execucao", e, termo)
+        handle_database_error(e, "busca")
+
 
-        resultados["Testamento"] = resultados["Livro"].apply(
-            lambda x: "VT" if x in livros_vt else "NT"
+def mostrar_metricas(resultados) -> None:
+    """Métricas rápidas: livros e versículos por testamento."""
+    resultados = com_testamento(resultados)
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Livros Encontrados", resultados["Livro"].nunique())
+
+    with col2:
+        st.metric(
+            "Versículos no VT",
+            resultados[resultados["Testamento"] == "VT"].shape[0],
         )
 
-        with col2:
-            st.metric(
-                "Versículos no VT",
-                resultados[resultados["Testamento"] == "VT"].shape[0],
-            )
+    with col3:
+        st.metric(
+            "Versículos no NT",
+            resultados[resultados["Testamento"] == "NT"].shape[0],
+        )
 
-        with col3:
-            st.metric(
-                "Versículos no NT",
-                resultados[resultados["Testamento"] == "NT"].shape[0],
-            )
 
-        # LISTAGEM EM TABELA
-        st.markdown("---")
-        st.subheader("📋 Resultados da Busca")
+def mostrar_exportacao(resultados, termo: str) -> None:
+    """Botões de exportação dos resultados."""
+    st.markdown("---")
+    st.subheader("📥 Exportar Resultados")
+
+    colE1, colE2, colE3, colE4, colE5 = st.columns(5)
 
-        resultados = resultados.sort_values(
-            by=["Testamento", "Livro", "Capítulo", "Versículo"]
+    with colE1:
+        exportar_csv(resultados, f"busca_simples_{termo}")
+
+    with colE2:
+        exportar_xlsx(resultados, f"busca_simples_{termo}")
+
+    with colE3:
+        exportar_pdf(
+            resultados, f"Busca Simples: {termo}", f"busca_simples_{termo}"
         )
 
-        st.dataframe(
-            resultados[
-                ["Testamento", "Livro", "Capítulo", "Versículo", "Texto"]
-            ].reset_index(drop=True),
+    with colE4:
+        exportar_html(
+            resultados,
+            f"Busca Simples: {termo}",
+            f"busca_simples_{termo}",
+        )
+
+    with colE5:
+        exportar_parquet(resultados, f"busca_simples_{termo}")
+
+
+# ==========================================================
+# RESULTADOS PÁGINA A PÁGINA (ORDEM BÍBLICA)
+# ==========================================================
+def avancar_pagina(proximo: str) -> None:
+    """Callback do botão "Próxima": empilha o cursor da página seguinte."""
+    st.session_state.busca_paginada["cursores"].append(proximo)
+
+
+def voltar_pagina() -> None:
+    """Callback do botão "Anterior": desempilha o cursor atual."""
+    st.session_state.busca_paginada["cursores"].pop()
+
+
+def pedir_exportacao() -> None:
+    """Callback do botão de exportação: carrega todos os resultados."""
+    st.session_state.busca_paginada["exportar"] = True
+
+
+def mostrar_pagina_busca() -> None:
+    """
+    Mostra a página atual da busca registrada em `busca_paginada`.
+
+    Cada página é lida com `buscar_versiculos_paginado` a partir do
+    cursor guardado na sessão, então a primeira aparece sem esperar
+    pelo resultado completo e a sessão não guarda os textos. O
+    resultado completo (métricas e exportação) só é montado quando
+    pedido.
+    """
+    import time
+
+    busca = st.session_state.busca_paginada
+    termo = busca["termo"]
+    cursores = busca["cursores"]
+
+    try:
+        inicio = time.time()
+        pagina, proximo = buscar_versiculos_paginado(
+            conexao,
+            termo,
+            testamento_id=busca["testamento_id"],
+            cursor=cursores[-1],
+            tamanho_pagina=TAMANHO_PAGINA,
+            por_radical=busca["por_radical"],
+        )
+        tempo_ms = int((time.time() - inicio) * 1000)
+    except Exception as e:
+        log_erro("busca_simples_pagina", e, termo)
+        handle_database_error(e, "busca")
+        st.session_state.busca_paginada = None
+        return
+
+    if pagina.empty and len(cursores) == 1:
+        st.warning("Nenhum versículo encontrado para o termo informado.")
+        mostrar_sugestoes(termo)
+        st.session_state.busca_paginada = None
+        return
+
+    if busca["nova"]:
+        busca["nova"] = False
+        quantidade = len(pagina) if proximo is None else f"{len(pagina)}+"
+        log_busca(termo, len(pagina), tempo_ms, tipo="simples")
+        registrar_historico(
+            termo, quantidade, busca["filtro_testamento"], tempo_ms
+        )
+
+    primeiro = (len(cursores) - 1) * TAMANHO_PAGINA + 1
+    st.success(
+        f"🔎 Versículos **{primeiro}–{primeiro + len(pagina) - 1}** contendo "
+        f"'{termo}' em **{tempo_ms}ms**"
+    )
+
+    st.markdown("---")
+    st.subheader("📋 Resultados da Busca")
+
+    colunas = ["Testamento", "Livro", "Capítulo", "Versículo", "Texto"]
+    st.dataframe(
+        com_testamento(pagina)[colunas],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    colP1, colP2, colP3 = st.columns([1, 1, 3])
+    with colP1:
+        st.button(
+            "⬅️ Anterior",
+            key="pagina_anterior_simples",
+            on_click=voltar_pagina,
+            disabled=len(cursores) == 1,
             use_container_width=True,
-            hide_index=True,
         )
+    with colP2:
+        st.button(
+            "Próxima ➡️",
+            key="pagina_proxima_simples",
+            on_click=avancar_pagina,
+            args=(proximo,),
+            disabled=proximo is None,
+            use_container_width=True,
+        )
+    with colP3:
+        st.caption(f"Página {len(cursores)}")
+
+    if not busca["exportar"]:
+        st.button(
+            "📊 Resumo e exportação de todos os resultados",
+            key="exportar_busca_simples",
+            on_click=pedir_exportacao,
+        )
+        return
 
-        # EXPORTAÇÃO
-        st.markdown("---")
-        st.subheader("📥 Exportar Resultados")
+    try:
+        resultados = buscar_versiculos(
+            conexao,
+            termo=termo,
+            testamento_id=busca["testamento_id"],
+            destaques=True,
+            por_radical=busca["por_radical"],
+        )
+    except Exception as e:
+        log_erro("busca_simples_exportacao", e, termo)
+        handle_database_error(e, "busca")
+        return
 
-        colE1, colE2, colE3, colE4 = st.columns(4)
+    st.markdown("---")
+    st.subheader(f"📊 Todos os resultados: {len(resultados)} versículos")
+    mostrar_metricas(resultados)
+    mostrar_exportacao(resultados, termo)
 
-        with colE1:
-            exportar_csv(resultados, f"busca_simples_{termo}")
 
-        with colE2:
-            exportar_xlsx(resultados, f"busca_simples_{termo}")
+# ==========================================================
+# BUSCA EM TODAS AS VERSÕES
+# ==========================================================
+def executar_busca_todas_versoes(termo: str, testamento_id: int | None):
+    """
+    Responde "quais traduções usam a palavra X?": a mesma busca em
+    todas as versões da pasta data, em paralelo.
+    """
+    import time
 
-        with colE3:
-            exportar_pdf(
-                resultados, f"Busca Simples: {termo}", f"busca_simples_{termo}"
-            )
+    if not termo.strip():
+        st.warning("Digite um termo para buscar.")
+        return
 
-        with colE4:
-            exportar_html(
-                resultados, f"Busca Simples: {termo}", f"busca_simples_{termo}"
-            )
+    valido, mensagem = validate_search_input(termo)
+    if not valido:
+        st.warning(mensagem)
+        return
 
+    try:
+        inicio = time.time()
+        with st.spinner("Buscando em todas as versões..."):
+            contagens, resultados = buscar_em_todas_versoes(
+                termo, testamento_id=testamento_id
+            )
+        tempo_ms = int((time.time() - inicio) * 1000)
     except Exception as e:
-        log_erro("busca_simples_execucao", e, termo)
+        log_erro("busca_simples_todas_versoes", e, termo)
         handle_database_error(e, "busca")
+        return
+
+    st.success(
+        f"🔎 '{termo}' aparece em **{sum(1 for n in contagens.values() if n)}** "
+        f"de **{len(contagens)}** versões ({tempo_ms}ms)"
+    )
+
+    st.subheader("📊 Versículos por versão")
+    st.dataframe(
+        [
+            {
+                "Versão": versao,
+                "Nome": nome_amigavel_versao(versao),
+                "Versículos": quantidade,
+            }
+            for versao, quantidade in contagens.items()
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    if resultados.empty:
+        st.warning("Nenhum versículo encontrado em nenhuma versão.")
+        mostrar_sugestoes(termo)
+        return
+
+    st.subheader("📋 Versículos encontrados")
+    st.dataframe(resultados, use_container_width=True, hide_index=True)
+
+    exportar_csv(resultados, f"busca_todas_versoes_{termo}")
 
 
 # ==========================================================
@@ -212,27 +549,50 @@ st.markdown("---")
 
 st.subheader("📝 Parâmetros da Busca")
 
-with st.form("form_busca_simples"):
-    colF1, colF2 = st.columns([3, 1])
-
-    with colF1:
-        termo_busca = st.text_input(
-            "Termo de busca",
-            key="input_busca_simples",
-            value=st.session_state.get("input_busca_simples", ""),
-            placeholder="Ex.: fé, graça, amor de Deus...",
-        )
+# Fora do formulário: cada Enter no campo atualiza o "Completar"
+colT1, colT2 = st.columns([3, 1])
 
-    with colF2:
-        filtro_testamento = st.selectbox(
-            "Testamento",
-            ["Todos", "Antigo Testamento", "Novo Testamento"],
-            index=0,
-        )
+with colT1:
+    termo_busca = st.text_input(
+        "Termo de busca",
+        key="input_busca_simples",
+        value=st.session_state.get("input_busca_simples", ""),
+        placeholder="Ex.: fé, graça, amor de Deus, salv*, Jo 3:16...",
+    )
+
+with colT2:
+    try:
+        completar = autocompletar(conexao, termo_busca)
+    except Exception as e:
+        log_erro("busca_simples_autocompletar", e, termo_busca)
+        completar = []
+    seletor_completar(completar, "input_busca_simples", "completar_busca_simples")
+
+with st.form("form_busca_simples"):
+    filtro_testamento = st.selectbox(
+        "Testamento",
+        ["Todos", "Antigo Testamento", "Novo Testamento"],
+        index=0,
+    )
 
     colFB1, colFB2 = st.columns([1, 4])
     with colFB1:
         disparar = st.form_submit_button("🔎 Buscar", use_container_width=True)
+        por_relevancia = st.checkbox(
+            "Mais relevantes",
+            help=(
+                f"Mostra só os {LIMITE_RELEVANCIA} versículos mais relevantes "
+                "(BM25), do mais para o menos relevante."
+            ),
+        )
+        por_radical = st.checkbox(
+            "Variações da palavra",
+            help="Encontra também outras formas: amar → amou, amará, amando...",
+        )
+        todas_versoes = st.checkbox(
+            "Todas as versões",
+            help="Busca o termo em todas as versões disponíveis ao mesmo tempo.",
+        )
 
     with colFB2:
         st.write(
@@ -252,7 +612,20 @@ if disparar:
 
 if st.session_state.disparar_busca:
     st.session_state.disparar_busca = False
-    executar_busca(termo_busca, filtro_testamento, testamento_id)
+    if todas_versoes:
+        st.session_state.busca_paginada = None
+        executar_busca_todas_versoes(termo_busca, testamento_id)
+    else:
+        executar_busca(
+            termo_busca,
+            filtro_testamento,
+            testamento_id,
+            por_relevancia,
+            por_radical,
+        )
+
+if st.session_state.busca_paginada:
+    mostrar_pagina_busca()
 
 
 # ==========================================================
@@ -312,6 +685,3 @@ for i, (label, termo_sugerido) in enumerate(sugestoes):
             st.session_state.sugestao_aplicada = termo_sugerido
             st.session_state.disparar_busca = True
             st.rerun()
-
-# Fechar conexão
-conexao.close()
@@ -10,15 +10,27 @@ Versão: 2.1
 """
 
 from __future__ import annotations
-from src.ui_utils import garantir_versao_selecionada
+from src.ui_utils import garantir_versao_selecionada, seletor_completar
 from src.logger import log_erro
-from src.error_handler import handle_database_error, show_connection_error
-from src.export import exportar_csv, exportar_xlsx, exportar_pdf, exportar_html
+from src.error_handler import (
+    handle_database_error,
+    show_connection_error,
+    validate_search_input,
+)
+from src.export import (
+    exportar_csv,
+    exportar_xlsx,
+    exportar_parquet,
+    exportar_pdf,
+    exportar_html,
+)
 from src.database import (
-    conectar_banco,
+    obter_conexao,
     carregar_testamentos,
     carregar_livros_testamento,
     buscar_versiculos_avancada,
+    buscar_versiculos_avancada_paginado,
+    autocompletar,
 )
 
 import sys
@@ -34,6 +46,12 @@ if str(RAIZ_PROJETO) not in sys.path:
     sys.path.insert(0, str(RAIZ_PROJETO))
 
 
+# Versículos exibidos no modo "mais relevantes"
+LIMITE_RELEVANCIA = 50
+
+# Versículos por página na ordem bíblica
+TAMANHO_PAGINA = 50
+
 # ============================================================
 # Configuração da página
 # ============================================================
@@ -52,6 +70,10 @@ st.title("🔍➕ Busca Avançada")
 if "historico_buscas" not in st.session_state:
     st.session_state.historico_buscas = []
 
+# Busca na ordem bíblica em andamento: parâmetros e pilha de cursores
+if "busca_avancada_paginada" not in st.session_state:
+    st.session_state.busca_avancada_paginada = None
+
 # Garante versão selecionada
 caminho_banco = garantir_versao_selecionada()
 
@@ -59,7 +81,7 @@ caminho_banco = garantir_versao_selecionada()
 # Conexão com o banco
 # ============================================================
 try:
-    conexao = conectar_banco(str(caminho_banco))
+    conexao = obter_conexao(str(caminho_banco))
 except Exception as e:
     log_erro("busca_avancada_conexao", e)
     show_connection_error()
@@ -72,7 +94,8 @@ st.markdown(f"**Versão atual:** {versao_atual}")
 
 st.info(
     "💡 **Use a busca avançada quando precisar combinar palavras, "
-    "filtrar por testamento/livro ou buscar uma frase exata.**"
+    "filtrar por testamento/livro ou buscar uma frase exata.** "
+    "Para excluir uma palavra, use `-` antes dela (ex.: `amor -irmão`)."
 )
 
 
@@ -84,12 +107,10 @@ try:
 except Exception as e:
     log_erro("busca_avancada_testamentos", e)
     handle_database_error(e, "carregamento de testamentos")
-    conexao.close()
     st.stop()
 
 if df_test.empty:
     st.error("Nenhum testamento encontrado no banco de dados.")
-    conexao.close()
     st.stop()
 
 map_test_id_nome = {int(r["id"]): r["name"] for _, r in df_test.iterrows()}
@@ -102,30 +123,68 @@ map_test_nome_id = {v: k for k, v in map_test_id_nome.items()}
 st.markdown("---")
 st.subheader("📝 Parâmetros da busca avançada")
 
-with st.form("form_busca_avancada"):
-    col_termo, col_frase = st.columns([3, 1])
+# Fora do formulário: cada Enter no campo atualiza o "Completar"
+col_termo, col_completar = st.columns([3, 1])
 
-    with col_termo:
-        termos_raw = st.text_input(
-            "Palavras ou frase para buscar",
-            placeholder="Ex.: graça salvadora; fé; amor de Deus; justificação pela fé...",
-        )
+with col_termo:
+    termos_raw = st.text_input(
+        "Palavras ou frase para buscar",
+        key="input_busca_avancada",
+        placeholder="Ex.: graça salvadora; fé; amor de Deus; amor -irmão...",
+    )
 
-    with col_frase:
-        busca_exata = st.checkbox(
-            "Frase exata?",
-            help="Se marcado, a busca será pela frase completa, na ordem digitada.",
-            value=False,
-        )
+with col_completar:
+    try:
+        completar = autocompletar(conexao, termos_raw)
+    except Exception as e:
+        log_erro("busca_avancada_autocompletar", e)
+        completar = []
+    seletor_completar(completar, "input_busca_avancada", "completar_busca_avancada")
+
+with st.form("form_busca_avancada"):
+    busca_exata = st.checkbox(
+        "Frase exata?",
+        help="Se marcado, a busca será pela frase completa, na ordem digitada.",
+        value=False,
+    )
+    por_relevancia = st.checkbox(
+        "Mais relevantes",
+        help=(
+            f"Mostra só os {LIMITE_RELEVANCIA} versículos mais relevantes "
+            "(BM25), do mais para o menos relevante."
+        ),
+        value=False,
+    )
+    por_radical = st.checkbox(
+        "Variações da palavra",
+        help="Encontra também outras formas: amar → amou, amará, amando...",
+        value=False,
+    )
 
-    col_op, col_test, col_livro = st.columns([1, 1.2, 2])
+    col_op, col_dist, col_test, col_livro = st.columns([1, 1, 1.2, 2])
 
     with col_op:
         operador = st.selectbox(
             "Operador",
-            options=["E", "OU"],
+            options=["E", "OU", "PERTO", "REGEX"],
             index=0,
-            help="E = todas as palavras devem aparecer; OU = qualquer uma das palavras.",
+            help=(
+                "E = todas as palavras devem aparecer; OU = qualquer uma das "
+                "palavras; PERTO = todas as palavras próximas umas das outras; "
+                "REGEX = o texto digitado é uma expressão regular. "
+                "Palavras com `-` na frente são excluídas (exceto no REGEX)."
+            ),
+            disabled=busca_exata,
+        )
+
+    with col_dist:
+        distancia = st.number_input(
+            "Distância (PERTO)",
+            min_value=0,
+            max_value=50,
+            value=5,
+            step=1,
+            help="Máximo de palavras entre os termos quando o operador é PERTO.",
             disabled=busca_exata,
         )
 
@@ -153,7 +212,6 @@ with st.form("form_busca_avancada"):
         except Exception as e:
             log_erro("busca_avancada_livros", e)
             handle_database_error(e, "carregamento de livros")
-            conexao.close()
             st.stop()
 
     with col_livro:
@@ -171,9 +229,17 @@ with st.form("form_busca_avancada"):
         st.write(
             "- Separe múltiplas palavras por espaço (ex.: `graça fé salvação`).  \n"
             "- Use **Frase exata** para buscar uma expressão completa.  \n"
+            "- Use **PERTO** para achar palavras próximas (ex.: `graça fé`, "
+            "distância 5).  \n"
+            "- Use **REGEX** para padrões (ex.: `\\bDeus (amou|enviou)\\b`).  \n"
             "- Combine Testamento + Livro para refinar ainda mais a busca."
         )
 
+# Frase exata ignora o operador (o seletor fica desabilitado, mas
+# mantém o último valor escolhido, que pode ser REGEX)
+if busca_exata:
+    operador = "E"
+
 livro_id: Optional[int]
 if livro_escolhido == "Todos":
     livro_id = None
@@ -190,74 +256,157 @@ def executar_busca_avancada():
         st.warning("Digite pelo menos uma palavra ou frase para buscar.")
         return
 
-    if busca_exata:
+    # A expressão do REGEX tem validação própria (compilação e tamanho)
+    if operador != "REGEX":
+        valido, mensagem = validate_search_input(termo_limpo)
+        if not valido:
+            st.warning(mensagem)
+            return
+
+    palavras = termo_limpo.split()
+    if operador == "REGEX":
+        # A expressão vai inteira, sem separar palavras nem exclusões
         termos = [termo_limpo]
+    elif busca_exata:
+        # A frase é o que sobra sem as exclusões (-palavra)
+        exclusoes = [p for p in palavras if p.startswith("-") and len(p) > 1]
+        frase = " ".join(p for p in palavras if p not in exclusoes)
+        termos = [frase] + exclusoes
     else:
-        termos = [t for t in termo_limpo.split() if t]
+        termos = palavras
+
+    label_contexto: list[str] = []
+    if filtro_testamento != "Todos":
+        label_contexto.append(filtro_testamento)
+    if livro_escolhido != "Todos":
+        label_contexto.append(livro_escolhido)
+
+    contexto_str = " / ".join(label_contexto) if label_contexto else "Toda a Bíblia"
+
+    busca = {
+        "termos_raw": termos_raw,
+        "termos": termos,
+        "operador": operador,
+        "testamento_id": testamento_id,
+        "livro_id": livro_id,
+        "busca_exata": busca_exata,
+        "distancia": int(distancia),
+        "por_radical": por_radical,
+        "filtro_testamento": filtro_testamento,
+        "livro_escolhido": livro_escolhido,
+        "contexto": contexto_str,
+        "cursores": [None],
+        "nova": True,
+        "exportar": False,
+    }
+    if not por_relevancia or operador == "REGEX":
+        # Ordem bíblica (a do REGEX, sempre): página a página (ver
+        # `mostrar_pagina_avancada`)
+        st.session_state.busca_avancada_paginada = busca
+        return
 
     try:
         inicio = time.time()
+        resultados = buscar_completa(busca, relevancia=True)
+        tempo_ms = int((time.time() - inicio) * 1000)
+    except Exception as e:
+        tratar_erro_busca(e, busca)
+        return
 
-        resultados = buscar_versiculos_avancada(
-            conexao=conexao,
-            termos=termos,
-            operador=operador,
-            testamento_id=testamento_id,
-            livro_id=livro_id,
-            busca_exata=busca_exata,
-        )
+    if resultados is None or resultados.empty:
+        avisar_sem_resultados(termos_raw)
+        return
 
-        fim = time.time()
-        tempo_ms = int((fim - inicio) * 1000)
-    except Exception as e:
+    registrar_historico(busca, len(resultados), tempo_ms)
+
+    st.success(
+        f"🔎 **{len(resultados)}** versículos mais relevantes "
+        f"para **'{termos_raw}'** em **{busca['contexto']}** "
+        f"({tempo_ms}ms)."
+    )
+    mostrar_metricas(resultados)
+
+    st.markdown("---")
+    st.subheader("📋 Resultados da busca")
+
+    # Já vem do mais para o menos relevante
+    resultados_ord = resultados.reset_index(drop=True)
+    st.dataframe(
+        resultados_ord[["Livro", "Capítulo", "Versículo", "Texto", "Relevância"]],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    mostrar_exportacao(resultados_ord, termos_raw)
+
+
+def buscar_completa(busca: dict, relevancia: bool = False):
+    """Resultado completo da busca registrada (com os destaques)."""
+    return buscar_versiculos_avancada(
+        conexao=conexao,
+        termos=busca["termos"],
+        operador=busca["operador"],
+        testamento_id=busca["testamento_id"],
+        livro_id=busca["livro_id"],
+        busca_exata=busca["busca_exata"],
+        distancia=busca["distancia"],
+        relevancia=relevancia,
+        limite=LIMITE_RELEVANCIA,
+        destaques=True,
+        por_radical=busca["por_radical"],
+    )
+
+
+def tratar_erro_busca(e: Exception, busca: dict) -> None:
+    """Mensagem de erro da busca (expressão inválida, tempo esgotado...)."""
+    if isinstance(e, ValueError):
+        st.error(f"❌ {e}")
+    elif isinstance(e, TimeoutError):
+        st.error(
+            "⏱️ A busca demorou demais e foi interrompida. "
+            "Refine a expressão ou filtre por testamento/livro."
+        )
+    else:
         log_erro(
             "busca_avancada_execucao",
             e,
-            detalhes=f"termos={termos}, operador={operador}",
+            detalhes=f"termos={busca['termos']}, operador={busca['operador']}",
         )
         handle_database_error(e, "busca avançada")
-        return
 
-    if resultados is None or resultados.empty:
-        st.warning(
-            f"⚠️ Nenhum versículo encontrado com os termos '{termos_raw}'."
-        )
-        st.info(
-            "💡 **Sugestões:**\n"
-            "- Teste outro operador lógico (E/OU)\n"
-            "- Reduza a quantidade de palavras\n"
-            "- Tente apenas uma palavra-chave principal\n"
-            "- Use a opção de busca por frase exata apenas quando necessário"
-        )
-        return
 
+def avisar_sem_resultados(termos_raw: str) -> None:
+    """Aviso e dicas quando a busca não encontra nada."""
+    st.warning(
+        f"⚠️ Nenhum versículo encontrado com os termos '{termos_raw}'."
+    )
+    st.info(
+        "💡 **Sugestões:**\n"
+        "- Teste outro operador lógico (E/OU/PERTO)\n"
+        "- Reduza a quantidade de palavras\n"
+        "- Tente apenas uma palavra-chave principal\n"
+        "- Use a opção de busca por frase exata apenas quando necessário"
+    )
+
+
+def registrar_historico(busca: dict, resultados, tempo_ms: int) -> None:
+    """Guarda a busca no histórico da sessão (10 mais recentes)."""
     st.session_state.historico_buscas.insert(
         0,
         {
-            "termo": termos_raw,
-            "resultados": len(resultados),
+            "termo": busca["termos_raw"],
+            "resultados": resultados,
             "tipo": "Busca Avançada",
-            "testamento": filtro_testamento,
-            "livro": livro_escolhido,
+            "testamento": busca["filtro_testamento"],
+            "livro": busca["livro_escolhido"],
             "tempo_ms": tempo_ms,
         },
     )
     st.session_state.historico_buscas = st.session_state.historico_buscas[:10]
 
-    label_contexto: list[str] = []
-    if filtro_testamento != "Todos":
-        label_contexto.append(filtro_testamento)
-    if livro_escolhido != "Todos":
-        label_contexto.append(livro_escolhido)
-
-    contexto_str = " / ".join(label_contexto) if label_contexto else "Toda a Bíblia"
-
-    st.success(
-        f"🔎 Encontrados **{len(resultados)}** versículos "
-        f"para **'{termos_raw}'** em **{contexto_str}** "
-        f"({tempo_ms}ms)."
-    )
 
+def mostrar_metricas(resultados) -> None:
+    """Métricas rápidas: livros, capítulos e versículos."""
     col_m1, col_m2, col_m3 = st.columns(3)
     with col_m1:
         st.metric("Livros encontrados", resultados["Livro"].nunique())
@@ -269,43 +418,157 @@ def executar_busca_avancada():
     with col_m3:
         st.metric("Total de versículos", len(resultados))
 
-    st.markdown("---")
-    st.subheader("📋 Resultados da busca")
-
-    resultados_ord = resultados.sort_values(
-        by=["Livro", "Capítulo", "Versículo"]
-    ).reset_index(drop=True)
-
-    st.dataframe(
-        resultados_ord[["Livro", "Capítulo", "Versículo", "Texto"]],
-        use_container_width=True,
-        hide_index=True,
-    )
 
+def mostrar_exportacao(resultados, termos_raw: str) -> None:
+    """Botões de exportação dos resultados."""
     st.markdown("---")
     st.subheader("📥 Exportar resultados")
 
-    col_e1, col_e2, col_e3, col_e4 = st.columns(4)
+    col_e1, col_e2, col_e3, col_e4, col_e5 = st.columns(5)
     base_nome = f"busca_avancada_{termos_raw.replace(' ', '_')}"
 
     with col_e1:
-        exportar_csv(resultados_ord, base_nome)
+        exportar_csv(resultados, base_nome)
     with col_e2:
-        exportar_xlsx(resultados_ord, base_nome)
+        exportar_xlsx(resultados, base_nome)
     with col_e3:
-        exportar_pdf(resultados_ord,
+        exportar_pdf(resultados,
                      f"Busca Avançada: {termos_raw}", base_nome)
     with col_e4:
         exportar_html(
-            resultados_ord,
+            resultados,
             f"Busca Avançada: {termos_raw}",
             base_nome,
         )
+    with col_e5:
+        exportar_parquet(resultados, base_nome)
+
+
+# ============================================================
+# Resultados página a página (ordem bíblica)
+# ============================================================
+def avancar_pagina(proximo: str) -> None:
+    """Callback do botão "Próxima": empilha o cursor da página seguinte."""
+    st.session_state.busca_avancada_paginada["cursores"].append(proximo)
+
+
+def voltar_pagina() -> None:
+    """Callback do botão "Anterior": desempilha o cursor atual."""
+    st.session_state.busca_avancada_paginada["cursores"].pop()
+
+
+def pedir_exportacao() -> None:
+    """Callback do botão de exportação: carrega todos os resultados."""
+    st.session_state.busca_avancada_paginada["exportar"] = True
+
+
+def mostrar_pagina_avancada() -> None:
+    """
+    Mostra a página atual da busca registrada em
+    `busca_avancada_paginada`.
+
+    Cada página é lida com `buscar_versiculos_avancada_paginado` a
+    partir do cursor guardado na sessão; o resultado completo
+    (métricas e exportação) só é montado quando pedido.
+    """
+    busca = st.session_state.busca_avancada_paginada
+    termos_raw = busca["termos_raw"]
+    cursores = busca["cursores"]
+
+    try:
+        inicio = time.time()
+        pagina, proximo = buscar_versiculos_avancada_paginado(
+            conexao,
+            busca["termos"],
+            operador=busca["operador"],
+            testamento_id=busca["testamento_id"],
+            livro_id=busca["livro_id"],
+            busca_exata=busca["busca_exata"],
+            distancia=busca["distancia"],
+            cursor=cursores[-1],
+            tamanho_pagina=TAMANHO_PAGINA,
+            por_radical=busca["por_radical"],
+        )
+        tempo_ms = int((time.time() - inicio) * 1000)
+    except Exception as e:
+        tratar_erro_busca(e, busca)
+        st.session_state.busca_avancada_paginada = None
+        return
+
+    if pagina.empty and len(cursores) == 1:
+        avisar_sem_resultados(termos_raw)
+        st.session_state.busca_avancada_paginada = None
+        return
+
+    if busca["nova"]:
+        busca["nova"] = False
+        quantidade = len(pagina) if proximo is None else f"{len(pagina)}+"
+        registrar_historico(busca, quantidade, tempo_ms)
+
+    primeiro = (len(cursores) - 1) * TAMANHO_PAGINA + 1
+    st.success(
+        f"🔎 Versículos **{primeiro}–{primeiro + len(pagina) - 1}** "
+        f"encontrados para **'{termos_raw}'** em **{busca['contexto']}** "
+        f"({tempo_ms}ms)."
+    )
+
+    st.markdown("---")
+    st.subheader("📋 Resultados da busca")
+
+    st.dataframe(
+        pagina[["Livro", "Capítulo", "Versículo", "Texto"]],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    col_p1, col_p2, col_p3 = st.columns([1, 1, 3])
+    with col_p1:
+        st.button(
+            "⬅️ Anterior",
+            key="pagina_anterior_avancada",
+            on_click=voltar_pagina,
+            disabled=len(cursores) == 1,
+            use_container_width=True,
+        )
+    with col_p2:
+        st.button(
+            "Próxima ➡️",
+            key="pagina_proxima_avancada",
+            on_click=avancar_pagina,
+            args=(proximo,),
+            disabled=proximo is None,
+            use_container_width=True,
+        )
+    with col_p3:
+        st.caption(f"Página {len(cursores)}")
+
+    if not busca["exportar"]:
+        st.button(
+            "📊 Resumo e exportação de todos os resultados",
+            key="exportar_busca_avancada",
+            on_click=pedir_exportacao,
+        )
+        return
+
+    try:
+        resultados = buscar_completa(busca)
+    except Exception as e:
+        tratar_erro_busca(e, busca)
+        return
+
+    st.markdown("---")
+    st.subheader(f"📊 Todos os resultados: {len(resultados)} versículos")
+    mostrar_metricas(resultados)
+    mostrar_exportacao(resultados, termos_raw)
 
 
 if disparar:
+    st.session_state.busca_avancada_paginada = None
     executar_busca_avancada()
 
+if st.session_state.busca_avancada_paginada:
+    mostrar_pagina_avancada()
+
 
 # ============================================================
 # Histórico de buscas
@@ -346,5 +609,3 @@ with c_at1:
 with c_at2:
     if st.button("📖 Leitura", use_container_width=True):
         st.switch_page("pages/1_📖_Leitura.py")
-
-conexao.close()
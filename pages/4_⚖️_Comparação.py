@@ -1,8 +1,9 @@
 """
 Página de Comparação de Versões.
 
-Permite comparar até 3 traduções bíblicas lado a lado
-para o mesmo capítulo ou versículo.
+Permite comparar traduções bíblicas lado a lado para o mesmo
+capítulo ou versículo. As versões escolhidas são anexadas a uma
+única conexão e alinhadas em uma só consulta (`comparar_capitulo`).
 
 Autor: Edson Deveza
 Versão: 2.0
@@ -15,7 +16,6 @@ import sys
 from pathlib import Path
 from typing import Dict, List
 
-import pandas as pd
 import streamlit as st
 
 # Ajuste de path para permitir imports "src.*"
@@ -24,11 +24,12 @@ if str(RAIZ_PROJETO) not in sys.path:
     sys.path.insert(0, str(RAIZ_PROJETO))
 
 from src.database import (
-    conectar_banco,
+    obter_conexao,
     carregar_testamentos,
     carregar_livros_testamento,
     carregar_capitulos,
     carregar_versiculos,
+    comparar_capitulo,
 )
 from src.error_handler import handle_database_error, show_connection_error
 from src.logger import log_erro
@@ -86,7 +87,7 @@ if stem_atual not in bancos:
 # Conexão com a versão base (para navegação)
 # ============================================================
 try:
-    conexao_base = conectar_banco(st.session_state.caminho_banco)
+    conexao_base = obter_conexao(st.session_state.caminho_banco)
 except Exception as e:
     log_erro("comparacao_conexao_base", e)
     show_connection_error()
@@ -105,7 +106,6 @@ try:
         df_test = carregar_testamentos(conexao_base)
         if df_test.empty:
             st.error("Nenhum testamento encontrado no banco de dados.")
-            conexao_base.close()
             st.stop()
 
         testamento_nome = st.selectbox(
@@ -122,7 +122,6 @@ try:
 
         if df_livros.empty:
             st.error("Nenhum livro encontrado para o testamento selecionado.")
-            conexao_base.close()
             st.stop()
 
         livro_nome = st.selectbox(
@@ -138,7 +137,6 @@ try:
                 "Não foi possível localizar o livro selecionado. "
                 "Por favor, selecione novamente o testamento e o livro."
             )
-            conexao_base.close()
             st.stop()
 
         livro_id = int(df_livros.loc[mask, "id"].iloc[0])
@@ -146,7 +144,6 @@ try:
     df_caps = carregar_capitulos(conexao_base, livro_id)
     if df_caps.empty:
         st.error("Nenhum capítulo encontrado para o livro selecionado.")
-        conexao_base.close()
         st.stop()
 
     lista_caps = sorted(df_caps["chapter"].tolist())
@@ -171,7 +168,6 @@ try:
         df_versos_base = carregar_versiculos(conexao_base, livro_id, capitulo)
         if df_versos_base.empty:
             st.error("Nenhum versículo encontrado para o capítulo selecionado.")
-            conexao_base.close()
             st.stop()
 
         lista_versos = sorted(df_versos_base["Versículo"].tolist())
@@ -184,7 +180,6 @@ try:
 except Exception as e:
     log_erro("comparacao_navegacao", e)
     handle_database_error(e, "navegação")
-    conexao_base.close()
     st.stop()
 
 # ============================================================
@@ -196,25 +191,22 @@ st.subheader("📚 Versões para comparação")
 todas_versoes = sorted(bancos.keys())
 default_selecao: List[str] = [stem_atual]
 outros = [v for v in todas_versoes if v != stem_atual]
-default_selecao += outros[:2]  # até 3 no total
+default_selecao += outros[:2]  # 3 por padrão, sem limite
 
 versoes_escolhidas = st.multiselect(
-    "Escolha até 3 versões",
+    "Escolha as versões",
     options=todas_versoes,
-    default=default_selecao[:3],
-    max_selections=3,
+    default=default_selecao,
 )
 
 if not versoes_escolhidas:
     st.info("Selecione pelo menos uma versão para comparar.")
-    conexao_base.close()
     st.stop()
 
 if st.button("⚖️ Comparar versões", type="primary"):
     st.session_state["cmp_disparar"] = True
 
 if not st.session_state.get("cmp_disparar"):
-    conexao_base.close()
     st.stop()
 
 st.session_state["cmp_disparar"] = False
@@ -225,44 +217,25 @@ st.session_state["cmp_disparar"] = False
 st.markdown("---")
 st.subheader("📖 Resultados da comparação")
 
-comparacoes: Dict[str, pd.DataFrame] = {}
+try:
+    df_merged = comparar_capitulo(
+        {versao: bancos[versao] for versao in versoes_escolhidas},
+        livro_id,
+        capitulo,
+        versiculo_especifico,
+    )
+except Exception as e:
+    log_erro("comparacao_versoes", e, detalhes=", ".join(versoes_escolhidas))
+    handle_database_error(e, "comparação de versões")
+    st.stop()
 
-for versao in versoes_escolhidas:
-    caminho = bancos[versao]
-    try:
-        conn = conectar_banco(str(caminho))
-        df = carregar_versiculos(conn, livro_id, capitulo)
-
-        if df.empty:
-            st.warning(f"Nenhum versículo encontrado na versão {versao}.")
-            conn.close()
-            continue
-
-        if tipo_comparacao == "Versículo específico":
-            df = df[df["Versículo"] == versiculo_especifico]
-
-        # Renomeia coluna de texto para o nome da versão
-        df = df[["Versículo", "Texto"]].copy()
-        df.rename(columns={"Texto": versao}, inplace=True)
-        comparacoes[versao] = df
-
-        conn.close()
-    except Exception as e:
-        log_erro("comparacao_versao", e, detalhes=versao)
-        st.error(f"❌ Erro ao carregar dados da versão **{versao}**.")
-
-if not comparacoes:
+if df_merged.empty:
     st.error("Não foi possível montar a tabela de comparação.")
-    conexao_base.close()
     st.stop()
 
-# Merge por número de versículo
-dfs = list(comparacoes.values())
-df_merged = dfs[0]
-for d in dfs[1:]:
-    df_merged = df_merged.merge(on="Versículo", right=d, how="outer")
-
-df_merged = df_merged.sort_values("Versículo").reset_index(drop=True)
+for versao in versoes_escolhidas:
+    if df_merged[versao].isna().all():
+        st.warning(f"Nenhum versículo encontrado na versão {versao}.")
 
 titulo_ref = f"{livro_nome} {capitulo}"
 if versiculo_especifico is not None:
@@ -289,5 +262,3 @@ with c1:
 with c2:
     if st.button("🔍 Ir para Busca Avançada", use_container_width=True):
         st.switch_page("pages/3_🔍+_Busca_Avançada.py")
-
-conexao_base.close()
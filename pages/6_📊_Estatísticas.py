@@ -22,7 +22,11 @@ RAIZ_PROJETO = Path(__file__).parent.parent.absolute()
 if str(RAIZ_PROJETO) not in sys.path:
     sys.path.insert(0, str(RAIZ_PROJETO))
 
-from src.database import conectar_banco
+from src.database import (
+    carregar_testamentos,
+    estatisticas_livros,
+    obter_conexao,
+)
 from src.error_handler import handle_database_error, show_connection_error
 from src.logger import log_erro
 from src.ui_utils import garantir_versao_selecionada
@@ -45,7 +49,7 @@ versao_atual = st.session_state.get("versao_biblia") or st.session_state.get(
 st.markdown(f"**Versão atual:** {versao_atual}")
 
 try:
-    conexao = conectar_banco(str(caminho_banco))
+    conexao = obter_conexao(str(caminho_banco))
 except Exception as e:
     log_erro("estatisticas_conexao", e)
     show_connection_error()
@@ -55,45 +59,23 @@ except Exception as e:
 def estatisticas_biblia():
     """Calcula estatísticas da Bíblia a partir do banco atual."""
     try:
-        df_versos = pd.read_sql_query(
-            """
-            SELECT v.book_id,
-                   v.chapter,
-                   v.verse AS versiculo,
-                   v.text AS texto,
-                   b.name AS livro
-            FROM verse v
-            JOIN book b ON v.book_id = b.id
-            """,
-            conexao,
-        )
+        df_livros = estatisticas_livros(conexao)
+        df_test = carregar_testamentos(conexao)
     except Exception as e:
         log_erro("estatisticas_biblia_query", e)
         handle_database_error(e, "estatísticas da Bíblia")
         return
 
-    if df_versos.empty:
+    if df_livros.empty:
         st.warning("Não foi possível carregar versículos para estatísticas.")
         return
 
-    livros_vt = [
-        "Gênesis", "Êxodo", "Levítico", "Números", "Deuteronômio",
-        "Josué", "Juízes", "Rute", "1 Samuel", "2 Samuel",
-        "1 Reis", "2 Reis", "1 Crônicas", "2 Crônicas",
-        "Esdras", "Neemias", "Ester", "Jó", "Salmos", "Provérbios",
-        "Eclesiastes", "Cânticos", "Isaías", "Jeremias",
-        "Lamentações", "Ezequiel", "Daniel", "Oséias", "Joel",
-        "Amós", "Obadias", "Jonas", "Miquéias", "Naum",
-        "Habacuque", "Sofonias", "Ageu", "Zacarias", "Malaquias",
-    ]
-
-    df_versos["testamento"] = df_versos["livro"].apply(
-        lambda x: "Antigo Testamento" if x in livros_vt else "Novo Testamento"
-    )
+    nomes_testamento = {int(r["id"]): r["name"] for _, r in df_test.iterrows()}
+    df_livros["testamento"] = df_livros["Testamento"].map(nomes_testamento)
 
-    n_livros = df_versos["livro"].nunique()
-    n_capitulos = df_versos[["livro", "chapter"]].drop_duplicates().shape[0]
-    n_versiculos = len(df_versos)
+    n_livros = len(df_livros)
+    n_capitulos = int(df_livros["Capítulos"].sum())
+    n_versiculos = int(df_livros["Versículos"].sum())
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -107,8 +89,8 @@ def estatisticas_biblia():
     st.subheader("📚 Distribuição por Testamento")
 
     dist_test = (
-        df_versos.groupby("testamento")["versiculo"]
-        .count()
+        df_livros.groupby("testamento")["Versículos"]
+        .sum()
         .reset_index(name="qtde_versiculos")
     )
     st.dataframe(dist_test, use_container_width=True, hide_index=True)
@@ -120,9 +102,8 @@ def estatisticas_biblia():
     st.subheader("🏆 Top 10 livros com mais versículos")
 
     top_livros = (
-        df_versos.groupby("livro")["versiculo"]
-        .count()
-        .reset_index(name="qtde_versiculos")
+        df_livros[["Livro", "Versículos"]]
+        .rename(columns={"Livro": "livro", "Versículos": "qtde_versiculos"})
         .sort_values("qtde_versiculos", ascending=False)
         .head(10)
     )
@@ -252,5 +233,3 @@ with c3:
 with c4:
     if st.button("📝 Anotações", use_container_width=True):
         st.switch_page("pages/5_📝_Anotações.py")
-
-conexao.close()
@@ -8,6 +8,14 @@ Este pacote contém os módulos centrais da aplicação:
 - annotations: Sistema de anotações de estudo bíblico
 - export: Exportação de resultados em múltiplos formatos
 - optimize: Criação de índices e otimizações de banco
+- search_index: Índice invertido em memória usado pelas buscas
+- cache_resultados: Cache LRU (limitado em bytes) dos resultados de busca
+- conexoes: Pool de conexões somente leitura por versão e por thread
+- corpus: Versículos de cada versão em arrays NumPy e buffer UTF-8
+- stemmer: Radicalização RSLP de palavras em português
+- referencias: Interpretação de referências bíblicas ("Jo 3:16")
+- matcher: Localização de múltiplos termos (Aho–Corasick) em uma passada
+- text_utils: Normalização e tokenização de texto
 - error_handler: Tratamento e validação de erros
 - logger: Sistema de logging e métricas de uso
 """
@@ -16,14 +24,26 @@ from __future__ import annotations
 
 from .database import (
     conectar_banco,
+    obter_conexao,
+    registrar_regexp,
     carregar_testamentos,
     carregar_livros_testamento,
     carregar_todos_livros,
     carregar_capitulos,
     carregar_versiculos,
+    buscar_referencia,
     buscar_versiculos,
     buscar_versiculos_avancada,
+    sugerir_termos,
+    autocompletar,
+    buscar_em_todas_versoes,
+    buscar_lote,
+    buscar_versiculos_paginado,
+    buscar_versiculos_avancada_paginado,
+    iterar_paginas,
+    comparar_capitulo,
     comparar_versoes,
+    estatisticas_livros,
     obter_info_livro,
 )
 from .annotations import (
@@ -43,14 +63,19 @@ from .annotations import (
 from .export import (
     exportar_csv,
     exportar_xlsx,
+    exportar_parquet,
     exportar_pdf,
     exportar_texto_simples,
     exportar_markdown,
     exportar_html,
+    destacar_texto,
 )
 from .optimize import (
     criar_indices,
+    criar_indice_fts,
+    criar_texto_normalizado,
     otimizar_todos_bancos,
+    compilar_corpus,
     verificar_indices_existentes,
 )
 from .error_handler import (
@@ -79,14 +104,26 @@ __email__ = "edsondeveza@hotmail.com"
 __all__ = [
     # Database
     "conectar_banco",
+    "obter_conexao",
+    "registrar_regexp",
     "carregar_testamentos",
     "carregar_livros_testamento",
     "carregar_todos_livros",
     "carregar_capitulos",
     "carregar_versiculos",
+    "buscar_referencia",
     "buscar_versiculos",
     "buscar_versiculos_avancada",
+    "sugerir_termos",
+    "autocompletar",
+    "buscar_em_todas_versoes",
+    "buscar_lote",
+    "buscar_versiculos_paginado",
+    "buscar_versiculos_avancada_paginado",
+    "iterar_paginas",
+    "comparar_capitulo",
     "comparar_versoes",
+    "estatisticas_livros",
     "obter_info_livro",
     # Annotations
     "salvar_anotacao",
@@ -104,13 +141,18 @@ __all__ = [
     # Export
     "exportar_csv",
     "exportar_xlsx",
+    "exportar_parquet",
     "exportar_pdf",
     "exportar_texto_simples",
     "exportar_markdown",
     "exportar_html",
+    "destacar_texto",
     # Optimize
     "criar_indices",
+    "criar_indice_fts",
+    "criar_texto_normalizado",
     "otimizar_todos_bancos",
+    "compilar_corpus",
     "verificar_indices_existentes",
     # Error handler
     "handle_database_error",
@@ -0,0 +1,214 @@
+"""
+Módulo de Cache de Resultados de Busca.
+
+Guarda em memória, para todo o processo (compartilhado entre as
+sessões do Streamlit), os DataFrames das buscas já realizadas.
+
+A chave combina a impressão digital do arquivo da versão (caminho,
+tamanho e data de modificação), os termos normalizados, o operador e
+os filtros; trocar de versão ou substituir um .sqlite nunca devolve
+resultado antigo. O cache tem limite em bytes e descarta as entradas
+usadas há mais tempo (LRU).
+
+Autor: Edson Deveza
+Data: 2025
+Versão: 2.1
+Compatível: Python 3.12
+"""
+
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from .search_index import caminho_do_banco, impressao_digital
+from .text_utils import normalizar_texto
+
+# Limite padrão de memória ocupada pelos resultados em cache
+MAX_BYTES_CACHE = 64 * 1024 * 1024
+
+
+class CacheResultados:
+    """
+    Cache LRU de DataFrames limitado pelo tamanho em bytes.
+
+    Os DataFrames são copiados na entrada e na saída, então quem
+    recebe um resultado pode alterá-lo (ex.: adicionar colunas na
+    página) sem afetar o cache. As listas guardadas nas células (ex.:
+    os trechos da coluna 'Destaques') também são copiadas, e entram
+    no tamanho da entrada.
+
+    Attributes:
+        max_bytes: Limite de memória das entradas
+        acertos: Buscas atendidas pelo cache
+        falhas: Buscas que precisaram ir ao banco
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES_CACHE) -> None:
+        self.max_bytes = max_bytes
+        self.acertos = 0
+        self.falhas = 0
+        self._bytes = 0
+        self._entradas: "OrderedDict[Hashable, Tuple[pd.DataFrame, int]]" = (
+            OrderedDict()
+        )
+        self._trava = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obter(self, chave: Hashable) -> Optional[pd.DataFrame]:
+        """Retorna uma cópia do resultado em cache (ou None)."""
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            resultado = entrada[0]
+        return _copiar(resultado)
+
+    def guardar(self, chave: Hashable, resultado: pd.DataFrame) -> None:
+        """
+        Guarda um resultado, descartando os menos usados se preciso.
+
+        Resultados maiores que o limite inteiro não são guardados.
+        """
+        tamanho = _tamanho(resultado)
+        if tamanho > self.max_bytes:
+            return
+
+        copia = _copiar(resultado)
+        with self._trava:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+
+            self._entradas[chave] = (copia, tamanho)
+            self._bytes += tamanho
+
+            while self._bytes > self.max_bytes:
+                _, (_, liberado) = self._entradas.popitem(last=False)
+                self._bytes -= liberado
+
+    def limpar(self) -> None:
+        """Esvazia o cache e zera os contadores."""
+        with self._trava:
+            self._entradas.clear()
+            self._bytes = 0
+            self.acertos = 0
+            self.falhas = 0
+
+    def estatisticas(self) -> Dict[str, int]:
+        """
+        Métricas do cache.
+
+        Returns:
+            dict: {'acertos', 'falhas', 'entradas', 'bytes', 'max_bytes'}
+        """
+        with self._trava:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _colunas_com_listas(resultado: pd.DataFrame) -> list:
+    """Colunas cujas células são listas (ou dicts), como 'Destaques'."""
+    colunas = []
+    for coluna in resultado.columns:
+        serie = resultado[coluna]
+        if serie.dtype != object:
+            continue
+        validos = serie.dropna()
+        if len(validos) and isinstance(validos.iloc[0], (list, dict)):
+            colunas.append(coluna)
+    return colunas
+
+
+def _copiar_valor(valor):
+    """Copia listas e dicts aninhados (tuplas, números e str são imutáveis)."""
+    if isinstance(valor, list):
+        return [_copiar_valor(v) for v in valor]
+    if isinstance(valor, dict):
+        return {k: _copiar_valor(v) for k, v in valor.items()}
+    return valor
+
+
+def _copiar(resultado: pd.DataFrame) -> pd.DataFrame:
+    """Cópia do DataFrame que não compartilha as listas das células."""
+    copia = resultado.copy()
+    for coluna in _colunas_com_listas(copia):
+        copia[coluna] = [_copiar_valor(v) for v in copia[coluna]]
+    return copia
+
+
+def _bytes_conteudo(valor) -> int:
+    """Bytes dos itens de uma lista, tupla ou dict (sem o próprio container)."""
+    if isinstance(valor, dict):
+        itens = [*valor.keys(), *valor.values()]
+    elif isinstance(valor, (list, tuple)):
+        itens = valor
+    else:
+        return 0
+    return sum(sys.getsizeof(item) + _bytes_conteudo(item) for item in itens)
+
+
+def _tamanho(resultado: pd.DataFrame) -> int:
+    """
+    Bytes ocupados pelo DataFrame.
+
+    `memory_usage(deep=True)` mede cada célula com `sys.getsizeof`,
+    que não inclui o conteúdo de uma lista; esse conteúdo é somado aqui.
+    """
+    tamanho = int(resultado.memory_usage(deep=True).sum())
+    for coluna in _colunas_com_listas(resultado):
+        tamanho += sum(_bytes_conteudo(v) for v in resultado[coluna])
+    return tamanho
+
+
+# Instância única do processo, usada pelas funções de busca
+CACHE_RESULTADOS = CacheResultados()
+
+
+def chave_busca(
+    conexao: sqlite3.Connection,
+    tipo: str,
+    termos: Tuple[str, ...],
+    **parametros,
+) -> Optional[Tuple]:
+    """
+    Monta a chave de cache de uma busca.
+
+    Args:
+        conexao: Conexão com o banco da versão
+        tipo: Tipo de busca (ex.: "simples", "avancada")
+        termos: Termos digitados (são normalizados: acentos e
+                maiúsculas não mudam o resultado)
+        **parametros: Operador, filtros e demais opções da busca
+
+    Returns:
+        tuple | None: Chave, ou None para bancos sem arquivo (em
+                      memória), que não entram no cache
+    """
+    caminho = caminho_do_banco(conexao)
+    if not caminho:
+        return None
+    try:
+        versao = impressao_digital(caminho)
+    except OSError:
+        return None
+
+    return (
+        versao,
+        tipo,
+        tuple(" ".join(normalizar_texto(t).split()) for t in termos),
+        tuple(sorted(parametros.items())),
+    )
@@ -0,0 +1,229 @@
+"""
+Módulo de Conexões Compartilhadas.
+
+Mantém, para todo o processo, conexões SQLite somente leitura com os
+bancos das versões, em vez de abrir (e configurar) uma conexão nova a
+cada rerun do Streamlit.
+
+Cada thread recebe a sua própria conexão por versão. Como o Streamlit
+usa uma thread nova a cada execução do script, as conexões de uma
+thread que termina voltam para um estoque de conexões ociosas, de onde
+a próxima thread as reaproveita. Toda conexão é verificada antes de ser
+entregue: se foi fechada, falhou ou o arquivo da versão mudou, é
+substituída por uma nova.
+
+As conexões são abertas pela URI `mode=ro` (opcionalmente também
+`immutable=1`) com PRAGMAs de leitura: `mmap_size`, `cache_size`,
+`temp_store=MEMORY` e `query_only`.
+
+Autor: Edson Deveza
+Data: 2025
+Versão: 2.1
+Compatível: Python 3.12
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .search_index import impressao_digital
+
+# Memória mapeada do arquivo (bytes) e cache de páginas (KiB)
+MMAP_BYTES = 256 * 1024 * 1024
+CACHE_KIB = 64 * 1024
+
+# Conexões ociosas guardadas por versão
+MAX_OCIOSAS = 4
+
+PRAGMAS_LEITURA: Tuple[Tuple[str, object], ...] = (
+    ("mmap_size", MMAP_BYTES),
+    ("cache_size", -CACHE_KIB),  # negativo = tamanho em KiB
+    ("temp_store", "MEMORY"),
+    ("query_only", "ON"),
+)
+
+# (caminho absoluto, imutável)
+Chave = Tuple[str, bool]
+# (conexão, impressão digital do arquivo ao abrir)
+Entrada = Tuple[sqlite3.Connection, Tuple[str, int, int]]
+
+
+def uri_leitura(caminho: str, imutavel: bool = False) -> str:
+    """
+    URI somente leitura de um banco.
+
+    `immutable=1` dispensa travas e a verificação de mudanças do
+    arquivo; só deve ser usado quando nada escreve no banco.
+    """
+    uri = Path(caminho).resolve().as_uri() + "?mode=ro"
+    if imutavel:
+        uri += "&immutable=1"
+    return uri
+
+
+class _ConexoesDaThread:
+    """Conexões emprestadas a uma thread (devolvidas quando ela termina)."""
+
+    __slots__ = ("entradas", "__weakref__")
+
+    def __init__(self) -> None:
+        self.entradas: Dict[Chave, Entrada] = {}
+
+
+class PoolConexoes:
+    """
+    Conexões somente leitura por versão e por thread.
+
+    Exemplo:
+        >>> pool = PoolConexoes()
+        >>> conexao = pool.obter("data/ACF.sqlite")
+        >>> pool.obter("data/ACF.sqlite") is conexao
+        True
+
+    Attributes:
+        inicializar: Função aplicada a cada conexão nova (ex.: registrar
+                     funções SQL)
+        max_ociosas: Conexões ociosas guardadas por versão
+        abertas: Conexões abertas desde a criação do pool
+        reaproveitadas: Conexões entregues a partir do estoque ocioso
+    """
+
+    def __init__(
+        self,
+        inicializar: Optional[Callable[[sqlite3.Connection], None]] = None,
+        max_ociosas: int = MAX_OCIOSAS,
+    ) -> None:
+        self.inicializar = inicializar
+        self.max_ociosas = max_ociosas
+        self.abertas = 0
+        self.reaproveitadas = 0
+        self._local = threading.local()
+        self._ociosas: Dict[Chave, List[Entrada]] = {}
+        self._trava = threading.Lock()
+
+    def obter(self, caminho: str, imutavel: bool = False) -> sqlite3.Connection:
+        """
+        Conexão da thread atual com a versão (aberta se preciso).
+
+        A conexão não deve ser fechada por quem a recebe; ela é
+        reaproveitada nas próximas chamadas e por outras threads.
+
+        Args:
+            caminho: Caminho do arquivo .sqlite
+            imutavel: Abrir com `immutable=1`
+
+        Returns:
+            sqlite3.Connection: Conexão somente leitura
+
+        Raises:
+            OSError: Se o arquivo não existir
+            sqlite3.Error: Se o banco não puder ser aberto
+        """
+        chave: Chave = (os.path.abspath(caminho), imutavel)
+        digital = impressao_digital(caminho)
+        emprestadas = self._da_thread().entradas
+
+        entrada = emprestadas.get(chave)
+        if entrada is not None:
+            if _valida(entrada, digital):
+                return entrada[0]
+            del emprestadas[chave]
+            _fechar(entrada[0])
+
+        entrada = self._retirar_ociosa(chave, digital)
+        if entrada is None:
+            entrada = (self._abrir(caminho, imutavel), digital)
+        emprestadas[chave] = entrada
+        return entrada[0]
+
+    def fechar(self) -> None:
+        """
+        Fecha as conexões ociosas e as da thread atual.
+
+        Conexões em uso por outras threads são verificadas e trocadas
+        no próximo `obter` se o arquivo tiver mudado.
+        """
+        with self._trava:
+            ociosas = [e for lista in self._ociosas.values() for e in lista]
+            self._ociosas.clear()
+        emprestadas = self._da_thread().entradas
+        ociosas.extend(emprestadas.values())
+        emprestadas.clear()
+        for conexao, _ in ociosas:
+            _fechar(conexao)
+
+    def _da_thread(self) -> _ConexoesDaThread:
+        conexoes = getattr(self._local, "conexoes", None)
+        if conexoes is None:
+            conexoes = _ConexoesDaThread()
+            # Ao fim da thread o objeto é coletado e as conexões voltam
+            # para o estoque (o finalizador não guarda o próprio objeto)
+            weakref.finalize(conexoes, self._devolver, conexoes.entradas)
+            self._local.conexoes = conexoes
+        return conexoes
+
+    def _devolver(self, entradas: Dict[Chave, Entrada]) -> None:
+        excedentes: List[Entrada] = []
+        with self._trava:
+            for chave, entrada in entradas.items():
+                lista = self._ociosas.setdefault(chave, [])
+                if len(lista) < self.max_ociosas:
+                    lista.append(entrada)
+                else:
+                    excedentes.append(entrada)
+        entradas.clear()
+        for conexao, _ in excedentes:
+            _fechar(conexao)
+
+    def _retirar_ociosa(
+        self, chave: Chave, digital: Tuple[str, int, int]
+    ) -> Optional[Entrada]:
+        while True:
+            with self._trava:
+                lista = self._ociosas.get(chave)
+                if not lista:
+                    return None
+                entrada = lista.pop()
+            if _valida(entrada, digital):
+                self.reaproveitadas += 1
+                return entrada
+            _fechar(entrada[0])
+
+    def _abrir(self, caminho: str, imutavel: bool) -> sqlite3.Connection:
+        # check_same_thread=False: a conexão muda de thread ao passar
+        # pelo estoque, mas só uma thread a usa de cada vez
+        conexao = sqlite3.connect(
+            uri_leitura(caminho, imutavel), uri=True, check_same_thread=False
+        )
+        try:
+            for nome, valor in PRAGMAS_LEITURA:
+                conexao.execute(f"PRAGMA {nome} = {valor};")
+            if self.inicializar is not None:
+                self.inicializar(conexao)
+        except sqlite3.Error:
+            conexao.close()
+            raise
+        self.abertas += 1
+        return conexao
+
+
+def _valida(entrada: Entrada, digital: Tuple[str, int, int]) -> bool:
+    """Conexão ainda responde e aponta para o mesmo arquivo."""
+    conexao, digital_aberta = entrada
+    if digital_aberta != digital:
+        return False
+    try:
+        conexao.execute("SELECT 1").fetchone()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _fechar(conexao: sqlite3.Connection) -> None:
+    try:
+        conexao.close()
+    except sqlite3.Error:
+        pass
@@ -0,0 +1,538 @@
+"""
+Módulo de Corpus em Memória.
+
+Guarda todos os versículos de uma versão em arrays compactos, em vez
+de DataFrames com colunas de objetos Python:
+
+- `livros` (uint8), `capitulos` (uint8) e `versiculos` (uint16)
+- os textos concatenados em um único buffer UTF-8 (`texto`), com o
+  array `inicios` (int32) marcando onde cada versículo começa
+
+Os versículos ficam na ordem canônica (livro, capítulo, versículo,
+rowid), a mesma do índice invertido (`search_index`), então a posição
+de um versículo no índice é a sua posição no corpus. Cada capítulo é
+uma faixa contínua, localizada em O(1) por dicionário.
+
+O par buffer + offsets é exatamente o layout de uma coluna de texto
+do Arrow: leituras em `formato="arrow"` fatiam o buffer sem copiar.
+
+O corpus é montado uma única vez por arquivo .sqlite e compartilhado
+entre as sessões do Streamlit via `st.cache_resource` (chave com a
+impressão digital do arquivo). Bancos em memória não têm corpus e as
+leituras seguem pelo SQL.
+
+O corpus também pode ser compilado (`optimize.compilar_corpus`) em um
+arquivo binário ao lado do .sqlite (`ACF.sqlite` → `ACF.corpus`):
+cabeçalho com versão do formato, impressão digital do .sqlite de
+origem e CRC32, seguido dos arrays de largura fixa e do buffer de
+texto. O arquivo é aberto com `np.memmap`, sem cópia: processos do
+Streamlit na mesma máquina compartilham o cache de páginas do sistema
+e a carga inicial só abre o arquivo, sem consultar o banco. Arquivo
+desatualizado ou corrompido é ignorado e o corpus é montado do SQLite.
+
+Autor: Edson Deveza
+Data: 2025
+Versão: 2.1
+Compatível: Python 3.12
+"""
+
+import json
+import os
+import sqlite3
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from .search_index import caminho_do_banco, impressao_digital
+
+# Maiores valores representáveis nos arrays do corpus
+_MAXIMOS = {"livros": 0xFF, "capitulos": 0xFF, "versiculos": 0xFFFF}
+
+
+class Corpus:
+    """
+    Versículos de uma versão em arrays NumPy e um buffer UTF-8.
+
+    Exemplo:
+        >>> corpus = Corpus.construir(conexao)
+        >>> corpus.capitulo(43, 3)          # João 3
+        >>> corpus.texto_versiculo(corpus.faixa_capitulo(43, 3)[0])
+
+    Attributes:
+        ids: rowid de `verse` de cada versículo (uint32)
+        livros: book_id de cada versículo (uint8)
+        capitulos: capítulo de cada versículo (uint8)
+        versiculos: número de cada versículo (uint16)
+        testamentos: testament_reference_id de cada versículo (uint8)
+        texto: Textos concatenados em UTF-8 (uint8)
+        inicios: Offset de cada versículo em `texto`, com o fim do
+                 último no final (int32, N + 1 posições)
+        nomes_livros: {book_id: nome do livro}
+        faixas_capitulo: {(book_id, capítulo): (início, fim)}
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        livros: np.ndarray,
+        capitulos: np.ndarray,
+        versiculos: np.ndarray,
+        testamentos: np.ndarray,
+        texto: np.ndarray,
+        inicios: np.ndarray,
+        nomes_livros: Dict[int, str],
+    ) -> None:
+        self.ids = ids
+        self.livros = livros
+        self.capitulos = capitulos
+        self.versiculos = versiculos
+        self.testamentos = testamentos
+        self.texto = texto
+        self.inicios = inicios
+        self.nomes_livros = nomes_livros
+
+        # Capítulos são faixas contínuas na ordem canônica
+        chaves = livros.astype(np.uint16) << 8 | capitulos
+        if len(chaves):
+            quebras = np.flatnonzero(chaves[1:] != chaves[:-1]) + 1
+            comecos = np.concatenate(([0], quebras))
+            fins = np.concatenate((quebras, [len(chaves)]))
+        else:
+            comecos = fins = np.empty(0, dtype=np.int64)
+        self.faixas_capitulo: Dict[Tuple[int, int], Tuple[int, int]] = {
+            (int(livros[ini]), int(capitulos[ini])): (int(ini), int(fim))
+            for ini, fim in zip(comecos, fins)
+        }
+
+        # Nome do livro por book_id, para montar a coluna 'Livro'
+        self._nomes = np.full(_MAXIMOS["livros"] + 1, "", dtype=object)
+        for livro, nome in nomes_livros.items():
+            if 0 <= livro <= _MAXIMOS["livros"]:
+                self._nomes[livro] = nome
+
+        # Coluna Arrow sobre o mesmo buffer (sem cópia)
+        self._textos = pa.StringArray.from_buffers(
+            len(ids), pa.py_buffer(inicios), pa.py_buffer(texto)
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays e pelo buffer de texto."""
+        return sum(
+            a.nbytes
+            for a in (
+                self.ids,
+                self.livros,
+                self.capitulos,
+                self.versiculos,
+                self.testamentos,
+                self.texto,
+                self.inicios,
+            )
+        )
+
+    # --------------------------------------------------------
+    # Construção
+    # --------------------------------------------------------
+    @classmethod
+    def construir(cls, conexao: sqlite3.Connection) -> "Corpus":
+        """
+        Monta o corpus lendo todos os versículos do banco.
+
+        Args:
+            conexao: Conexão com o banco da versão
+
+        Returns:
+            Corpus: Corpus da versão
+
+        Raises:
+            ValueError: Se livros, capítulos ou versículos não couberem
+                        nos tipos compactos (uint8/uint16)
+        """
+        livros_banco = conexao.execute(
+            "SELECT id, name, testament_reference_id FROM book"
+        ).fetchall()
+        nomes_livros = {int(i): nome for i, nome, _ in livros_banco}
+        testamento_por_livro = {int(i): t for i, _, t in livros_banco}
+
+        linhas = conexao.execute(
+            """
+            SELECT id, book_id, chapter, verse, text
+            FROM verse
+            ORDER BY book_id, chapter, verse, id
+            """
+        ).fetchall()
+        if linhas:
+            ids, livros, capitulos, versiculos, textos = zip(*linhas)
+        else:
+            ids = livros = capitulos = versiculos = textos = ()
+
+        colunas = {
+            "livros": np.array(livros, dtype=np.int64),
+            "capitulos": np.array(capitulos, dtype=np.int64),
+            "versiculos": np.array(versiculos, dtype=np.int64),
+        }
+        for nome, valores in colunas.items():
+            if len(valores) and (
+                valores.min() < 0 or valores.max() > _MAXIMOS[nome]
+            ):
+                raise ValueError(
+                    f"Valores de {nome} fora do intervalo do corpus "
+                    f"(0–{_MAXIMOS[nome]})."
+                )
+
+        codificados = [(t or "").encode("utf-8") for t in textos]
+        inicios = np.zeros(len(codificados) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in codificados], out=inicios[1:])
+        if inicios[-1] > np.iinfo(np.int32).max:
+            raise ValueError("Texto da versão grande demais para o corpus.")
+
+        return cls(
+            ids=np.array(ids, dtype=np.uint32),
+            livros=colunas["livros"].astype(np.uint8),
+            capitulos=colunas["capitulos"].astype(np.uint8),
+            versiculos=colunas["versiculos"].astype(np.uint16),
+            testamentos=np.array(
+                [testamento_por_livro.get(int(livro), 0) for livro in livros],
+                dtype=np.uint8,
+            ),
+            texto=np.frombuffer(b"".join(codificados), dtype=np.uint8),
+            inicios=inicios.astype(np.int32),
+            nomes_livros=nomes_livros,
+        )
+
+    # --------------------------------------------------------
+    # Leitura
+    # --------------------------------------------------------
+    def texto_versiculo(self, posicao: int) -> str:
+        """Texto de um versículo (decodificado do buffer)."""
+        inicio, fim = self.inicios[posicao], self.inicios[posicao + 1]
+        return self.texto[inicio:fim].tobytes().decode("utf-8")
+
+    def faixa_capitulo(self, livro_id: int, capitulo: int) -> Tuple[int, int]:
+        """Faixa (início, fim) de um capítulo; (0, 0) se não existir."""
+        return self.faixas_capitulo.get((int(livro_id), int(capitulo)), (0, 0))
+
+    def capitulo(self, livro_id: int, capitulo: int, formato: str = "pandas"):
+        """
+        Versículos de um capítulo, fatiados em O(1).
+
+        Args:
+            livro_id: ID do livro
+            capitulo: Número do capítulo
+            formato: "pandas" (DataFrame) ou "arrow" (pyarrow.Table)
+
+        Returns:
+            pd.DataFrame | pa.Table: Colunas 'Versículo' e 'Texto'
+        """
+        inicio, fim = self.faixa_capitulo(livro_id, capitulo)
+        versiculos = self.versiculos[inicio:fim].astype(np.int64)
+        textos = self._textos.slice(inicio, fim - inicio)
+        if formato == "arrow":
+            return pa.table({"Versículo": versiculos, "Texto": textos})
+        return pd.DataFrame(
+            {"Versículo": versiculos, "Texto": textos.to_pylist()}
+        )
+
+    def tabela(self, posicoes: np.ndarray, formato: str = "pandas"):
+        """
+        Versículos das posições informadas, na ordem recebida.
+
+        Args:
+            posicoes: Posições dos versículos (as mesmas do índice)
+            formato: "pandas" (DataFrame) ou "arrow" (pyarrow.Table)
+
+        Returns:
+            pd.DataFrame | pa.Table: Colunas ['Livro', 'Capítulo',
+                                     'Versículo', 'Texto']
+        """
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        livros = self.nomes_livro(posicoes)
+        capitulos = self.capitulos[posicoes].astype(np.int64)
+        versiculos = self.versiculos[posicoes].astype(np.int64)
+        textos = self._textos.take(pa.array(posicoes))
+        if formato == "arrow":
+            return pa.table(
+                {
+                    "Livro": pa.array(livros, type=pa.string()),
+                    "Capítulo": capitulos,
+                    "Versículo": versiculos,
+                    "Texto": textos,
+                }
+            )
+        return pd.DataFrame(
+            {
+                "Livro": list(livros),
+                "Capítulo": capitulos,
+                "Versículo": versiculos,
+                "Texto": textos.to_pylist(),
+            }
+        )
+
+    def nomes_livro(self, posicoes: np.ndarray) -> np.ndarray:
+        """Nome do livro de cada posição (array de objetos)."""
+        return self._nomes[self.livros[posicoes]]
+
+    # --------------------------------------------------------
+    # Estatísticas
+    # --------------------------------------------------------
+    def estatisticas_livros(self) -> pd.DataFrame:
+        """
+        Capítulos e versículos de cada livro, contados nos arrays.
+
+        Returns:
+            pd.DataFrame: Colunas ['book_id', 'Livro', 'Testamento',
+                          'Capítulos', 'Versículos'], na ordem canônica
+        """
+        livros, primeiros, versiculos = np.unique(
+            self.livros, return_index=True, return_counts=True
+        )
+        capitulos = np.bincount(
+            [livro for livro, _ in self.faixas_capitulo],
+            minlength=_MAXIMOS["livros"] + 1,
+        )
+        return pd.DataFrame(
+            {
+                "book_id": livros.astype(np.int64),
+                "Livro": list(self._nomes[livros]),
+                "Testamento": self.testamentos[primeiros].astype(np.int64),
+                "Capítulos": capitulos[livros].astype(np.int64),
+                "Versículos": versiculos.astype(np.int64),
+            }
+        )
+
+
+# ============================================================
+# Arquivo binário (.corpus)
+# ============================================================
+EXTENSAO_CORPUS = ".corpus"
+MAGICO_CORPUS = b"BIBCORP\0"
+VERSAO_FORMATO = 1
+
+# Cabeçalho (little-endian, 64 bytes): mágico, versão do formato,
+# reservado, nº de versículos, bytes de texto, bytes dos nomes dos
+# livros, tamanho e mtime (ns) do .sqlite de origem, CRC32 do conteúdo
+_CABECALHO = struct.Struct("<8sIIQQQQqI4x")
+
+# Arquivos .corpus com o CRC32 já conferido neste processo:
+# (caminho, tamanho, mtime_ns, CRC do cabeçalho). Um arquivo regravado
+# muda de impressão digital e é conferido de novo na abertura seguinte
+_VERIFICADOS: Set[Tuple[str, int, int, int]] = set()
+
+# Seções na ordem do arquivo; cada uma começa em múltiplo de 8 bytes
+_SECOES: List[Tuple[str, np.dtype]] = [
+    ("ids", np.dtype("<u4")),
+    ("livros", np.dtype("u1")),
+    ("capitulos", np.dtype("u1")),
+    ("versiculos", np.dtype("<u2")),
+    ("testamentos", np.dtype("u1")),
+    ("inicios", np.dtype("<i4")),
+    ("texto", np.dtype("u1")),
+]
+
+
+def caminho_corpus(caminho_banco: str) -> str:
+    """Arquivo binário do corpus de um .sqlite (mesma pasta e nome)."""
+    return str(Path(caminho_banco).with_suffix(EXTENSAO_CORPUS))
+
+
+def _alinhar(posicao: int) -> int:
+    return (posicao + 7) & ~7
+
+
+def _layout(n: int, bytes_texto: int) -> Dict[str, Tuple[int, int]]:
+    """{seção: (offset, quantidade)} para um corpus de `n` versículos."""
+    quantidades = {
+        "ids": n,
+        "livros": n,
+        "capitulos": n,
+        "versiculos": n,
+        "testamentos": n,
+        "inicios": n + 1,
+        "texto": bytes_texto,
+    }
+    layout = {}
+    posicao = _CABECALHO.size
+    for nome, tipo in _SECOES:
+        layout[nome] = (posicao, quantidades[nome])
+        posicao = _alinhar(posicao + quantidades[nome] * tipo.itemsize)
+    layout["nomes"] = (posicao, 0)
+    return layout
+
+
+def salvar_corpus(
+    corpus: Corpus,
+    destino: str,
+    origem: Tuple[int, int] = (0, 0),
+) -> None:
+    """
+    Grava o corpus no formato binário.
+
+    O arquivo é escrito ao lado e renomeado no fim (`os.replace`):
+    processos que já mapearam a versão anterior continuam lendo-a.
+    O CRC32 calculado na gravação vale como conferência: este processo
+    não percorre o arquivo de novo ao abri-lo.
+
+    Args:
+        corpus: Corpus a gravar
+        destino: Caminho do arquivo .corpus
+        origem: (tamanho, mtime_ns) do .sqlite de origem
+    """
+    n, bytes_texto = len(corpus), len(corpus.texto)
+    nomes = json.dumps(
+        {str(k): v for k, v in corpus.nomes_livros.items()}, ensure_ascii=False
+    ).encode("utf-8")
+    layout = _layout(n, bytes_texto)
+
+    conteudo = bytearray(layout["nomes"][0] - _CABECALHO.size + len(nomes))
+    for nome, tipo in _SECOES:
+        inicio = layout[nome][0] - _CABECALHO.size
+        dados = np.ascontiguousarray(getattr(corpus, nome), dtype=tipo).tobytes()
+        conteudo[inicio:inicio + len(dados)] = dados
+    conteudo[len(conteudo) - len(nomes):] = nomes
+    crc = zlib.crc32(conteudo)
+
+    cabecalho = _CABECALHO.pack(
+        MAGICO_CORPUS,
+        VERSAO_FORMATO,
+        0,
+        n,
+        bytes_texto,
+        len(nomes),
+        origem[0],
+        origem[1],
+        crc,
+    )
+    temporario = f"{destino}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(cabecalho)
+        arquivo.write(conteudo)
+    os.replace(temporario, destino)
+    _VERIFICADOS.add(_chave_verificacao(destino, crc))
+
+
+def _chave_verificacao(caminho: str, crc: int) -> Tuple[str, int, int, int]:
+    """Impressão digital do arquivo .corpus para `_VERIFICADOS`."""
+    info = os.stat(caminho)
+    return (os.path.realpath(caminho), info.st_size, info.st_mtime_ns, crc)
+
+
+def abrir_corpus(
+    caminho: str,
+    origem: Optional[Tuple[int, int]] = None,
+) -> Corpus:
+    """
+    Abre um arquivo .corpus com `np.memmap` (sem copiar os arrays).
+
+    Cabeçalho, tamanho e origem são conferidos a cada abertura. O
+    CRC32, que percorre o arquivo inteiro, só na primeira abertura de
+    cada impressão digital do arquivo (tamanho e mtime) no processo;
+    arquivos gravados pelo próprio processo já saem conferidos.
+
+    Args:
+        caminho: Caminho do arquivo .corpus
+        origem: (tamanho, mtime_ns) esperados do .sqlite de origem;
+                se informado, um arquivo de outra origem é recusado
+
+    Returns:
+        Corpus: Corpus com os arrays apontando para o arquivo mapeado
+
+    Raises:
+        ValueError: Se o arquivo for de outro formato/versão, estiver
+                    desatualizado ou com o checksum errado
+        OSError: Se o arquivo não puder ser lido
+    """
+    mapa = np.memmap(caminho, dtype=np.uint8, mode="r")
+    if len(mapa) < _CABECALHO.size:
+        raise ValueError(f"Arquivo de corpus truncado: {caminho}")
+
+    (
+        magico,
+        versao,
+        _,
+        n,
+        bytes_texto,
+        bytes_nomes,
+        tamanho_origem,
+        mtime_origem,
+        crc,
+    ) = _CABECALHO.unpack_from(mapa, 0)
+    if magico != MAGICO_CORPUS or versao != VERSAO_FORMATO:
+        raise ValueError(f"Formato de corpus não suportado: {caminho}")
+    if origem is not None and (tamanho_origem, mtime_origem) != tuple(origem):
+        raise ValueError(f"Corpus desatualizado em relação ao banco: {caminho}")
+
+    layout = _layout(n, bytes_texto)
+    inicio_nomes = layout["nomes"][0]
+    if len(mapa) != inicio_nomes + bytes_nomes:
+        raise ValueError(f"Arquivo de corpus truncado: {caminho}")
+    chave = _chave_verificacao(caminho, crc)
+    if chave not in _VERIFICADOS:
+        if zlib.crc32(mapa[_CABECALHO.size:]) != crc:
+            raise ValueError(f"Checksum do corpus não confere: {caminho}")
+        _VERIFICADOS.add(chave)
+
+    arrays = {}
+    for nome, tipo in _SECOES:
+        inicio, quantidade = layout[nome]
+        arrays[nome] = mapa[inicio:inicio + quantidade * tipo.itemsize].view(tipo)
+    nomes = json.loads(mapa[inicio_nomes:].tobytes().decode("utf-8"))
+    return Corpus(
+        nomes_livros={int(k): v for k, v in nomes.items()},
+        **arrays,
+    )
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _carregar_corpus(
+    caminho: str,
+    tamanho: int,
+    mtime_ns: int,
+) -> Optional[Corpus]:
+    """
+    Corpus de um arquivo (tamanho/mtime compõem a chave): do .corpus
+    compilado, se estiver válido, ou montado a partir do SQLite.
+    """
+    binario = caminho_corpus(caminho)
+    if os.path.exists(binario):
+        try:
+            return abrir_corpus(binario, origem=(tamanho, mtime_ns))
+        except (OSError, ValueError):
+            # Desatualizado ou corrompido: monta a partir do banco
+            pass
+
+    uri = Path(caminho).as_uri() + "?mode=ro"
+    conexao = sqlite3.connect(uri, uri=True)
+    try:
+        return Corpus.construir(conexao)
+    except ValueError:
+        # Banco fora do formato compacto: as leituras seguem pelo SQL
+        return None
+    finally:
+        conexao.close()
+
+
+def obter_corpus(conexao: sqlite3.Connection) -> Optional[Corpus]:
+    """
+    Retorna o corpus compartilhado da versão ligada à conexão.
+
+    Args:
+        conexao: Conexão com o banco da versão
+
+    Returns:
+        Corpus | None: Corpus, ou None para bancos em memória (ou fora
+                       do formato compacto)
+    """
+    caminho = caminho_do_banco(conexao)
+    if not caminho:
+        return None
+    return _carregar_corpus(*impressao_digital(caminho))
@@ -4,21 +4,87 @@ Módulo de Banco de Dados.
 Centraliza todas as operações com SQLite para acesso aos dados bíblicos.
 Implementa cache para otimizar performance de consultas frequentes.
 
+As buscas usam, nesta ordem de preferência:
+1. O índice invertido em memória da versão (`search_index`)
+2. O índice FTS5 do arquivo (criado por `optimize.criar_indices`),
+   quando a versão está sem índice em memória
+   (`BIBLIA_SEM_INDICE_MEMORIA`) ou a construção dele falhou
+3. SQL LIKE + regex (fallback para bancos sem índice)
+
+Resultados de buscas em arquivos ficam no cache LRU do processo
+(`cache_resultados`), chaveado pela impressão digital da versão.
+
+As páginas usam `obter_conexao`: conexões somente leitura do pool do
+processo (`conexoes`), uma por thread e por versão, já configuradas.
+
+As conexões abertas por `conectar_banco` ou `obter_conexao` têm a
+função REGEXP, usada pelo modo "REGEX" da busca avançada; varreduras
+completas da tabela rodam com limite de tempo (`LIMITE_TEMPO_BUSCA`),
+que a função REGEXP respeita dentro de cada casamento (pacote `regex`).
+
+Listas de testamentos, livros e capítulos ficam no cache do Streamlit
+chaveadas pela versão e pela impressão digital do arquivo.
+
+Capítulos e resultados do índice são lidos do corpus em memória da
+versão (`corpus`), sem voltar ao SQLite; bancos em memória seguem
+pelo SQL.
+
+As leituras de versículos e as buscas aceitam `formato="arrow"`:
+o resultado vem como `pyarrow.Table`, montada direto dos lotes do
+cursor, sem criar um objeto Python por célula como o pandas.
+
 Autor: Edson Deveza
 Data: 2025
 Versão: 2.1
 Compatível: Python 3.12
 """
 
+import base64
+import heapq
+import json
 import sqlite3
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+import threading
 from time import perf_counter
-from typing import Optional, Dict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import regex as rx
 import streamlit as st
 
+from .cache_resultados import CACHE_RESULTADOS, chave_busca
+from .conexoes import PoolConexoes, uri_leitura
+from .corpus import Corpus, obter_corpus
 from .logger import log_busca, log_leitura, log_erro
+from .matcher import LocalizadorTermos, localizar_trechos
+from .optimize import TABELA_FTS, TABELA_NORMALIZADA
+from .referencias import interpretar_referencia, resolver_livro
+from .search_index import (
+    BM25_B,
+    BM25_K1,
+    IndiceInvertido,
+    caminho_do_banco,
+    impressao_digital,
+    menor_janela,
+    obter_indice,
+    unir,
+)
+from .text_utils import (
+    eh_prefixo,
+    normalizar_texto,
+    prefixo_curinga,
+    regex_curinga,
+    tem_curinga,
+    tokenizar,
+    tokenizar_com_posicoes,
+)
+from .ui_utils import DATA_DIR, listar_bancos_disponiveis
 
 
 # ============================================================
@@ -42,44 +108,320 @@ def conectar_banco(caminho: str) -> sqlite3.Connection:
         # Otimização básica do SQLite
         conexao.execute("PRAGMA foreign_keys = ON;")
         conexao.execute("PRAGMA journal_mode = WAL;")
+        registrar_regexp(conexao)
         return conexao
     except sqlite3.Error as e:
         log_erro("conectar_banco", e, detalhes=f"caminho={caminho}")
         raise
 
 
+# ============================================================
+# REGEXP e limite de tempo das varreduras
+# ============================================================
+# Tempo máximo (segundos) de uma varredura completa no SQLite
+LIMITE_TEMPO_BUSCA = 5.0
+
+# Instruções da VM do SQLite entre verificações do relógio
+_PASSOS_PROGRESSO = 10_000
+
+# Tamanho máximo (caracteres) de uma expressão do modo REGEX
+MAX_TAMANHO_REGEX = 200
+
+# Prazo da varredura em andamento na thread (lido pela função REGEXP)
+_PRAZO = threading.local()
+
+
+@lru_cache(maxsize=256)
+def _compilar_regex(padrao: str) -> "rx.Pattern":
+    """
+    Compila (uma vez por padrão) a expressão da função REGEXP.
+
+    Usa o pacote `regex`, cujo casamento aceita `timeout`: o progress
+    handler do SQLite não interrompe uma função Python, então é o
+    próprio casamento que precisa respeitar o prazo.
+    """
+    return rx.compile(padrao, rx.IGNORECASE)
+
+
+def _tempo_restante() -> float:
+    """
+    Segundos até o prazo da varredura atual (ou o limite cheio).
+
+    Nunca é negativo: no pacote `regex`, `timeout` negativo significa
+    "sem limite".
+    """
+    prazo = getattr(_PRAZO, "valor", None)
+    if prazo is None:
+        return LIMITE_TEMPO_BUSCA
+    return max(prazo - perf_counter(), 0.0)
+
+
+def _regexp(padrao: str, texto: Optional[str]) -> bool:
+    """
+    Implementação de `texto REGEXP padrao` (sem diferenciar maiúsculas).
+
+    Raises:
+        TimeoutError: Se o prazo da varredura vencer (inclusive no meio
+                      de um casamento com retrocesso catastrófico)
+    """
+    if texto is None:
+        return False
+    restante = _tempo_restante()
+    if restante <= 0:
+        raise TimeoutError("prazo da busca vencido")
+    return _compilar_regex(padrao).search(texto, timeout=restante) is not None
+
+
+def registrar_regexp(conexao: sqlite3.Connection) -> None:
+    """
+    Registra a função REGEXP na conexão (o SQLite só tem a sintaxe).
+
+    Os padrões compilados ficam em cache, então a expressão é
+    compilada uma vez e não a cada linha comparada.
+    """
+    conexao.create_function("REGEXP", 2, _regexp, deterministic=True)
+
+
+@contextmanager
+def _limite_tempo(conexao: sqlite3.Connection, segundos: float):
+    """
+    Interrompe a consulta em andamento se passar de `segundos`.
+
+    Usa o `set_progress_handler` do SQLite: o relógio é conferido a
+    cada `_PASSOS_PROGRESSO` instruções e a consulta é abortada quando
+    o prazo vence. O mesmo prazo vale para a função REGEXP, que
+    interrompe o casamento em andamento (`_regexp`).
+
+    Raises:
+        TimeoutError: Se a consulta foi interrompida pelo prazo
+    """
+    prazo = perf_counter() + segundos
+    estourou = False
+
+    def verificar() -> int:
+        nonlocal estourou
+        estourou = perf_counter() > prazo
+        return 1 if estourou else 0
+
+    anterior = getattr(_PRAZO, "valor", None)
+    _PRAZO.valor = prazo if anterior is None else min(prazo, anterior)
+    conexao.set_progress_handler(verificar, _PASSOS_PROGRESSO)
+    try:
+        yield
+    except Exception as e:
+        # O pandas embrulha o OperationalError ("interrupted") e o
+        # SQLite, o TimeoutError levantado dentro da função REGEXP
+        if estourou or isinstance(e, TimeoutError) or perf_counter() > prazo:
+            raise TimeoutError(
+                f"A busca passou do limite de {segundos:g}s e foi "
+                "interrompida. Refine os termos ou filtros."
+            ) from e
+        raise
+    finally:
+        conexao.set_progress_handler(None, 0)
+        _PRAZO.valor = anterior
+
+
+# ============================================================
+# Conexões compartilhadas (somente leitura)
+# ============================================================
+POOL_CONEXOES = PoolConexoes(inicializar=registrar_regexp)
+
+
+def obter_conexao(caminho: str, imutavel: bool = False) -> sqlite3.Connection:
+    """
+    Conexão somente leitura com a versão, reaproveitada entre reruns.
+
+    Diferente de `conectar_banco`, a conexão vem do pool do processo
+    (uma por thread e por versão), já com os PRAGMAs de leitura e a
+    função REGEXP, e não deve ser fechada por quem a recebe.
+
+    Args:
+        caminho: Caminho completo para o arquivo .sqlite
+        imutavel: Abrir com `immutable=1` (arquivo que nunca muda)
+
+    Returns:
+        sqlite3.Connection: Conexão somente leitura
+
+    Raises:
+        OSError: Se o arquivo não existir
+        sqlite3.Error: Se não conseguir abrir o banco
+    """
+    try:
+        return POOL_CONEXOES.obter(caminho, imutavel)
+    except (OSError, sqlite3.Error) as e:
+        log_erro("obter_conexao", e, detalhes=f"caminho={caminho}")
+        raise
+
+
+# ============================================================
+# Formatos de resultado (pandas ou Arrow)
+# ============================================================
+FORMATOS = ("pandas", "arrow")
+
+# Linhas lidas do cursor por lote no caminho Arrow
+LOTE_ARROW = 8192
+
+# Colunas dos resultados de busca/leitura no caminho Arrow
+ESQUEMA_VERSICULOS = pa.schema(
+    [
+        ("Livro", pa.string()),
+        ("Capítulo", pa.int64()),
+        ("Versículo", pa.int64()),
+        ("Texto", pa.string()),
+    ]
+)
+ESQUEMA_CAPITULO = pa.schema([("Versículo", pa.int64()), ("Texto", pa.string())])
+
+
+def _validar_formato(formato: str) -> None:
+    """Raises ValueError se o formato não for 'pandas' ou 'arrow'."""
+    if formato not in FORMATOS:
+        raise ValueError(
+            f"Formato inválido: {formato!r} (use {' ou '.join(FORMATOS)})"
+        )
+
+
+def _validar_operador(operador: str, busca_exata: bool) -> None:
+    """
+    Raises ValueError se a frase exata vier com o operador REGEX (a
+    expressão já define o que casa; a combinação não tem sentido).
+    """
+    if busca_exata and str(operador).upper() == "REGEX":
+        raise ValueError(
+            "A frase exata não se combina com o operador REGEX."
+        )
+
+
+def _ler_arrow(
+    conexao: sqlite3.Connection,
+    query: str,
+    params: tuple,
+    esquema: pa.Schema,
+    tamanho_lote: int = LOTE_ARROW,
+) -> pa.Table:
+    """
+    Executa a consulta e monta uma tabela Arrow direto do cursor.
+
+    As linhas chegam em lotes (`fetchmany`) e cada lote vira um
+    RecordBatch colunar; a memória de pico é de um lote de tuplas,
+    não do resultado inteiro em objetos Python.
+
+    Args:
+        conexao: Conexão com o banco
+        query: SQL com as colunas na ordem do esquema
+        params: Parâmetros da consulta
+        esquema: Nomes e tipos das colunas
+        tamanho_lote: Linhas por lote
+
+    Returns:
+        pa.Table: Resultado da consulta
+    """
+    cursor = conexao.execute(query, params)
+    lotes = []
+    while True:
+        linhas = cursor.fetchmany(tamanho_lote)
+        if not linhas:
+            break
+        colunas = zip(*linhas)
+        lotes.append(
+            pa.RecordBatch.from_arrays(
+                [pa.array(c, type=campo.type) for c, campo in zip(colunas, esquema)],
+                schema=esquema,
+            )
+        )
+    return pa.Table.from_batches(lotes, schema=esquema)
+
+
+def _no_formato(resultados, formato: str):
+    """Converte um DataFrame para o formato pedido (Arrow sem índice)."""
+    if formato == "arrow" and isinstance(resultados, pd.DataFrame):
+        return pa.Table.from_pandas(resultados, preserve_index=False)
+    return resultados
+
+
 # ============================================================
 # Consultas básicas (com cache)
 # ============================================================
-@st.cache_data(ttl=3600)
-def carregar_testamentos(_conexao: sqlite3.Connection) -> pd.DataFrame:
+# Listas (testamentos, livros, capítulos) guardadas no cache do
+# Streamlit; cada versão ocupa ~70 entradas pequenas
+MAX_ENTRADAS_LISTAS = 2048
+
+
+def _versao_conexao(
+    conexao: sqlite3.Connection,
+) -> Optional[Tuple[str, str, int, int]]:
     """
-    Carrega lista de testamentos do banco (com cache de 1 hora).
+    Identifica a versão ligada à conexão: (sigla, caminho, tamanho, mtime).
+
+    Retorna None para bancos sem arquivo (em memória), que não têm
+    identidade estável e por isso não entram no cache.
+    """
+    caminho = caminho_do_banco(conexao)
+    if not caminho:
+        return None
+    try:
+        return (Path(caminho).stem.upper(), *impressao_digital(caminho))
+    except OSError:
+        return None
+
+
+@st.cache_data(ttl=3600, max_entries=MAX_ENTRADAS_LISTAS, show_spinner=False)
+def _ler_lista_em_cache(
+    versao: Tuple[str, str, int, int],
+    query: str,
+    params: Tuple,
+    _conexao: sqlite3.Connection,
+) -> pd.DataFrame:
+    """Consulta em cache; a chave é a versão + a consulta (não a conexão)."""
+    return pd.read_sql_query(query, _conexao, params=params)
+
+
+def _ler_lista(
+    conexao: sqlite3.Connection,
+    query: str,
+    params: Tuple = (),
+) -> pd.DataFrame:
+    """
+    Lê uma lista pequena do banco com cache por versão.
+
+    A chave inclui a sigla e a impressão digital do arquivo, então
+    trocar de versão (ou substituir o .sqlite) nunca devolve a lista
+    de outra versão. Bancos em memória vão direto ao SQLite.
+    """
+    versao = _versao_conexao(conexao)
+    if versao is None:
+        return pd.read_sql_query(query, conexao, params=params)
+    return _ler_lista_em_cache(versao, query, params, conexao)
+
+
+def carregar_testamentos(conexao: sqlite3.Connection) -> pd.DataFrame:
+    """
+    Carrega lista de testamentos do banco (com cache de 1 hora por versão).
 
     Args:
-        _conexao: Conexão com o banco (prefixo _ ignora no cache)
+        conexao: Conexão com o banco
 
     Returns:
         pd.DataFrame: DataFrame com colunas 'id' e 'name'
     """
     query = "SELECT id, name FROM testament"
     try:
-        return pd.read_sql_query(query, _conexao)
+        return _ler_lista(conexao, query)
     except Exception as e:
         log_erro("carregar_testamentos", e)
         raise
 
 
-@st.cache_data(ttl=3600)
 def carregar_livros_testamento(
-    _conexao: sqlite3.Connection,
+    conexao: sqlite3.Connection,
     testamento_id: int,
 ) -> pd.DataFrame:
     """
-    Carrega livros de um testamento específico (com cache).
+    Carrega livros de um testamento específico (com cache por versão).
 
     Args:
-        _conexao: Conexão com o banco
+        conexao: Conexão com o banco
         testamento_id: ID do testamento (1=VT, 2=NT)
 
     Returns:
@@ -92,7 +434,7 @@ def carregar_livros_testamento(
         ORDER BY id
     """
     try:
-        return pd.read_sql_query(query, _conexao, params=(testamento_id,))
+        return _ler_lista(conexao, query, (int(testamento_id),))
     except Exception as e:
         log_erro(
             "carregar_livros_testamento",
@@ -102,35 +444,33 @@ def carregar_livros_testamento(
         raise
 
 
-@st.cache_data(ttl=3600)
-def carregar_todos_livros(_conexao: sqlite3.Connection) -> pd.DataFrame:
+def carregar_todos_livros(conexao: sqlite3.Connection) -> pd.DataFrame:
     """
-    Carrega todos os livros da Bíblia (com cache).
+    Carrega todos os livros da Bíblia (com cache por versão).
 
     Args:
-        _conexao: Conexão com o banco
+        conexao: Conexão com o banco
 
     Returns:
         pd.DataFrame: DataFrame com todos os livros ordenados
     """
     query = "SELECT id, name FROM book ORDER BY id"
     try:
-        return pd.read_sql_query(query, _conexao)
+        return _ler_lista(conexao, query)
     except Exception as e:
         log_erro("carregar_todos_livros", e)
         raise
 
 
-@st.cache_data(ttl=3600)
 def carregar_capitulos(
-    _conexao: sqlite3.Connection,
+    conexao: sqlite3.Connection,
     livro_id: int,
 ) -> pd.DataFrame:
     """
-    Carrega capítulos de um livro específico (com cache).
+    Carrega capítulos de um livro específico (com cache por versão).
 
     Args:
-        _conexao: Conexão com o banco
+        conexao: Conexão com o banco
         livro_id: ID do livro
 
     Returns:
@@ -143,7 +483,7 @@ def carregar_capitulos(
         ORDER BY chapter
     """
     try:
-        return pd.read_sql_query(query, _conexao, params=(livro_id,))
+        return _ler_lista(conexao, query, (int(livro_id),))
     except Exception as e:
         log_erro("carregar_capitulos", e, detalhes=f"livro_id={livro_id}")
         raise
@@ -156,25 +496,28 @@ def carregar_versiculos(
     conexao: sqlite3.Connection,
     livro_id: int,
     capitulo: int,
-) -> pd.DataFrame:
+    formato: str = "pandas",
+):
     """
     Carrega versículos de um capítulo específico.
 
     Note:
-        Esta função NÃO usa cache pois o usuário pode querer
-        ver diferentes capítulos rapidamente.
+        Não há cache por capítulo: em bancos com arquivo o capítulo é
+        fatiado do corpus da versão (`corpus.Corpus`), sem consulta SQL.
 
     Args:
         conexao: Conexão com o banco
         livro_id: ID do livro
         capitulo: Número do capítulo
+        formato: "pandas" (DataFrame) ou "arrow" (pyarrow.Table)
 
     Returns:
-        pd.DataFrame: DataFrame com colunas 'Versículo' e 'Texto'
+        pd.DataFrame | pa.Table: Colunas 'Versículo' e 'Texto'
 
     Raises:
-        ValueError: Se livro_id ou capitulo forem inválidos
+        ValueError: Se livro_id, capitulo ou formato forem inválidos
     """
+    _validar_formato(formato)
     if livro_id is None or capitulo is None:
         raise ValueError("livro_id e capitulo não podem ser nulos.")
 
@@ -194,11 +537,19 @@ def carregar_versiculos(
     """
 
     try:
-        df = pd.read_sql_query(
-            query,
-            conexao,
-            params=(livro_id_int, capitulo_int),
-        )
+        corpus = obter_corpus(conexao)
+        if corpus is not None:
+            df = corpus.capitulo(livro_id_int, capitulo_int, formato)
+        elif formato == "arrow":
+            df = _ler_arrow(
+                conexao, query, (livro_id_int, capitulo_int), ESQUEMA_CAPITULO
+            )
+        else:
+            df = pd.read_sql_query(
+                query,
+                conexao,
+                params=(livro_id_int, capitulo_int),
+            )
         # Logging de leitura (nome do livro é tratado na camada de UI)
         log_leitura(f"ID_{livro_id_int}", capitulo_int, "DESCONHECIDA")
         return df
@@ -212,42 +563,72 @@ def carregar_versiculos(
 
 
 # ============================================================
-# Busca simples
+# Referências ("Jo 3:16", "Sl 23", "Rm 8:28-39")
 # ============================================================
-def buscar_versiculos(
-    conexao: sqlite3.Connection,
-    termo: str,
-    testamento_id: Optional[int] = None,
-) -> pd.DataFrame:
+def _montar_mapa_livros(conexao: sqlite3.Connection) -> Dict[int, int]:
+    """{livro canônico: book_id} deste banco (casado pelo nome)."""
+    mapa: Dict[int, int] = {}
+    livros = conexao.execute("SELECT id, name FROM book ORDER BY id")
+    for livro_id, nome in livros:
+        numero = resolver_livro(nome)
+        if numero is not None:
+            mapa.setdefault(numero, int(livro_id))
+    return mapa
+
+
+@st.cache_data(ttl=3600, max_entries=MAX_ENTRADAS_LISTAS, show_spinner=False)
+def _mapa_livros_em_cache(
+    versao: Tuple[str, str, int, int],
+    _conexao: sqlite3.Connection,
+) -> Dict[int, int]:
+    """Mapa de livros em cache; a chave é a versão (não a conexão)."""
+    return _montar_mapa_livros(_conexao)
+
+
+def _livro_do_banco(conexao: sqlite3.Connection, numero: int) -> Optional[int]:
     """
-    Busca simples por termo com filtro de palavra inteira.
+    book_id, neste banco, do livro canônico `numero`.
 
-    Strategy:
-        1. SQL LIKE reduz o conjunto inicial (rápido)
-        2. Regex em Python garante palavra inteira (preciso)
+    Os nomes dos livros são resolvidos uma vez por versão (chave com
+    a impressão digital do arquivo); bancos em memória montam o mapa
+    a cada chamada.
+    """
+    versao = _versao_conexao(conexao)
+    if versao is None:
+        mapa = _montar_mapa_livros(conexao)
+    else:
+        mapa = _mapa_livros_em_cache(versao, conexao)
+    return mapa.get(numero)
 
-    Note:
-        Se o termo contém espaço, busca como frase sem word boundary.
-        Exemplo: "amor de Deus" busca a frase completa.
+
+def buscar_referencia(
+    conexao: sqlite3.Connection,
+    texto: str,
+) -> Optional[pd.DataFrame]:
+    """
+    Lê os versículos de uma referência digitada.
+
+    A referência é interpretada pela árvore de apelidos de
+    `referencias`; o livro vem do mapa canônico → book_id da versão
+    (em cache) e os versículos, de uma única consulta por faixa, que
+    usa o índice `verse(book_id, chapter)`.
 
     Args:
         conexao: Conexão com o banco
-        termo: Termo para buscar
-        testamento_id: ID do testamento (opcional, None = ambos)
+        texto: Referência (ex.: "Jo 3:16", "Sl 23", "Rm 8:28-39")
 
     Returns:
-        pd.DataFrame: DataFrame com colunas:
-                     ['Livro', 'Capítulo', 'Versículo', 'Texto']
+        pd.DataFrame | None: Colunas ['Livro', 'Capítulo', 'Versículo',
+                             'Texto'], ou None se o texto não é uma
+                             referência (deve ser tratado como busca)
     """
-    inicio = perf_counter()
+    referencia = interpretar_referencia(texto)
+    if referencia is None:
+        return None
 
-    termo = (termo or "").strip()
-    if not termo:
-        return pd.DataFrame(
-            columns=["Livro", "Capítulo", "Versículo", "Texto"]
-        )
+    inicio = perf_counter()
 
-    base_query = """
+    query = """
         SELECT
             book.name AS Livro,
             verse.chapter AS Capítulo,
@@ -255,187 +636,1995 @@ def buscar_versiculos(
             verse.text AS Texto
         FROM verse
         JOIN book ON verse.book_id = book.id
+        WHERE verse.book_id = ? AND verse.chapter = ?
+          AND verse.verse BETWEEN ? AND ?
+        ORDER BY verse.verse
     """
 
-    filtros = ["verse.text LIKE ?"]
-    params = [f"%{termo}%"]
-
-    if testamento_id:
-        filtros.append("book.testament_reference_id = ?")
-        params.append(testamento_id)
-
-    if filtros:
-        base_query += " WHERE " + " AND ".join(filtros)
-
     try:
-        df = pd.read_sql_query(
-            base_query,
-            conexao,
-            params=params,
-        ).reset_index(drop=True)
+        livro_id = _livro_do_banco(conexao, referencia["livro"])
+        if livro_id is None:
+            return pd.DataFrame(
+                columns=["Livro", "Capítulo", "Versículo", "Texto"]
+            )
+
+        # Sem versículo informado: o capítulo inteiro
+        params = (
+            livro_id,
+            referencia["capitulo"],
+            referencia["inicio"] or 1,
+            referencia["fim"] or 999,
+        )
+        resultados = pd.read_sql_query(query, conexao, params=params)
     except Exception as e:
-        log_erro("buscar_versiculos/SQL", e, detalhes=f"termo={termo}")
+        log_erro("buscar_referencia", e, detalhes=f"referencia={texto}")
         raise
 
-    # Se o termo tem espaço, trata como frase (sem word boundary)
-    if " " in termo:
-        termo_lower = termo.lower()
-        mascara = df["Texto"].astype(str).str.lower().str.contains(
-            termo_lower,
-            case=False,
-            regex=False,
-        )
-        resultados = df[mascara].reset_index(drop=True)
-    else:
-        # Caso contrário, aplica regex com word boundary
-        padrao = re.compile(
-            rf"\b{re.escape(termo.lower())}\b",
-            flags=re.IGNORECASE,
+    tempo_ms = int((perf_counter() - inicio) * 1000)
+    log_busca(texto, len(resultados), tempo_ms, tipo="referencia")
+    return resultados
+
+
+# ============================================================
+# Índice de texto completo (FTS5)
+# ============================================================
+def _tem_tabela(conexao: sqlite3.Connection, nome: str) -> bool:
+    """Indica se o banco possui a tabela (ou tabela virtual) informada."""
+    try:
+        cursor = conexao.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (nome,),
         )
-        mascara = df["Texto"].astype(str).str.lower().apply(
-            lambda texto: bool(padrao.search(texto))
+        return cursor.fetchone() is not None
+    except sqlite3.Error:
+        return False
+
+
+def _coluna_texto_like(conexao: sqlite3.Connection) -> Tuple[str, str]:
+    """
+    Escolhe a expressão de texto normalizado comparada pelo fallback LIKE.
+
+    Registra na conexão a função SQL `normalizar_texto`, para que o
+    LIKE compare sempre texto normalizado com termo normalizado.
+
+    Returns:
+        tuple: (expressão da coluna, JOIN necessário). Usa
+               `verse_norm.text_norm` quando o otimizador já a criou
+               (versículos alterados depois, sem linha na tabela, são
+               normalizados na consulta); caso contrário,
+               `normalizar_texto(verse.text)`.
+    """
+    conexao.create_function(
+        "normalizar_texto", 1, normalizar_texto, deterministic=True
+    )
+    if _tem_tabela(conexao, TABELA_NORMALIZADA):
+        return (
+            f"COALESCE({TABELA_NORMALIZADA}.text_norm, "
+            "normalizar_texto(verse.text))",
+            f"LEFT JOIN {TABELA_NORMALIZADA} "
+            f"ON {TABELA_NORMALIZADA}.id = verse.id",
         )
-        resultados = df[mascara].reset_index(drop=True)
+    return "normalizar_texto(verse.text)", ""
 
-    fim = perf_counter()
-    tempo_ms = int((fim - inicio) * 1000)
-    log_busca(termo, len(resultados), tempo_ms, tipo="simples")
 
-    return resultados
+def _frase_fts(texto: str) -> str:
+    """
+    Escapa um termo ou frase como string FTS5 entre aspas.
 
+    Dentro das aspas o FTS5 trata o conteúdo como frase: palavras
+    inteiras, na ordem, ignorando pontuação e maiúsculas.
+    """
+    return '"' + texto.replace('"', '""') + '"'
 
-# ============================================================
-# Busca avançada
-# ============================================================
-def buscar_versiculos_avancada(
+
+def _fts_suporta(termo: str) -> bool:
+    """
+    Indica se o termo pode ir para o FTS5: palavras, frases e
+    prefixos (`salv*`). Curingas no meio (`s*lv?`) usam o fallback.
+    """
+    return not tem_curinga(termo) or (
+        eh_prefixo(termo) and bool(prefixo_curinga(termo))
+    )
+
+
+def _termo_fts(termo: str) -> str:
+    """Converte um termo em expressão FTS5 (prefixo vira `"salv"*`)."""
+    if tem_curinga(termo):
+        return _frase_fts(prefixo_curinga(termo)) + "*"
+    return _frase_fts(termo)
+
+
+def _buscar_fts(
     conexao: sqlite3.Connection,
-    termos,
-    operador: str = "E",
+    expressao: str,
     testamento_id: Optional[int] = None,
     livro_id: Optional[int] = None,
-    busca_exata: bool = False,
+    limite: Optional[int] = None,
 ) -> pd.DataFrame:
     """
-    Busca avançada com múltiplas palavras e operadores lógicos.
-
-    Strategy:
-        1. SQL LIKE reduz conjunto inicial
-        2. Python aplica AND/OR com word boundary
-        3. Busca exata funciona como frase completa
+    Executa uma expressão MATCH no índice FTS5 e retorna os versículos.
 
     Args:
-        conexao: Conexão com o banco
-        termos: String ou lista de termos para buscar
-        operador: "E" (AND) ou "OU" (OR)
+        conexao: Conexão com o banco (deve possuir `verse_fts`)
+        expressao: Expressão FTS5 já escapada (ex.: '"fé" AND "graça"')
         testamento_id: Filtrar por testamento (opcional)
         livro_id: Filtrar por livro (opcional)
-        busca_exata: Se True, busca frase completa
+        limite: Se informado, retorna só os `limite` versículos mais
+                relevantes (BM25 do FTS5), com a coluna 'Relevância'
 
     Returns:
-        pd.DataFrame: DataFrame com resultados da busca
+        pd.DataFrame: Colunas ['Livro', 'Capítulo', 'Versículo', 'Texto']
     """
-    inicio = perf_counter()
-
-    # Normalizar termos
-    if isinstance(termos, str):
-        termos = [termos.strip()]
-    else:
-        termos = [t.strip() for t in termos if t and t.strip()]
-
-    if not termos:
-        return pd.DataFrame(
-            columns=["Livro", "Capítulo", "Versículo", "Texto"]
-        )
-
-    base_query = """
-        SELECT 
-            book.name AS Livro, 
-            verse.chapter AS Capítulo, 
-            verse.verse AS Versículo, 
-            verse.text AS Texto
-        FROM verse
+    relevancia = f", -bm25({TABELA_FTS}) AS Relevância" if limite else ""
+    query = f"""
+        SELECT
+            book.name AS Livro,
+            verse.chapter AS Capítulo,
+            verse.verse AS Versículo,
+            verse.text AS Texto{relevancia}
+        FROM {TABELA_FTS}
+        JOIN verse ON verse.id = {TABELA_FTS}.rowid
         JOIN book ON verse.book_id = book.id
+        WHERE {TABELA_FTS} MATCH ?
     """
-
-    filtros = []
-    params: list = []
-
-    # Redução inicial com LIKE
-    if busca_exata:
-        frase = " ".join(termos)
-        filtros.append("verse.text LIKE ?")
-        params.append(f"%{frase}%")
-    else:
-        condicoes = []
-        for termo in termos:
-            condicoes.append("verse.text LIKE ?")
-            params.append(f"%{termo}%")
-        operador_sql = " AND " if operador.upper() == "E" else " OR "
-        filtros.append("(" + operador_sql.join(condicoes) + ")")
+    params: list = [expressao]
 
     if testamento_id:
-        filtros.append("book.testament_reference_id = ?")
+        query += " AND book.testament_reference_id = ?"
         params.append(testamento_id)
 
     if livro_id:
-        filtros.append("book.id = ?")
+        query += " AND book.id = ?"
         params.append(livro_id)
 
-    if filtros:
-        base_query += " WHERE " + " AND ".join(filtros)
+    if limite:
+        query += f" ORDER BY bm25({TABELA_FTS}) LIMIT ?"
+        params.append(int(limite))
 
-    try:
-        df = pd.read_sql_query(
-            base_query,
-            conexao,
-            params=params,
-        ).reset_index(drop=True)
-    except Exception as e:
-        log_erro(
-            "buscar_versiculos_avancada/SQL",
-            e,
-            detalhes=f"termos={termos}, operador={operador}",
-        )
-        raise
+    resultados = pd.read_sql_query(query, conexao, params=params)
+    if limite:
+        resultados["Relevância"] = resultados["Relevância"].round(3)
+    return resultados
+
+
+# ============================================================
+# Índice invertido em memória
+# ============================================================
+def _sequencias_termos(
+    indice: IndiceInvertido,
+    termos: List[str],
+    por_radical: bool = False,
+) -> List[Tuple[int, List[str]]]:
+    """
+    Palavras normalizadas de cada termo (curingas expandidos pelo
+    vocabulário), usadas para relevância e destaques. Com
+    `por_radical`, cada palavra vira todas as suas variações.
+
+    Cada sequência sai com o índice do termo que a gerou, para que
+    os destaques saibam a que termo pertence cada trecho.
+    """
+    sequencias = []
+    for i, termo in enumerate(termos):
+        if tem_curinga(termo):
+            sequencias.extend(
+                (i, [palavra]) for palavra in indice.expandir(termo)
+            )
+        elif por_radical:
+            sequencias.extend(
+                (i, [palavra])
+                for token in tokenizar(termo)
+                for palavra in indice.variantes(token)
+            )
+        else:
+            sequencias.append((i, tokenizar(termo)))
+    return sequencias
+
+
+def _corpus_do_indice(
+    conexao: sqlite3.Connection,
+    indice: IndiceInvertido,
+) -> Optional[Corpus]:
+    """
+    Corpus da versão, se estiver alinhado ao índice (mesmas posições).
+
+    Os dois são montados na mesma ordem canônica; a conferência dos
+    tamanhos protege contra um arquivo trocado entre as duas cargas.
+    """
+    corpus = obter_corpus(conexao)
+    if corpus is None or len(corpus) != len(indice):
+        return None
+    return corpus
+
+
+def _materializar(
+    conexao: sqlite3.Connection,
+    indice: IndiceInvertido,
+    posicoes: np.ndarray,
+    sequencias: Optional[List[Tuple[int, List[str]]]] = None,
+    formato: str = "pandas",
+):
+    """
+    Monta apenas os versículos finais de uma busca no índice.
+
+    Os versículos saem do corpus da versão; sem corpus, são lidos
+    do banco pelos rowids.
+
+    Args:
+        conexao: Conexão com o banco da versão
+        indice: Índice da mesma versão
+        posicoes: Posições (ordenadas) dos versículos encontrados
+        sequencias: Se informadas (ver `_sequencias_termos`), adiciona
+                    a coluna 'Destaques' com os trechos dessas palavras
+                    (ver `IndiceInvertido.trechos`)
+        formato: "pandas" ou "arrow" (lido direto do cursor)
+
+    Returns:
+        pd.DataFrame | pa.Table: Colunas ['Livro', 'Capítulo',
+                                 'Versículo', 'Texto']
+    """
+    corpus = _corpus_do_indice(conexao, indice)
+    if corpus is not None:
+        resultados = corpus.tabela(posicoes, formato)
+        if sequencias is not None:
+            trechos = indice.trechos(sequencias, posicoes)
+            if formato == "arrow":
+                return resultados.append_column("Destaques", pa.array(trechos))
+            resultados["Destaques"] = trechos
+        return resultados
+
+    query = """
+        SELECT
+            book.name AS Livro,
+            verse.chapter AS Capítulo,
+            verse.verse AS Versículo,
+            verse.text AS Texto
+        FROM verse
+        JOIN book ON verse.book_id = book.id
+        WHERE verse.id IN (SELECT value FROM json_each(?))
+        ORDER BY verse.book_id, verse.chapter, verse.verse
+    """
+    params = (json.dumps(indice.rowids(posicoes)),)
+    if formato == "arrow":
+        resultados = _ler_arrow(conexao, query, params, ESQUEMA_VERSICULOS)
+        if sequencias is not None:
+            resultados = resultados.append_column(
+                "Destaques", pa.array(indice.trechos(sequencias, posicoes))
+            )
+        return resultados
+
+    resultados = pd.read_sql_query(query, conexao, params=params)
+    if sequencias is not None:
+        resultados["Destaques"] = indice.trechos(sequencias, posicoes)
+    return resultados
+
+
+def _materializar_relevantes(
+    conexao: sqlite3.Connection,
+    indice: IndiceInvertido,
+    posicoes: np.ndarray,
+    sequencias: List[Tuple[int, List[str]]],
+    limite: int,
+    destaques: bool = False,
+) -> pd.DataFrame:
+    """
+    Seleciona no índice os `limite` versículos mais relevantes (BM25)
+    e monta só esses (do corpus ou do banco), na ordem de relevância.
+
+    Returns:
+        pd.DataFrame: Colunas ['Livro', 'Capítulo', 'Versículo', 'Texto',
+                      'Relevância'] (+ 'Destaques', se pedido)
+    """
+    tokens = [token for _, sequencia in sequencias for token in sequencia]
+    melhores = indice.melhores(tokens, posicoes, limite)
+    selecionados = np.array([p for p, _ in melhores], dtype=np.uint32)
+
+    corpus = _corpus_do_indice(conexao, indice)
+    if corpus is not None:
+        resultados = corpus.tabela(selecionados)
+    else:
+        resultados = _ler_por_rowids(conexao, indice.rowids(selecionados))
+    resultados["Relevância"] = [round(p, 3) for _, p in melhores]
+    if destaques:
+        resultados["Destaques"] = indice.trechos(sequencias, selecionados)
+    return resultados
+
+
+def _ler_por_rowids(
+    conexao: sqlite3.Connection,
+    rowids: List[int],
+) -> pd.DataFrame:
+    """Lê versículos pelos rowids, mantendo a ordem da lista."""
+    query = """
+        SELECT
+            book.name AS Livro,
+            verse.chapter AS Capítulo,
+            verse.verse AS Versículo,
+            verse.text AS Texto
+        FROM json_each(?) AS alvo
+        JOIN verse ON verse.id = alvo.value
+        JOIN book ON verse.book_id = book.id
+        ORDER BY alvo.key
+    """
+    return pd.read_sql_query(query, conexao, params=(json.dumps(rowids),))
+
+
+def _adicionar_destaques(resultados: pd.DataFrame, termos: List[str]) -> None:
+    """
+    Coluna 'Destaques' para os caminhos sem índice em memória: uma
+    passada do localizador de termos (e dos curingas) por versículo.
+    """
+    trechos = localizar_trechos(tuple(termos))
+    resultados["Destaques"] = [trechos(texto) for texto in resultados["Texto"]]
+
+
+def _ordenar_por_relevancia(
+    resultados: pd.DataFrame,
+    termos: List[str],
+    limite: int,
+) -> pd.DataFrame:
+    """
+    Relevância para o fallback sem índice: BM25 calculado sobre os
+    próprios resultados (frequências do localizador de termos) e os
+    `limite` melhores selecionados por heap.
+    """
+    if resultados.empty:
+        resultados["Relevância"] = pd.Series(dtype=float)
+        return resultados
+
+    simples = [t for t in termos if not tem_curinga(t)]
+    curingas = [
+        re.compile(rf"\b{regex_curinga(t)}\b") for t in termos if tem_curinga(t)
+    ]
+    localizador = LocalizadorTermos(simples)
+
+    frequencias = []
+    comprimentos = []
+    for texto in resultados["Texto"].map(normalizar_texto):
+        contagem = localizador.contagens(texto, normalizado=True)
+        contagem += [len(regex.findall(texto)) for regex in curingas]
+        frequencias.append(contagem)
+        comprimentos.append(len(tokenizar(texto, normalizado=True)))
+
+    tf = np.array(frequencias, dtype=np.float64)
+    comprimentos_arr = np.array(comprimentos, dtype=np.float64)
+    total = len(tf)
+    documentos = (tf > 0).sum(axis=0)
+    idf = np.log(1 + (total - documentos + 0.5) / (documentos + 0.5))
+    normalizacao = BM25_K1 * (
+        1 - BM25_B + BM25_B * comprimentos_arr / (comprimentos_arr.mean() or 1)
+    )
+    pontuacao = (
+        idf * tf * (BM25_K1 + 1) / (tf + normalizacao[:, None])
+    ).sum(axis=1).tolist()
+
+    melhores = heapq.nlargest(limite, range(total), key=pontuacao.__getitem__)
+    resultados = resultados.iloc[melhores].reset_index(drop=True)
+    resultados["Relevância"] = [round(pontuacao[j], 3) for j in melhores]
+    return resultados
+
+
+def _posicoes_termo(
+    indice: IndiceInvertido,
+    termo: str,
+    por_radical: bool = False,
+) -> np.ndarray:
+    """
+    Resolve um termo no índice.
+
+    Uma palavra vem direto da posting list; um termo com várias
+    palavras (frase) é resolvido pelo índice posicional, exigindo as
+    palavras consecutivas (pontuação entre elas é ignorada). Curingas
+    (`salv*`) são expandidos pelo vocabulário da versão. Com
+    `por_radical`, cada palavra aceita qualquer variação de mesmo
+    radical.
+    """
+    if tem_curinga(termo):
+        return indice.posting_curinga(termo)
+
+    tokens = tokenizar(termo)
+    if len(tokens) == 1:
+        if por_radical:
+            return indice.posting_radical(tokens[0])
+        return indice.posting(tokens[0])
+    return indice.frase(tokens, por_radical=por_radical)
+
+
+def _mascara_termo(
+    indice: IndiceInvertido,
+    termo: str,
+    por_radical: bool = False,
+) -> np.ndarray:
+    """
+    Máscara booleana de um termo: palavra única vem do cache de
+    máscaras do índice; frases são resolvidas por `_posicoes_termo`.
+    """
+    if tem_curinga(termo):
+        return indice.mascara(normalizar_texto(termo.strip()))
+
+    tokens = tokenizar(termo)
+    if len(tokens) == 1:
+        return indice.mascara(tokens[0], por_radical=por_radical)
+    return indice.mascara_posicoes(_posicoes_termo(indice, termo, por_radical))
+
+
+# ============================================================
+# Busca simples
+# ============================================================
+def buscar_versiculos(
+    conexao: sqlite3.Connection,
+    termo: str,
+    testamento_id: Optional[int] = None,
+    relevancia: bool = False,
+    limite: int = 50,
+    destaques: bool = False,
+    por_radical: bool = False,
+    formato: str = "pandas",
+):
+    """
+    Busca simples por termo com filtro de palavra inteira.
+
+    Strategy:
+        1. Índice em memória: posting list da palavra (ou índice
+           posicional para frases) e leitura só dos versículos finais
+        2. Com índice FTS5: MATCH resolve palavra/frase direto no índice
+        3. Sem índice (fallback): SQL LIKE reduz o conjunto inicial e
+           regex em Python garante palavra inteira
+
+    Note:
+        Se o termo contém espaço, busca como frase.
+        Exemplo: "amor de Deus" busca a frase completa.
+
+        Palavras com curinga também são aceitas: `*` para qualquer
+        sequência de letras e `?` para uma letra.
+        Exemplo: "salv*" encontra salvação, salvador, salvou...
+
+        Com `relevancia=True`, retorna só os `limite` versículos de
+        maior pontuação BM25, do mais para o menos relevante, com a
+        coluna extra 'Relevância'.
+
+        Com `destaques=True`, a coluna 'Destaques' traz, para cada
+        versículo, os trechos encontrados como trios (início, fim,
+        termo) de posições em 'Texto', prontos para realçar (`termo`
+        é o índice do termo da busca que casou).
+
+        Com `por_radical=True`, cada palavra encontra também as suas
+        variações de mesmo radical: "amar" encontra amou, amará,
+        amando... Os radicais vêm do índice em memória; sem ele, a
+        busca é pela palavra exata.
+
+    Args:
+        conexao: Conexão com o banco
+        termo: Termo para buscar
+        testamento_id: ID do testamento (opcional, None = ambos)
+        relevancia: Ordenar por relevância (BM25) em vez da ordem bíblica
+        limite: Quantidade de versículos no modo relevância
+        destaques: Incluir a coluna 'Destaques'
+        por_radical: Incluir as variações de cada palavra
+        formato: "pandas" (DataFrame) ou "arrow" (pyarrow.Table; no
+                 índice em memória é montada direto do cursor)
+
+    Returns:
+        pd.DataFrame | pa.Table: Colunas
+                     ['Livro', 'Capítulo', 'Versículo', 'Texto']
+
+    Raises:
+        ValueError: Se o formato for inválido
+    """
+    inicio = perf_counter()
+    _validar_formato(formato)
+
+    termo = (termo or "").strip()
+    if not termo:
+        return _no_formato(
+            pd.DataFrame(columns=["Livro", "Capítulo", "Versículo", "Texto"]),
+            formato,
+        )
+
+    chave = chave_busca(
+        conexao,
+        "simples",
+        (termo,),
+        testamento_id=testamento_id,
+        limite=limite if relevancia else None,
+        destaques=destaques,
+        por_radical=por_radical,
+    )
+    resultados = CACHE_RESULTADOS.obter(chave) if chave else None
+    if resultados is not None:
+        tempo_ms = int((perf_counter() - inicio) * 1000)
+        log_busca(termo, len(resultados), tempo_ms, tipo="simples")
+        return _no_formato(resultados, formato)
+
+    indice = obter_indice(conexao)
+
+    if indice is not None:
+        try:
+            posicoes = indice.filtrar(
+                _posicoes_termo(indice, termo, por_radical),
+                testamento_id=testamento_id,
+            )
+            sequencias = _sequencias_termos(indice, [termo], por_radical)
+            if relevancia:
+                resultados = _materializar_relevantes(
+                    conexao, indice, posicoes, sequencias, limite, destaques
+                )
+            else:
+                resultados = _materializar(
+                    conexao,
+                    indice,
+                    posicoes,
+                    sequencias if destaques else None,
+                    formato=formato,
+                )
+        except Exception as e:
+            log_erro("buscar_versiculos/indice", e, detalhes=f"termo={termo}")
+            raise
+    elif _tem_tabela(conexao, TABELA_FTS) and _fts_suporta(termo):
+        try:
+            resultados = _buscar_fts(
+                conexao,
+                _termo_fts(termo),
+                testamento_id=testamento_id,
+                limite=limite if relevancia else None,
+            )
+        except Exception as e:
+            log_erro("buscar_versiculos/FTS", e, detalhes=f"termo={termo}")
+            raise
+        if destaques:
+            _adicionar_destaques(resultados, [termo])
+    else:
+        resultados = _buscar_versiculos_like(conexao, termo, testamento_id)
+        if relevancia:
+            resultados = _ordenar_por_relevancia(resultados, [termo], limite)
+        if destaques:
+            _adicionar_destaques(resultados, [termo])
+
+    # O cache guarda DataFrames; tabelas Arrow do índice não entram
+    if chave and isinstance(resultados, pd.DataFrame):
+        CACHE_RESULTADOS.guardar(chave, resultados)
+
+    fim = perf_counter()
+    tempo_ms = int((fim - inicio) * 1000)
+    log_busca(termo, len(resultados), tempo_ms, tipo="simples")
+
+    return _no_formato(resultados, formato)
+
+
+def _buscar_versiculos_like(
+    conexao: sqlite3.Connection,
+    termo: str,
+    testamento_id: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Fallback de `buscar_versiculos` para bancos sem índice FTS5.
+
+    A comparação é feita sobre o texto normalizado (sem acentos,
+    minúsculas); com `verse_norm` disponível nada é convertido por
+    consulta, sem ela o texto é normalizado pela função SQL
+    `normalizar_texto` dentro do próprio filtro.
+    """
+    coluna, join = _coluna_texto_like(conexao)
+    termo_norm = normalizar_texto(termo)
+
+    base_query = f"""
+        SELECT
+            book.name AS Livro,
+            verse.chapter AS Capítulo,
+            verse.verse AS Versículo,
+            verse.text AS Texto,
+            {coluna} AS TextoNorm
+        FROM verse
+        JOIN book ON verse.book_id = book.id
+        {join}
+    """
+
+    # Curinga: o LIKE usa só a parte literal antes do primeiro * ou ?
+    literal = termo
+    if tem_curinga(termo) and " " not in termo:
+        literal = re.split(r"[*?]", termo, maxsplit=1)[0]
+
+    filtros = [f"{coluna} LIKE ?"]
+    params = [f"%{normalizar_texto(literal)}%"]
+
+    if testamento_id:
+        filtros.append("book.testament_reference_id = ?")
+        params.append(testamento_id)
+
+    if filtros:
+        base_query += " WHERE " + " AND ".join(filtros)
+
+    try:
+        with _limite_tempo(conexao, LIMITE_TEMPO_BUSCA):
+            df = pd.read_sql_query(
+                base_query,
+                conexao,
+                params=params,
+            ).reset_index(drop=True)
+    except Exception as e:
+        log_erro("buscar_versiculos/SQL", e, detalhes=f"termo={termo}")
+        raise
+
+    textos_norm = df.pop("TextoNorm").astype(str)
+
+    # Se o termo tem espaço, trata como frase (sem word boundary)
+    if " " in termo:
+        mascara = textos_norm.str.contains(termo_norm, regex=False)
+    else:
+        # Caso contrário, aplica regex com word boundary
+        if tem_curinga(termo):
+            padrao = re.compile(rf"\b{regex_curinga(termo)}\b")
+        else:
+            padrao = re.compile(rf"\b{re.escape(termo_norm)}\b")
+        mascara = textos_norm.map(lambda texto: bool(padrao.search(texto)))
+
+    resultados = df[mascara].reset_index(drop=True)
+
+    return resultados
+
+
+def sugerir_termos(
+    conexao: sqlite3.Connection,
+    termo: str,
+    limite: int = 3,
+) -> List[str]:
+    """
+    Sugestões "você quis dizer" para um termo sem resultados.
+
+    Cada palavra do termo ausente do vocabulário da versão é trocada
+    pelas palavras mais próximas por distância de edição
+    (ex.: "ressureição" → "ressurreição"). A consulta usa apenas o
+    vocabulário do índice em memória; sem índice não há sugestões.
+
+    Args:
+        conexao: Conexão com o banco
+        termo: Termo digitado pelo usuário
+        limite: Máximo de sugestões
+
+    Returns:
+        list: Termos sugeridos, do mais para o menos provável
+    """
+    termo = (termo or "").strip()
+    indice = obter_indice(conexao)
+    if indice is None or not termo or tem_curinga(termo):
+        return []
+
+    try:
+        tokens = tokenizar(termo)
+        alternativas = [
+            [token] if len(indice.posting(token)) else indice.similares(token, limite)
+            for token in tokens
+        ]
+        if not tokens or not all(alternativas) or all(
+            len(opcoes) == 1 and opcoes[0] == token
+            for token, opcoes in zip(tokens, alternativas)
+        ):
+            return []
+
+        # Uma palavra: as melhores opções; frase: cada posição varia
+        # a partir da melhor combinação
+        variacoes = []
+        for k in range(limite):
+            variacoes.append(
+                [opcoes[min(k, len(opcoes) - 1)] for opcoes in alternativas]
+            )
+        sugestoes = []
+        for variacao in variacoes:
+            sugestao = " ".join(indice.forma(p) for p in variacao)
+            if sugestao not in sugestoes:
+                sugestoes.append(sugestao)
+        return sugestoes
+    except Exception as e:
+        log_erro("sugerir_termos", e, detalhes=f"termo={termo}")
+        raise
+
+
+def autocompletar(
+    conexao: sqlite3.Connection,
+    texto: str,
+    limite: int = 8,
+) -> List[str]:
+    """
+    Completa a última palavra digitada com as palavras mais frequentes
+    da versão (ex.: "amor de De" → "amor de deus").
+
+    Usa só o vocabulário do índice em memória (sem consultar o
+    SQLite), rápido o bastante para cada tecla. Sem índice, ou se a
+    última palavra tiver menos de 2 letras, não há sugestões.
+
+    Args:
+        conexao: Conexão com o banco
+        texto: Texto digitado até agora
+        limite: Máximo de sugestões
+
+    Returns:
+        list: Textos completos sugeridos, do mais para o menos frequente
+    """
+    texto = texto or ""
+    palavras = tokenizar_com_posicoes(texto)
+    if not palavras or palavras[-1][2] != len(texto):
+        return []
+
+    _, inicio, fim = palavras[-1]
+    if fim - inicio < 2:
+        return []
+
+    indice = obter_indice(conexao)
+    if indice is None:
+        return []
+
+    anterior = texto[:inicio]
+    return [
+        anterior + indice.forma(palavra)
+        for palavra in indice.completar(texto[inicio:fim], limite)
+    ]
+
+
+def buscar_em_todas_versoes(
+    termo: str,
+    testamento_id: Optional[int] = None,
+    bancos: Optional[Dict[str, Path]] = None,
+    max_threads: int = 8,
+) -> Tuple[Dict[str, int], pd.DataFrame]:
+    """
+    Executa a mesma busca simples em todas as versões disponíveis.
+
+    Cada versão é consultada em uma thread própria, com a conexão
+    da thread no pool (`obter_conexao`).
+    Uma versão que falhar é registrada no log e fica de fora do
+    resultado, sem interromper as demais.
+
+    Args:
+        termo: Termo para buscar
+        testamento_id: ID do testamento (opcional, None = ambos)
+        bancos: {versão: caminho .sqlite}; padrão: todos os arquivos
+                da pasta data (`listar_bancos_disponiveis`)
+        max_threads: Máximo de versões consultadas ao mesmo tempo
+
+    Returns:
+        tuple: ({versão: quantidade de versículos}, DataFrame com as
+               colunas ['Versão', 'Livro', 'Capítulo', 'Versículo', 'Texto'])
+    """
+    if bancos is None:
+        bancos = listar_bancos_disponiveis(DATA_DIR)
+
+    def buscar_versao(caminho: Path) -> pd.DataFrame:
+        conexao = obter_conexao(str(caminho))
+        return buscar_versiculos(conexao, termo, testamento_id)
+
+    por_versao: Dict[str, pd.DataFrame] = {}
+    if bancos:
+        with ThreadPoolExecutor(
+            max_workers=min(max_threads, len(bancos))
+        ) as executor:
+            futuros = {
+                executor.submit(buscar_versao, caminho): versao
+                for versao, caminho in bancos.items()
+            }
+            for futuro in as_completed(futuros):
+                versao = futuros[futuro]
+                try:
+                    por_versao[versao] = futuro.result()
+                except Exception as e:
+                    log_erro(
+                        "buscar_em_todas_versoes",
+                        e,
+                        detalhes=f"versao={versao}, termo={termo}",
+                    )
+
+    contagens = {versao: len(por_versao[versao]) for versao in sorted(por_versao)}
+    partes = [
+        por_versao[versao].assign(Versão=versao)
+        for versao in contagens
+        if not por_versao[versao].empty
+    ]
+    colunas = ["Versão", "Livro", "Capítulo", "Versículo", "Texto"]
+    if not partes:
+        return contagens, pd.DataFrame(columns=colunas)
+    return contagens, pd.concat(partes, ignore_index=True)[colunas]
+
+
+# ============================================================
+# Busca avançada
+# ============================================================
+def buscar_versiculos_avancada(
+    conexao: sqlite3.Connection,
+    termos,
+    operador: str = "E",
+    testamento_id: Optional[int] = None,
+    livro_id: Optional[int] = None,
+    busca_exata: bool = False,
+    distancia: int = 5,
+    relevancia: bool = False,
+    limite: int = 50,
+    destaques: bool = False,
+    por_radical: bool = False,
+    formato: str = "pandas",
+):
+    """
+    Busca avançada com múltiplas palavras e operadores lógicos.
+
+    Strategy:
+        1. Índice em memória: cada termo vira uma máscara booleana sobre
+           todos os versículos e AND/OR/filtros são operações bit a bit;
+           o texto é lido só para os versículos finais
+        2. Com índice FTS5: AND/OR/frase viram uma única expressão MATCH
+        3. Sem índice (fallback): SQL LIKE reduz conjunto inicial e
+           um localizador Aho–Corasick aplica AND/OR com word boundary
+           em uma única passada por versículo
+        4. Busca exata funciona como frase completa
+        5. Operador "REGEX": os termos formam uma expressão regular
+           avaliada dentro do SQLite (função REGEXP), com limite de
+           tempo; só as linhas que casam chegam ao Python
+
+    Note:
+        Termos iniciados por `-` são excluídos: ["amor", "-irmão"]
+        encontra versículos com "amor" e sem "irmão". A exclusão faz
+        parte do plano da consulta (máscara NÃO no índice, `NOT` no
+        FTS5, mesma passada do localizador no fallback), então os
+        versículos excluídos nunca são lidos do banco nos dois
+        primeiros caminhos.
+
+    Args:
+        conexao: Conexão com o banco
+        termos: String ou lista de termos para buscar
+        operador: "E" (AND), "OU" (OR), "PERTO" (todas as palavras
+                  com no máximo `distancia` palavras entre elas) ou
+                  "REGEX" (expressão regular sobre o texto original,
+                  sem diferenciar maiúsculas)
+        testamento_id: Filtrar por testamento (opcional)
+        livro_id: Filtrar por livro (opcional)
+        busca_exata: Se True, busca frase completa
+        distancia: Máximo de palavras entre os termos no operador PERTO
+        relevancia: Retornar só os `limite` versículos mais relevantes
+                    (BM25), com a coluna 'Relevância' (não se aplica
+                    ao REGEX, que mantém a ordem bíblica)
+        limite: Quantidade de versículos no modo relevância
+        destaques: Incluir a coluna 'Destaques' com os trechos
+                   encontrados (trios início/fim/termo em 'Texto';
+                   no REGEX, termo = 0)
+        por_radical: Cada palavra encontra também as suas variações
+                     de mesmo radical (só com o índice em memória;
+                     sem ele, vale a palavra exata)
+        formato: "pandas" (DataFrame) ou "arrow" (pyarrow.Table)
+
+    Returns:
+        pd.DataFrame | pa.Table: Resultados da busca
+
+    Raises:
+        ValueError: Se o formato ou a expressão regular forem inválidos,
+                    ou se `busca_exata` vier com o operador REGEX
+        TimeoutError: Se a varredura passar de `LIMITE_TEMPO_BUSCA`
+    """
+    inicio = perf_counter()
+    _validar_formato(formato)
+    _validar_operador(operador, busca_exata)
+
+    if operador.upper() == "REGEX":
+        padrao = " ".join(_lista_termos(termos))
+        resultados = _buscar_versiculos_regex(
+            conexao, padrao, testamento_id, livro_id, destaques
+        )
+        tempo_ms = int((perf_counter() - inicio) * 1000)
+        log_busca(padrao, len(resultados), tempo_ms, tipo="regex")
+        return _no_formato(resultados, formato)
+
+    termos, excluir = _separar_exclusoes(_lista_termos(termos))
+    if not termos:
+        return _no_formato(
+            pd.DataFrame(columns=["Livro", "Capítulo", "Versículo", "Texto"]),
+            formato,
+        )
+
+    chave = chave_busca(
+        conexao,
+        "avancada",
+        tuple(termos),
+        excluir=tuple(normalizar_texto(t) for t in excluir),
+        operador=operador.upper(),
+        testamento_id=testamento_id,
+        livro_id=livro_id,
+        busca_exata=busca_exata,
+        distancia=int(distancia) if operador.upper() == "PERTO" else None,
+        limite=limite if relevancia else None,
+        destaques=destaques,
+        por_radical=por_radical,
+    )
+    resultados = CACHE_RESULTADOS.obter(chave) if chave else None
+    if resultados is not None:
+        tempo_ms = int((perf_counter() - inicio) * 1000)
+        log_busca(" / ".join(termos), len(resultados), tempo_ms, tipo="avancada")
+        return _no_formato(resultados, formato)
+
+    # Termos a destacar: a frase inteira na busca exata e cada palavra
+    # no PERTO
+    if busca_exata:
+        termos_destaque = [" ".join(termos)]
+    elif operador.upper() == "PERTO":
+        termos_destaque = [tok for t in termos for tok in tokenizar(t)]
+    else:
+        termos_destaque = termos
+
+    indice = obter_indice(conexao)
+
+    if indice is not None:
+        try:
+            posicoes = _posicoes_avancada(
+                indice,
+                termos,
+                operador,
+                testamento_id,
+                livro_id,
+                busca_exata,
+                distancia,
+                por_radical,
+                excluir,
+            )
+            sequencias = _sequencias_termos(indice, termos_destaque, por_radical)
+            if relevancia:
+                resultados = _materializar_relevantes(
+                    conexao, indice, posicoes, sequencias, limite, destaques
+                )
+            else:
+                resultados = _materializar(
+                    conexao,
+                    indice,
+                    posicoes,
+                    sequencias if destaques else None,
+                    formato=formato,
+                )
+        except Exception as e:
+            log_erro(
+                "buscar_versiculos_avancada/indice",
+                e,
+                detalhes=f"termos={termos}, operador={operador}",
+            )
+            raise
+    elif _tem_tabela(conexao, TABELA_FTS) and all(
+        map(_fts_suporta, termos + excluir)
+    ):
+        if busca_exata:
+            expressao = _frase_fts(" ".join(termos))
+        elif operador.upper() == "PERTO":
+            frases = " ".join(_frase_fts(t) for t in termos)
+            expressao = f"NEAR({frases}, {int(distancia)})"
+        else:
+            operador_fts = " AND " if operador.upper() == "E" else " OR "
+            expressao = operador_fts.join(_termo_fts(t) for t in termos)
+
+        # NOT tem a maior precedência no FTS5: (a OR b) NOT c NOT d
+        for termo in excluir:
+            expressao = f"({expressao}) NOT {_termo_fts(termo)}"
+
+        try:
+            resultados = _buscar_fts(
+                conexao,
+                expressao,
+                testamento_id=testamento_id,
+                livro_id=livro_id,
+                limite=limite if relevancia else None,
+            )
+        except Exception as e:
+            log_erro(
+                "buscar_versiculos_avancada/FTS",
+                e,
+                detalhes=f"termos={termos}, operador={operador}",
+            )
+            raise
+        if destaques:
+            _adicionar_destaques(resultados, termos_destaque)
+    else:
+        resultados = _buscar_versiculos_avancada_like(
+            conexao,
+            termos,
+            operador,
+            testamento_id,
+            livro_id,
+            busca_exata,
+            distancia,
+            excluir,
+        )
+        if relevancia:
+            resultados = _ordenar_por_relevancia(resultados, termos, limite)
+        if destaques:
+            _adicionar_destaques(resultados, termos_destaque)
+
+    if chave and isinstance(resultados, pd.DataFrame):
+        CACHE_RESULTADOS.guardar(chave, resultados)
+
+    fim = perf_counter()
+    tempo_ms = int((fim - inicio) * 1000)
+    log_busca(" / ".join(termos), len(resultados), tempo_ms, tipo="avancada")
+
+    return _no_formato(resultados, formato)
+
+
+def _lista_termos(termos) -> List[str]:
+    """Aceita string ou lista de termos; remove vazios e espaços."""
+    if isinstance(termos, str):
+        return [termos.strip()] if termos.strip() else []
+    return [t.strip() for t in termos if t and t.strip()]
+
+
+def _separar_exclusoes(termos: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Separa os termos de exclusão (`-palavra`) dos demais.
+
+    Exemplo: ["amor", "-irmão"] → (["amor"], ["irmão"])
+    """
+    incluir, excluir = [], []
+    for termo in termos:
+        if termo.startswith("-") and termo[1:].strip():
+            excluir.append(termo[1:].strip())
+        else:
+            incluir.append(termo)
+    return incluir, excluir
+
+
+def _buscar_versiculos_regex(
+    conexao: sqlite3.Connection,
+    padrao: str,
+    testamento_id: Optional[int],
+    livro_id: Optional[int],
+    destaques: bool = False,
+) -> pd.DataFrame:
+    """
+    Busca por expressão regular, filtrada dentro do SQLite (REGEXP).
+
+    A expressão é validada antes da consulta e a varredura (e o
+    cálculo dos destaques) roda com o limite de tempo de
+    `_limite_tempo`, que também interrompe um casamento sozinho.
+
+    Raises:
+        ValueError: Se a expressão regular for inválida ou passar de
+                    `MAX_TAMANHO_REGEX` caracteres
+        TimeoutError: Se a varredura passar de `LIMITE_TEMPO_BUSCA`
+    """
+    if not padrao:
+        return pd.DataFrame(columns=["Livro", "Capítulo", "Versículo", "Texto"])
+
+    if len(padrao) > MAX_TAMANHO_REGEX:
+        raise ValueError(
+            f"Expressão regular muito longa ({len(padrao)} caracteres; "
+            f"máximo {MAX_TAMANHO_REGEX})."
+        )
+    try:
+        regex = _compilar_regex(padrao)
+    except rx.error as e:
+        raise ValueError(f"Expressão regular inválida: {e}") from e
+
+    query = """
+        SELECT
+            book.name AS Livro,
+            verse.chapter AS Capítulo,
+            verse.verse AS Versículo,
+            verse.text AS Texto
+        FROM verse
+        JOIN book ON verse.book_id = book.id
+        WHERE verse.text REGEXP ?
+    """
+    params: list = [padrao]
+
+    if testamento_id:
+        query += " AND book.testament_reference_id = ?"
+        params.append(testamento_id)
+
+    if livro_id:
+        query += " AND verse.book_id = ?"
+        params.append(livro_id)
+
+    query += " ORDER BY verse.book_id, verse.chapter, verse.verse"
+
+    # Conexões abertas fora de `conectar_banco` também precisam da função
+    registrar_regexp(conexao)
+    try:
+        with _limite_tempo(conexao, LIMITE_TEMPO_BUSCA):
+            resultados = pd.read_sql_query(query, conexao, params=params)
+            if destaques:
+                resultados["Destaques"] = [
+                    [
+                        (*m.span(), 0)
+                        for m in regex.finditer(texto, timeout=_tempo_restante())
+                        if m.end() > m.start()
+                    ]
+                    for texto in resultados["Texto"]
+                ]
+    except Exception as e:
+        log_erro("buscar_versiculos_regex", e, detalhes=f"padrao={padrao}")
+        raise
+    return resultados
+
+
+def _posicoes_avancada(
+    indice: IndiceInvertido,
+    termos: List[str],
+    operador: str,
+    testamento_id: Optional[int],
+    livro_id: Optional[int],
+    busca_exata: bool,
+    distancia: int,
+    por_radical: bool = False,
+    excluir: List[str] = (),
+) -> np.ndarray:
+    """
+    Resolve a busca avançada no índice (posições em ordem canônica).
+
+    Os termos de `excluir` viram máscaras NÃO aplicadas antes de
+    qualquer leitura do banco.
+    """
+    if busca_exata:
+        mascaras = [_mascara_termo(indice, " ".join(termos), por_radical)]
+    elif operador.upper() == "PERTO":
+        tokens = [tok for t in termos for tok in tokenizar(t)]
+        mascaras = [
+            indice.mascara_posicoes(
+                indice.proximos(tokens, distancia, por_radical=por_radical)
+            )
+        ]
+    else:
+        mascaras = [_mascara_termo(indice, t, por_radical) for t in termos]
+
+    return indice.consultar(
+        mascaras,
+        operador=operador,
+        excluir=[_mascara_termo(indice, t, por_radical) for t in excluir],
+        testamento_id=testamento_id,
+        livro_id=livro_id,
+    )
+
+
+def _buscar_versiculos_avancada_like(
+    conexao: sqlite3.Connection,
+    termos: list,
+    operador: str,
+    testamento_id: Optional[int],
+    livro_id: Optional[int],
+    busca_exata: bool,
+    distancia: int = 5,
+    excluir: List[str] = (),
+) -> pd.DataFrame:
+    """
+    Fallback de `buscar_versiculos_avancada` para bancos sem FTS5.
+
+    Assim como na busca simples, compara termos normalizados com o
+    texto normalizado (coluna `verse_norm` quando disponível).
+
+    A exclusão (`excluir`) entra na mesma máscara dos termos. Ela não
+    vai para o SQL: `NOT LIKE '%irmao%'` também descartaria versículos
+    que só têm "irmãos".
+    """
+    coluna, join = _coluna_texto_like(conexao)
+    termos_norm = [normalizar_texto(t) for t in termos]
+
+    base_query = f"""
+        SELECT 
+            book.name AS Livro, 
+            verse.chapter AS Capítulo, 
+            verse.verse AS Versículo, 
+            verse.text AS Texto,
+            {coluna} AS TextoNorm
+        FROM verse
+        JOIN book ON verse.book_id = book.id
+        {join}
+    """
+
+    filtros = []
+    params: list = []
+
+    # Redução inicial com LIKE
+    if busca_exata:
+        frase = " ".join(termos_norm)
+        filtros.append(f"{coluna} LIKE ?")
+        params.append(f"%{frase}%")
+    else:
+        condicoes = []
+        for termo in termos_norm:
+            if tem_curinga(termo):
+                termo = re.split(r"[*?]", termo, maxsplit=1)[0]
+            condicoes.append(f"{coluna} LIKE ?")
+            params.append(f"%{termo}%")
+        operador_sql = " OR " if operador.upper() == "OU" else " AND "
+        filtros.append("(" + operador_sql.join(condicoes) + ")")
+
+    if testamento_id:
+        filtros.append("book.testament_reference_id = ?")
+        params.append(testamento_id)
+
+    if livro_id:
+        filtros.append("book.id = ?")
+        params.append(livro_id)
+
+    if filtros:
+        base_query += " WHERE " + " AND ".join(filtros)
+
+    try:
+        with _limite_tempo(conexao, LIMITE_TEMPO_BUSCA):
+            df = pd.read_sql_query(
+                base_query,
+                conexao,
+                params=params,
+            ).reset_index(drop=True)
+    except Exception as e:
+        log_erro(
+            "buscar_versiculos_avancada/SQL",
+            e,
+            detalhes=f"termos={termos}, operador={operador}",
+        )
+        raise
+
+    textos_norm = df.pop("TextoNorm").astype(str)
 
     # Busca exata: o filtro do SQL já é suficiente
     if busca_exata:
-        resultados = df
+        mask = pd.Series(True, index=df.index)
+    elif operador.upper() == "PERTO":
+        tokens = list(dict.fromkeys(tok for t in termos for tok in tokenizar(t)))
+
+        def perto(texto: str) -> bool:
+            palavras = tokenizar(texto, normalizado=True)
+            ordinais = [
+                [i for i, palavra in enumerate(palavras) if palavra == token]
+                for token in tokens
+            ]
+            if not all(ordinais):
+                return False
+            return menor_janela(ordinais) - 1 <= distancia
+
+        mask = textos_norm.map(perto)
     else:
-        # Filtros AND/OR com word boundary em Python
-        termos_norm = [t.lower() for t in termos]
-
-        def combina_and(texto: str) -> bool:
-            texto_lower = texto.lower()
-            return all(
-                re.search(rf"\b{re.escape(t)}\b", texto_lower)
-                for t in termos_norm
+        # AND/OR com word boundary: todos os termos em uma passada;
+        # termos com curinga são conferidos por regex à parte
+        simples = [t for t in termos_norm if not tem_curinga(t)]
+        curingas = [
+            re.compile(rf"\b{regex_curinga(t)}\b")
+            for t in termos_norm
+            if tem_curinga(t)
+        ]
+        localizador = LocalizadorTermos(simples)
+        todos = operador.upper() == "E"
+
+        def combina(texto: str) -> bool:
+            if todos:
+                return (
+                    not simples or localizador.todos(texto, normalizado=True)
+                ) and all(regex.search(texto) for regex in curingas)
+            return localizador.algum(texto, normalizado=True) or any(
+                regex.search(texto) for regex in curingas
             )
 
-        def combina_or(texto: str) -> bool:
-            texto_lower = texto.lower()
-            return any(
-                re.search(rf"\b{re.escape(t)}\b", texto_lower)
-                for t in termos_norm
+        mask = textos_norm.map(combina)
+
+    if excluir:
+        excluir_norm = [normalizar_texto(t) for t in excluir]
+        proibidos = LocalizadorTermos(
+            [t for t in excluir_norm if not tem_curinga(t)]
+        )
+        curingas_proibidos = [
+            re.compile(rf"\b{regex_curinga(t)}\b")
+            for t in excluir_norm
+            if tem_curinga(t)
+        ]
+        excluidos = textos_norm.map(
+            lambda texto: proibidos.algum(texto, normalizado=True)
+            or any(regex.search(texto) for regex in curingas_proibidos)
+        ).astype(bool)
+        mask = mask.astype(bool) & ~excluidos
+
+    return df[mask.astype(bool)].reset_index(drop=True)
+
+
+# ============================================================
+# Paginação de resultados
+# ============================================================
+def codificar_cursor(livro_id: int, capitulo: int, versiculo: int) -> str:
+    """
+    Gera o cursor opaco que aponta para depois de um versículo.
+
+    Returns:
+        str: Texto base64 (seguro para URL) com a chave do versículo
+    """
+    chave = f"{int(livro_id)}.{int(capitulo)}.{int(versiculo)}"
+    return base64.urlsafe_b64encode(chave.encode("ascii")).decode("ascii")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[int, int, int]:
+    """
+    Lê a chave (book_id, capítulo, versículo) de um cursor.
+
+    Raises:
+        ValueError: Se o cursor não foi gerado por `codificar_cursor`
+    """
+    try:
+        chave = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii")
+        livro_id, capitulo, versiculo = (int(parte) for parte in chave.split("."))
+    except (AttributeError, TypeError, UnicodeError, ValueError) as e:
+        raise ValueError(f"Cursor de paginação inválido: {cursor!r}") from e
+    return livro_id, capitulo, versiculo
+
+
+def _pagina_indice(
+    conexao: sqlite3.Connection,
+    indice: IndiceInvertido,
+    posicoes: np.ndarray,
+    cursor: Optional[str],
+    tamanho_pagina: int,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Página de uma busca resolvida no índice: a chave do cursor vira
+    uma posição por busca binária e só a página é lida do banco.
+    """
+    inicio = 0
+    if cursor:
+        apos = indice.posicao_apos(*decodificar_cursor(cursor))
+        inicio = int(np.searchsorted(posicoes, apos))
+
+    pagina = posicoes[inicio:inicio + tamanho_pagina]
+    resultados = _materializar(conexao, indice, pagina)
+
+    proximo = None
+    if inicio + tamanho_pagina < len(posicoes):
+        proximo = codificar_cursor(*indice.chave(int(pagina[-1])))
+    return resultados, proximo
+
+
+def _pagina_dataframe(
+    conexao: sqlite3.Connection,
+    resultados: pd.DataFrame,
+    cursor: Optional[str],
+    tamanho_pagina: int,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Página de uma busca sem índice em memória (FTS5/LIKE): os
+    resultados completos são recortados pela chave do cursor.
+    """
+    ids_livro = dict(conexao.execute("SELECT name, id FROM book"))
+    chaves = pd.DataFrame(
+        {
+            "livro": resultados["Livro"].map(ids_livro),
+            "capitulo": resultados["Capítulo"],
+            "versiculo": resultados["Versículo"],
+        }
+    )
+    ordem = chaves.sort_values(["livro", "capitulo", "versiculo"]).index
+    resultados = resultados.loc[ordem]
+    chaves = chaves.loc[ordem]
+
+    if cursor:
+        livro_id, capitulo, versiculo = decodificar_cursor(cursor)
+        depois = (
+            (chaves["livro"] > livro_id)
+            | ((chaves["livro"] == livro_id) & (chaves["capitulo"] > capitulo))
+            | (
+                (chaves["livro"] == livro_id)
+                & (chaves["capitulo"] == capitulo)
+                & (chaves["versiculo"] > versiculo)
             )
+        )
+        resultados = resultados[depois]
+        chaves = chaves[depois]
+
+    proximo = None
+    if len(resultados) > tamanho_pagina:
+        ultimo = chaves.iloc[tamanho_pagina - 1]
+        proximo = codificar_cursor(
+            ultimo["livro"], ultimo["capitulo"], ultimo["versiculo"]
+        )
+    return resultados.head(tamanho_pagina).reset_index(drop=True), proximo
 
-        if operador.upper() == "E":
-            mask = df["Texto"].astype(str).apply(combina_and)
-        else:
-            mask = df["Texto"].astype(str).apply(combina_or)
 
-        resultados = df[mask].reset_index(drop=True)
+def buscar_versiculos_paginado(
+    conexao: sqlite3.Connection,
+    termo: str,
+    testamento_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    tamanho_pagina: int = 50,
+    por_radical: bool = False,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Versão paginada de `buscar_versiculos` (ordem bíblica).
 
-    fim = perf_counter()
-    tempo_ms = int((fim - inicio) * 1000)
-    log_busca(" / ".join(termos), len(resultados), tempo_ms, tipo="avancada")
+    A paginação é por chave (keyset): o cursor guarda o último
+    versículo entregue, então cada página custa o mesmo,
+    independentemente de quantas vieram antes.
+
+    Args:
+        conexao: Conexão com o banco
+        termo: Termo para buscar
+        testamento_id: ID do testamento (opcional, None = ambos)
+        cursor: Cursor devolvido pela página anterior (None = 1ª página)
+        tamanho_pagina: Máximo de versículos por página
+        por_radical: Incluir as variações de cada palavra
+
+    Returns:
+        tuple: (DataFrame da página, cursor da próxima página ou None)
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    termo = (termo or "").strip()
+    if not termo:
+        return buscar_versiculos(conexao, termo), None
+
+    indice = obter_indice(conexao)
+    if indice is None:
+        resultados = buscar_versiculos(
+            conexao, termo, testamento_id, por_radical=por_radical
+        )
+        return _pagina_dataframe(conexao, resultados, cursor, tamanho_pagina)
+
+    try:
+        posicoes = indice.filtrar(
+            _posicoes_termo(indice, termo, por_radical),
+            testamento_id=testamento_id,
+        )
+        return _pagina_indice(conexao, indice, posicoes, cursor, tamanho_pagina)
+    except Exception as e:
+        log_erro("buscar_versiculos_paginado", e, detalhes=f"termo={termo}")
+        raise
+
+
+def buscar_versiculos_avancada_paginado(
+    conexao: sqlite3.Connection,
+    termos,
+    operador: str = "E",
+    testamento_id: Optional[int] = None,
+    livro_id: Optional[int] = None,
+    busca_exata: bool = False,
+    distancia: int = 5,
+    cursor: Optional[str] = None,
+    tamanho_pagina: int = 50,
+    por_radical: bool = False,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Versão paginada de `buscar_versiculos_avancada` (ordem bíblica).
+
+    O operador "REGEX" segue pela busca por expressão regular (com o
+    limite de tempo dela) e a página é recortada do resultado.
+
+    Args:
+        conexao: Conexão com o banco
+        termos: String ou lista de termos para buscar
+        operador: "E", "OU", "PERTO" ou "REGEX"
+        testamento_id: Filtrar por testamento (opcional)
+        livro_id: Filtrar por livro (opcional)
+        busca_exata: Se True, busca frase completa
+        distancia: Máximo de palavras entre os termos no operador PERTO
+        cursor: Cursor devolvido pela página anterior (None = 1ª página)
+        tamanho_pagina: Máximo de versículos por página
+        por_radical: Cada palavra encontra também as suas variações
+
+    Returns:
+        tuple: (DataFrame da página, cursor da próxima página ou None)
+
+    Raises:
+        ValueError: Se o cursor ou a expressão regular forem inválidos,
+                    ou se `busca_exata` vier com o operador REGEX
+        TimeoutError: Se a varredura passar de `LIMITE_TEMPO_BUSCA`
+    """
+    _validar_operador(operador, busca_exata)
+    termos = _lista_termos(termos)
+    por_regex = operador.upper() == "REGEX"
+    indice = obter_indice(conexao) if termos and not por_regex else None
+
+    if indice is None:
+        resultados = buscar_versiculos_avancada(
+            conexao,
+            termos,
+            operador=operador,
+            testamento_id=testamento_id,
+            livro_id=livro_id,
+            busca_exata=busca_exata,
+            distancia=distancia,
+            por_radical=por_radical,
+        )
+        return _pagina_dataframe(conexao, resultados, cursor, tamanho_pagina)
+
+    try:
+        incluir, excluir = _separar_exclusoes(termos)
+        posicoes = _posicoes_avancada(
+            indice,
+            incluir,
+            operador,
+            testamento_id,
+            livro_id,
+            busca_exata,
+            distancia,
+            por_radical,
+            excluir,
+        )
+        return _pagina_indice(conexao, indice, posicoes, cursor, tamanho_pagina)
+    except Exception as e:
+        log_erro(
+            "buscar_versiculos_avancada_paginado",
+            e,
+            detalhes=f"termos={termos}, operador={operador}",
+        )
+        raise
+
+
+def iterar_paginas(
+    buscar_pagina: Callable[..., Tuple[pd.DataFrame, Optional[str]]],
+    *args,
+    tamanho_pagina: int = 200,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Percorre uma busca paginada em lotes, do início ao fim.
+
+    Exemplo:
+        >>> for lote in iterar_paginas(buscar_versiculos_paginado, conexao, "fé"):
+        ...     processar(lote)
+
+    Args:
+        buscar_pagina: `buscar_versiculos_paginado` ou
+                       `buscar_versiculos_avancada_paginado`
+        *args: Argumentos da busca (conexão, termo/termos, ...)
+        tamanho_pagina: Versículos por lote
+        **kwargs: Argumentos nomeados da busca
+
+    Yields:
+        pd.DataFrame: Um lote de versículos por vez, em ordem bíblica
+    """
+    cursor = None
+    while True:
+        pagina, cursor = buscar_pagina(
+            *args, cursor=cursor, tamanho_pagina=tamanho_pagina, **kwargs
+        )
+        if not pagina.empty:
+            yield pagina
+        if cursor is None:
+            return
+
+
+# ============================================================
+# Buscas em lote
+# ============================================================
+def _consulta_lote(consulta) -> Dict:
+    """
+    Normaliza uma consulta do lote para os parâmetros da busca
+    avançada (uma string é uma busca simples pelo termo).
+
+    No operador "REGEX" os termos não passam pela separação de
+    exclusões: `-` faz parte da expressão.
+
+    Raises:
+        ValueError: Se a consulta tiver parâmetros desconhecidos ou
+                    combinar `busca_exata` com o operador REGEX
+    """
+    if isinstance(consulta, str):
+        consulta = {"termos": consulta}
+
+    parametros = {
+        "operador": "E",
+        "testamento_id": None,
+        "livro_id": None,
+        "busca_exata": False,
+        "distancia": 5,
+        "por_radical": False,
+    }
+    desconhecidos = set(consulta) - set(parametros) - {"termos"}
+    if desconhecidos:
+        raise ValueError(
+            f"Parâmetros desconhecidos na consulta: {sorted(desconhecidos)}"
+        )
+
+    parametros.update(consulta)
+    parametros["operador"] = str(parametros["operador"]).upper()
+    _validar_operador(parametros["operador"], parametros["busca_exata"])
+    termos = _lista_termos(consulta.get("termos") or "")
+    if parametros["operador"] == "REGEX":
+        parametros["termos"], parametros["excluir"] = termos, []
+    else:
+        parametros["termos"], parametros["excluir"] = _separar_exclusoes(termos)
+    return parametros
+
+
+def _buscar_lote_indice(
+    conexao: sqlite3.Connection,
+    indice: IndiceInvertido,
+    consultas: List[Dict],
+) -> List[pd.DataFrame]:
+    """
+    Lote no índice em memória: as máscaras de palavra (cache LRU) são
+    compartilhadas entre as consultas e os versículos de todas elas
+    são lidos do banco em uma única consulta.
+    """
+    por_consulta = [
+        _posicoes_avancada(
+            indice,
+            c["termos"],
+            c["operador"],
+            c["testamento_id"],
+            c["livro_id"],
+            c["busca_exata"],
+            c["distancia"],
+            c["por_radical"],
+            c["excluir"],
+        )
+        if c["termos"]
+        else np.empty(0, dtype=np.uint32)
+        for c in consultas
+    ]
+
+    todas = unir(por_consulta)
+    lidos = _materializar(conexao, indice, todas)
+
+    # As linhas lidas seguem a ordem (ordenada) de `todas`
+    return [
+        lidos.iloc[np.searchsorted(todas, posicoes)].reset_index(drop=True)
+        for posicoes in por_consulta
+    ]
+
+
+def _buscar_lote_varredura(
+    conexao: sqlite3.Connection,
+    consultas: List[Dict],
+) -> List[pd.DataFrame]:
+    """
+    Lote sem índice em memória: uma única leitura dos versículos e um
+    único localizador Aho–Corasick com os termos de todas as
+    consultas; cada versículo é percorrido uma vez e todas as
+    consultas são decididas pelo conjunto de termos encontrados.
+
+    Sem índice, `por_radical` não se aplica (vale a palavra exata).
+    """
+    coluna, join = _coluna_texto_like(conexao)
+    query = f"""
+        SELECT
+            book.name AS Livro,
+            verse.chapter AS Capítulo,
+            verse.verse AS Versículo,
+            verse.text AS Texto,
+            {coluna} AS TextoNorm,
+            book.testament_reference_id AS TestamentoId,
+            verse.book_id AS LivroId
+        FROM verse
+        JOIN book ON verse.book_id = book.id
+        {join}
+        ORDER BY verse.book_id, verse.chapter, verse.verse
+    """
+    with _limite_tempo(conexao, LIMITE_TEMPO_BUSCA):
+        corpus = pd.read_sql_query(query, conexao)
+    textos = corpus.pop("TextoNorm").astype(str)
+    testamentos = corpus.pop("TestamentoId").tolist()
+    livros = corpus.pop("LivroId").tolist()
+
+    # Termos de cada consulta: a frase inteira na busca exata e cada
+    # palavra no PERTO
+    termos_consultas = []
+    for c in consultas:
+        termos = [normalizar_texto(t) for t in c["termos"]]
+        if c["busca_exata"] and termos:
+            termos = [" ".join(termos)]
+        elif c["operador"] == "PERTO":
+            termos = list(dict.fromkeys(
+                tok for t in termos for tok in tokenizar(t, normalizado=True)
+            ))
+        termos_consultas.append(termos)
+    excluir_consultas = [
+        [normalizar_texto(t) for t in c["excluir"]] for c in consultas
+    ]
+
+    # Identificadores únicos do lote: termos do localizador primeiro,
+    # curingas (conferidos por regex) depois
+    distintos = list(dict.fromkeys(
+        t
+        for termos in termos_consultas + excluir_consultas
+        for t in termos
+    ))
+    simples = [t for t in distintos if not tem_curinga(t)]
+    curingas = [t for t in distintos if tem_curinga(t)]
+    identificador = {t: i for i, t in enumerate(simples + curingas)}
+    localizador = LocalizadorTermos(simples)
+    regexes = [
+        (identificador[t], re.compile(rf"\b{regex_curinga(t)}\b"))
+        for t in curingas
+    ]
+
+    # Pré-filtro: uma regex com a 1ª palavra de cada termo descarta,
+    # em C, os versículos que não têm nada do lote
+    alternativas = [
+        re.escape(tokenizar(t, normalizado=True)[0])
+        for t in simples
+        if tokenizar(t, normalizado=True)
+    ] + [regex_curinga(t) for t in curingas]
+    filtro = None
+    if alternativas:
+        filtro = re.compile(rf"\b(?:{'|'.join(alternativas)})\b")
+
+    planos = [
+        (
+            [identificador[t] for t in termos],
+            c["operador"] != "OU" or c["busca_exata"],
+            c["operador"] == "PERTO" and not c["busca_exata"],
+            {identificador[t] for t in excluidos},
+            c,
+        )
+        for termos, excluidos, c in zip(
+            termos_consultas, excluir_consultas, consultas
+        )
+    ]
+    linhas: List[List[int]] = [[] for _ in consultas]
+
+    for j, texto in enumerate(textos):
+        if filtro is None or not filtro.search(texto):
+            continue
+        encontrados = localizador.encontrados(texto, normalizado=True)
+        encontrados.update(i for i, regex in regexes if regex.search(texto))
+        if not encontrados:
+            continue
+
+        palavras = None
+        for q, (ids, todos, perto, proibidos, c) in enumerate(planos):
+            if not ids:
+                continue
+            if todos and not encontrados.issuperset(ids):
+                continue
+            if not todos and encontrados.isdisjoint(ids):
+                continue
+            if not encontrados.isdisjoint(proibidos):
+                continue
+            if c["testamento_id"] and testamentos[j] != int(c["testamento_id"]):
+                continue
+            if c["livro_id"] and livros[j] != int(c["livro_id"]):
+                continue
+            if perto and len(ids) > 1:
+                if palavras is None:
+                    palavras = tokenizar(texto, normalizado=True)
+                ordinais = [
+                    [k for k, palavra in enumerate(palavras) if palavra == token]
+                    for token in termos_consultas[q]
+                ]
+                if menor_janela(ordinais) - 1 > int(c["distancia"]):
+                    continue
+            linhas[q].append(j)
+
+    return [corpus.iloc[l].reset_index(drop=True) for l in linhas]
+
+
+def buscar_lote(
+    conexao: sqlite3.Connection,
+    consultas: List,
+) -> List[pd.DataFrame]:
+    """
+    Executa várias buscas de uma vez, compartilhando o trabalho.
+
+    Cada consulta é uma string (busca simples pelo termo) ou um dict
+    com os parâmetros de `buscar_versiculos_avancada`: 'termos',
+    'operador' ("E", "OU", "PERTO" ou "REGEX"), 'testamento_id',
+    'livro_id', 'busca_exata', 'distancia' e 'por_radical' (termos
+    com `-` são excluídos, exceto no REGEX).
+
+    Strategy:
+        1. Índice em memória: máscaras de palavra compartilhadas e uma
+           única leitura do banco para os versículos de todo o lote
+        2. Sem índice: uma única varredura dos versículos com um
+           localizador Aho–Corasick de todos os termos do lote (em vez
+           de uma varredura por consulta)
+        3. Consultas "REGEX" rodam à parte, cada uma pela busca por
+           expressão regular (REGEXP no SQLite, com limite de tempo)
+
+    Exemplo:
+        >>> fe, perto = buscar_lote(conexao, [
+        ...     "fé",
+        ...     {"termos": ["graça", "fé"], "operador": "PERTO", "distancia": 3},
+        ... ])
+
+    Args:
+        conexao: Conexão com o banco
+        consultas: Lista de consultas
+
+    Returns:
+        list: Um DataFrame por consulta, na mesma ordem, com colunas
+              ['Livro', 'Capítulo', 'Versículo', 'Texto'] (ordem bíblica)
+
+    Raises:
+        ValueError: Se alguma consulta tiver parâmetros desconhecidos
+                    ou uma expressão regular inválida
+        TimeoutError: Se uma varredura passar de `LIMITE_TEMPO_BUSCA`
+    """
+    inicio = perf_counter()
+
+    consultas = [_consulta_lote(c) for c in consultas]
+    if not consultas:
+        return []
+
+    palavras = [c for c in consultas if c["operador"] != "REGEX"]
+    indice = obter_indice(conexao) if palavras else None
 
+    try:
+        if not palavras:
+            lidos = []
+        elif indice is not None:
+            lidos = _buscar_lote_indice(conexao, indice, palavras)
+        else:
+            lidos = _buscar_lote_varredura(conexao, palavras)
+
+        # Recoloca as consultas REGEX na ordem original do lote
+        proximos = iter(lidos)
+        resultados = [
+            _buscar_versiculos_regex(
+                conexao,
+                " ".join(c["termos"]),
+                c["testamento_id"],
+                c["livro_id"],
+            )
+            if c["operador"] == "REGEX"
+            else next(proximos)
+            for c in consultas
+        ]
+    except Exception as e:
+        log_erro("buscar_lote", e, detalhes=f"consultas={len(consultas)}")
+        raise
+
+    tempo_ms = int((perf_counter() - inicio) * 1000)
+    log_busca(
+        f"{len(consultas)} consultas",
+        sum(len(r) for r in resultados),
+        tempo_ms,
+        tipo="lote",
+    )
     return resultados
 
 
 # ============================================================
 # Comparação entre versões
 # ============================================================
+# Capítulos alinhados guardados no cache do Streamlit
+MAX_ENTRADAS_COMPARACAO = 256
+
+
+def _comparar_lote_anexado(
+    conexao: sqlite3.Connection,
+    caminhos: List[str],
+    livro_id: int,
+    capitulo: int,
+    versiculo: Optional[int],
+) -> pd.DataFrame:
+    """
+    Alinha um lote de versões com ATTACH e uma única consulta.
+
+    As versões são anexadas (somente leitura) à conexão em memória e
+    desanexadas no fim. As chaves (book_id, chapter, verse) de todas
+    formam a base e o texto de cada versão entra por LEFT JOIN, então
+    um versículo que falta em uma versão vira NULL só na coluna dela.
+
+    Returns:
+        pd.DataFrame: Índice 'Versículo' e colunas 't0', 't1', ...
+    """
+    filtro = "book_id = ? AND chapter = ?"
+    params_filtro: List = [livro_id, capitulo]
+    if versiculo is not None:
+        filtro += " AND verse = ?"
+        params_filtro.append(versiculo)
+
+    chaves = "\n            UNION\n".join(
+        f"            SELECT book_id, chapter, verse FROM v{i}.verse "
+        f"WHERE {filtro}"
+        for i in range(len(caminhos))
+    )
+    colunas = ", ".join(f"t{i}.text AS t{i}" for i in range(len(caminhos)))
+    juncoes = "\n".join(
+        f"        LEFT JOIN v{i}.verse AS t{i}"
+        f" ON t{i}.book_id = chaves.book_id"
+        f" AND t{i}.chapter = chaves.chapter"
+        f" AND t{i}.verse = chaves.verse"
+        for i in range(len(caminhos))
+    )
+    query = f"""
+        WITH chaves AS (
+{chaves}
+        )
+        SELECT chaves.verse AS Versículo, {colunas}
+        FROM chaves
+{juncoes}
+        ORDER BY chaves.verse
+    """
+
+    anexados = 0
+    try:
+        for i, caminho in enumerate(caminhos):
+            conexao.execute(f"ATTACH DATABASE ? AS v{i}", (uri_leitura(caminho),))
+            anexados += 1
+        return pd.read_sql_query(
+            query, conexao, params=params_filtro * len(caminhos)
+        ).set_index("Versículo")
+    finally:
+        # Libera os apelidos v0, v1... para o próximo lote
+        for i in range(anexados):
+            conexao.execute(f"DETACH DATABASE v{i}")
+
+
+@st.cache_data(
+    ttl=3600, max_entries=MAX_ENTRADAS_COMPARACAO, show_spinner=False
+)
+def _comparar_em_cache(
+    versoes: Tuple[Tuple[str, Tuple[str, int, int]], ...],
+    livro_id: int,
+    capitulo: int,
+    versiculo: Optional[int],
+) -> pd.DataFrame:
+    """
+    Capítulo alinhado entre versões; a chave traz a impressão digital
+    de cada arquivo, então um .sqlite substituído não reaproveita a
+    matriz antiga.
+    """
+    # A conexão (em memória, URI para anexar com mode=ro) aceita um
+    # número limitado de bancos anexados: versões demais vão em lotes
+    conexao = sqlite3.connect("file::memory:", uri=True)
+    try:
+        limite = conexao.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        partes = []
+        for inicio in range(0, len(versoes), limite):
+            lote = versoes[inicio:inicio + limite]
+            parte = _comparar_lote_anexado(
+                conexao,
+                [digital[0] for _, digital in lote],
+                livro_id,
+                capitulo,
+                versiculo,
+            )
+            parte.columns = [nome for nome, _ in lote]
+            partes.append(parte)
+    finally:
+        conexao.close()
+
+    comparacao = pd.concat(partes, axis=1).sort_index()
+    comparacao.index.name = "Versículo"
+    return comparacao.reset_index()
+
+
+def comparar_capitulo(
+    bancos: Dict[str, Path],
+    livro_id: int,
+    capitulo: int,
+    versiculo: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Compara um capítulo (ou versículo) em qualquer número de versões.
+
+    As versões são anexadas a uma única conexão (ATTACH DATABASE) e o
+    capítulo alinhado sai de uma consulta com junção por (book_id,
+    chapter, verse), em lotes do limite de bancos anexados do SQLite.
+    O resultado fica em cache por versão, livro e capítulo.
+
+    Args:
+        bancos: {versão: caminho .sqlite}, na ordem das colunas
+        livro_id: ID do livro
+        capitulo: Número do capítulo
+        versiculo: Número do versículo (None = capítulo completo)
+
+    Returns:
+        pd.DataFrame: Colunas ['Versículo', 'Versão1', 'Versão2', ...];
+                      texto ausente em uma versão fica como NaN/None
+
+    Raises:
+        OSError: Se algum arquivo não existir
+        sqlite3.Error: Se algum banco não puder ser anexado
+    """
+    if not bancos:
+        return pd.DataFrame(columns=["Versículo"])
+
+    try:
+        versoes = tuple(
+            (versao, impressao_digital(str(caminho)))
+            for versao, caminho in bancos.items()
+        )
+        return _comparar_em_cache(
+            versoes,
+            int(livro_id),
+            int(capitulo),
+            None if versiculo is None else int(versiculo),
+        )
+    except Exception as e:
+        log_erro(
+            "comparar_capitulo",
+            e,
+            detalhes=f"versoes={list(bancos)}, livro_id={livro_id}, "
+                     f"cap={capitulo}, vers={versiculo}",
+        )
+        raise
+
+
 def comparar_versoes(
     conexoes_dict: Dict[str, sqlite3.Connection],
     livro_id: int,
@@ -445,6 +2634,10 @@ def comparar_versoes(
     """
     Compara o mesmo versículo/capítulo em diferentes versões.
 
+    Se todas as conexões forem de arquivos, usa `comparar_capitulo`
+    (ATTACH + uma consulta, com cache); bancos em memória são lidos
+    um a um.
+
     Args:
         conexoes_dict: Dict {"ACF": conexao1, "NVI": conexao2, ...}
         livro_id: ID do livro
@@ -455,6 +2648,13 @@ def comparar_versoes(
         pd.DataFrame: DataFrame com colunas:
                     ['Versículo', 'Versão1', 'Versão2', ...]
     """
+    caminhos = {
+        versao: caminho_do_banco(conexao)
+        for versao, conexao in conexoes_dict.items()
+    }
+    if caminhos and all(caminhos.values()):
+        return comparar_capitulo(caminhos, livro_id, capitulo, versiculo)
+
     resultado: Dict[str, pd.Series] = {}
 
     for versao, conexao in conexoes_dict.items():
@@ -499,6 +2699,43 @@ def comparar_versoes(
 # ============================================================
 # Informações sobre o livro
 # ============================================================
+def estatisticas_livros(conexao: sqlite3.Connection) -> pd.DataFrame:
+    """
+    Quantidade de capítulos e versículos de cada livro da versão.
+
+    Em bancos com arquivo as contagens saem dos arrays do corpus,
+    sem ler o texto dos versículos.
+
+    Args:
+        conexao: Conexão com o banco
+
+    Returns:
+        pd.DataFrame: Colunas ['book_id', 'Livro', 'Testamento',
+                      'Capítulos', 'Versículos'] (Testamento = id)
+    """
+    corpus = obter_corpus(conexao)
+    if corpus is not None:
+        return corpus.estatisticas_livros()
+
+    query = """
+        SELECT
+            verse.book_id AS book_id,
+            book.name AS Livro,
+            book.testament_reference_id AS Testamento,
+            COUNT(DISTINCT verse.chapter) AS Capítulos,
+            COUNT(*) AS Versículos
+        FROM verse
+        JOIN book ON verse.book_id = book.id
+        GROUP BY verse.book_id
+        ORDER BY verse.book_id
+    """
+    try:
+        return pd.read_sql_query(query, conexao)
+    except Exception as e:
+        log_erro("estatisticas_livros", e)
+        raise
+
+
 def obter_info_livro(
     conexao: sqlite3.Connection,
     livro_id: int,
@@ -87,7 +87,7 @@ def validate_search_input(termo: str) -> Tuple[bool, str]:
     # Caracteres válidos (inclui acentos e alguma pontuação útil em referências bíblicas)
     caracteres_validos_extra = (
         "áéíóúàèìòùâêîôûãõçÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇ"
-        ":,.-!?()"
+        ":,.-!?()*"
     )
 
     if not all(c.isalnum() or c.isspace() or c in caracteres_validos_extra for c in termo):
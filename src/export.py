@@ -2,7 +2,10 @@
 Módulo de Exportação de Dados.
 
 Funções para exportar dados bíblicos e anotações em múltiplos
-formatos (CSV, Excel, PDF, TXT, Markdown, HTML).
+formatos (CSV, Excel, Parquet, PDF, TXT, Markdown, HTML).
+
+CSV e Parquet aceitam também tabelas Arrow (`formato="arrow"` das
+buscas), escritas direto pelo pyarrow, sem converter para pandas.
 
 Autor: Edson Deveza
 Data: 2024
@@ -11,10 +14,14 @@ Compatível: Python 3.12
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+import html
 import io
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import streamlit as st
 from fpdf import FPDF
 
@@ -22,17 +29,76 @@ from .logger import log_exportacao, log_erro
 from .error_handler import handle_export_error
 
 
-def _validar_df(df: pd.DataFrame) -> bool:
+# Resultado de busca: DataFrame ou tabela Arrow
+Tabela = Union[pd.DataFrame, pa.Table]
+
+
+def _validar_df(df: Tabela) -> bool:
     """Validação simples para evitar export de DF vazio."""
-    return not df.empty
+    return len(df) > 0
+
+
+def _sem_destaques(df: Tabela) -> Tabela:
+    """Remove a coluna 'Destaques' (posições) dos formatos tabulares."""
+    if isinstance(df, pa.Table):
+        if "Destaques" in df.column_names:
+            return df.drop_columns(["Destaques"])
+        return df
+    return df.drop(columns=["Destaques"], errors="ignore")
+
+
+def destacar_texto(
+    texto: str,
+    trechos: Optional[Sequence[Tuple[int, ...]]],
+    abrir: str,
+    fechar: str,
+    escapar: Callable[[str], str] = str,
+) -> str:
+    """
+    Envolve os trechos encontrados pela busca com marcadores.
+
+    Os trechos vêm prontos da busca (coluna 'Destaques', com offsets
+    no texto como está gravado), então o texto não é percorrido de
+    novo. Trechos que se sobrepõem (de termos diferentes) viram uma
+    única marcação.
+
+    Args:
+        texto: Texto do versículo
+        trechos: Trios (início, fim, termo) — ou pares (início, fim)
+        abrir: Marcador de abertura (ex.: "<mark>")
+        fechar: Marcador de fechamento (ex.: "</mark>")
+        escapar: Função aplicada a cada pedaço do texto (ex.: html.escape)
+
+    Returns:
+        str: Texto com os trechos marcados
+    """
+    if not isinstance(trechos, (list, tuple)) or not trechos:
+        return escapar(texto)
+
+    # Junta os trechos que se sobrepõem (só na hora de marcar)
+    unidos: List[List[int]] = []
+    for inicio, fim, *_ in sorted(trechos):
+        if unidos and inicio < unidos[-1][1]:
+            unidos[-1][1] = max(unidos[-1][1], fim)
+        else:
+            unidos.append([inicio, fim])
+
+    partes = []
+    atual = 0
+    for inicio, fim in unidos:
+        partes.append(escapar(texto[atual:inicio]))
+        partes.append(abrir + escapar(texto[inicio:fim]) + fechar)
+        atual = fim
+    partes.append(escapar(texto[atual:]))
+    return "".join(partes)
 
 
 # ============================================================
 # CSV
 # ============================================================
-def exportar_csv(df: pd.DataFrame, nome_arquivo: str = "resultados") -> None:
+def exportar_csv(df: Tabela, nome_arquivo: str = "resultados") -> None:
     """
-    Exporta DataFrame para CSV com encoding UTF-8.
+    Exporta DataFrame (ou tabela Arrow) para CSV com encoding UTF-8.
     Exibe botão de download no Streamlit.
     """
     if not _validar_df(df):
@@ -40,7 +106,14 @@ def exportar_csv(df: pd.DataFrame, nome_arquivo: str = "resultados") -> None:
         return
 
     try:
-        csv = df.to_csv(index=False, encoding="utf-8-sig")
+        if isinstance(df, pa.Table):
+            # BOM do utf-8-sig, para o Excel reconhecer os acentos
+            saida = io.BytesIO(b"\xef\xbb\xbf")
+            saida.seek(0, io.SEEK_END)
+            pa_csv.write_csv(_sem_destaques(df), saida)
+            csv = saida.getvalue()
+        else:
+            csv = _sem_destaques(df).to_csv(index=False, encoding="utf-8-sig")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         st.download_button(
@@ -73,6 +146,7 @@ def exportar_xlsx(df: pd.DataFrame, nome_arquivo: str = "resultados") -> None:
         return
 
     try:
+        df = _sem_destaques(df)
         output = io.BytesIO()
 
         with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
@@ -124,6 +198,44 @@ def exportar_xlsx(df: pd.DataFrame, nome_arquivo: str = "resultados") -> None:
         handle_export_error(e, "Excel")
 
 
+# ============================================================
+# Parquet
+# ============================================================
+def exportar_parquet(df: Tabela, nome_arquivo: str = "resultados") -> None:
+    """
+    Exporta DataFrame (ou tabela Arrow) para Parquet.
+    Exibe botão de download no Streamlit.
+    """
+    if not _validar_df(df):
+        st.warning("⚠️ Não há dados para exportar em Parquet.")
+        return
+
+    try:
+        tabela = _sem_destaques(df)
+        if isinstance(tabela, pd.DataFrame):
+            tabela = pa.Table.from_pandas(tabela, preserve_index=False)
+
+        output = io.BytesIO()
+        pq.write_table(tabela, output, compression="zstd")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        st.download_button(
+            label="📥 Exportar como Parquet",
+            data=output.getvalue(),
+            file_name=f"{nome_arquivo}_{timestamp}.parquet",
+            mime="application/vnd.apache.parquet",
+            use_container_width=True,
+            help="Formato colunar para pandas, Polars, DuckDB, Spark, etc.",
+        )
+
+        log_exportacao("PARQUET", len(df), sucesso=True)
+
+    except Exception as e:
+        log_erro("exportar_parquet", e)
+        log_exportacao("PARQUET", len(df), sucesso=False)
+        handle_export_error(e, "Parquet")
+
+
 # ============================================================
 # PDF
 # ============================================================
@@ -301,6 +413,9 @@ def exportar_markdown(
 ) -> None:
     """
     Exporta DataFrame como Markdown (.md).
+
+    Os trechos em negrito vêm da coluna 'Destaques' (ver
+    `destacar_texto`).
     """
     if not _validar_df(df):
         st.warning("⚠️ Não há dados para exportar em Markdown.")
@@ -322,7 +437,9 @@ def exportar_markdown(
                 f"{row['Livro']} "
                 f"{row['Capítulo']}:{row['Versículo']}"
             )
-            texto = row["Texto"]
+            texto = destacar_texto(
+                row["Texto"], row.get("Destaques"), "**", "**"
+            )
 
             linhas.append(f"### **{referencia}**")
             linhas.append("")
@@ -372,6 +489,9 @@ def exportar_html(
 ) -> None:
     """
     Exporta DataFrame como HTML formatado e responsivo.
+
+    Os trechos marcados com <mark> vêm da coluna 'Destaques' (ver
+    `destacar_texto`).
     """
     if not _validar_df(df):
         st.warning("⚠️ Não há dados para exportar em HTML.")
@@ -385,7 +505,13 @@ def exportar_html(
                 f"{row['Livro']} "
                 f"{row['Capítulo']}:{row['Versículo']}"
             )
-            texto = row["Texto"]
+            texto = destacar_texto(
+                row["Texto"],
+                row.get("Destaques"),
+                "<mark>",
+                "</mark>",
+                escapar=html.escape,
+            )
             blocos_versiculos.append(
                 f"""
                 <div class="versiculo">
@@ -397,7 +523,7 @@ def exportar_html(
 
         html_versiculos = "\n".join(blocos_versiculos)
 
-        html = f"""
+        conteudo_html = f"""
 <!DOCTYPE html>
 <html lang="pt-BR">
 <head>
@@ -470,6 +596,12 @@ def exportar_html(
             color: #2c3e50;
         }}
         
+        .texto mark {{
+            background-color: #fff3a3;
+            padding: 0 2px;
+            border-radius: 3px;
+        }}
+        
         .footer {{
             margin-top: 50px;
             padding-top: 20px;
@@ -527,7 +659,7 @@ def exportar_html(
 
         st.download_button(
             label="📥 Exportar como HTML",
-            data=html,
+            data=conteudo_html,
             file_name=f"{nome_arquivo}_{timestamp}.html",
             mime="text/html",
             use_container_width=True,
@@ -0,0 +1,204 @@
+"""
+Módulo de Localização de Múltiplos Termos.
+
+Implementa o algoritmo de Aho–Corasick sobre a sequência de palavras
+de um texto: todos os termos de uma busca (palavras ou frases) são
+encontrados em uma única passada por versículo, já respeitando limites
+de palavra, e cada ocorrência informa qual termo casou.
+
+Com isso os filtros E/OU e as contagens por termo saem da mesma
+passada, e o custo por versículo não cresce com o número de termos.
+
+Autor: Edson Deveza
+Data: 2025
+Versão: 2.1
+Compatível: Python 3.12
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Sequence, Set, Tuple
+
+from .text_utils import (
+    mapa_nfc,
+    normalizar_texto,
+    regex_curinga,
+    tem_curinga,
+    tokenizar,
+    tokenizar_com_posicoes,
+)
+
+
+class LocalizadorTermos:
+    """
+    Autômato de Aho–Corasick cujo alfabeto são palavras normalizadas.
+
+    Exemplo:
+        >>> loc = LocalizadorTermos(["amor", "amor de Deus", "fé"])
+        >>> sorted(loc.encontrados("O amor de Deus e a fé"))
+        [0, 1, 2]
+
+    Attributes:
+        termos: Termos originais, na ordem recebida (o índice de cada
+                termo é o identificador devolvido nas ocorrências)
+    """
+
+    def __init__(self, termos: Sequence[str]) -> None:
+        self.termos = list(termos)
+        self._comprimentos = [len(tokenizar(t)) for t in self.termos]
+        # Termos sem nenhuma palavra (ex.: só pontuação) nunca casam
+        self._validos = sum(1 for n in self._comprimentos if n)
+
+        # Estado 0 = raiz
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falha: List[int] = [0]
+        self._saida: List[List[int]] = [[]]
+
+        for indice, termo in enumerate(self.termos):
+            tokens = tokenizar(termo)
+            if not tokens:
+                continue
+
+            estado = 0
+            for token in tokens:
+                proximo = self._transicoes[estado].get(token)
+                if proximo is None:
+                    proximo = len(self._transicoes)
+                    self._transicoes.append({})
+                    self._falha.append(0)
+                    self._saida.append([])
+                    self._transicoes[estado][token] = proximo
+                estado = proximo
+            self._saida[estado].append(indice)
+
+        self._montar_falhas()
+
+    def __len__(self) -> int:
+        return len(self.termos)
+
+    def _montar_falhas(self) -> None:
+        """Calcula os links de falha em largura (BFS) e herda saídas."""
+        fila = deque(self._transicoes[0].values())
+
+        while fila:
+            estado = fila.popleft()
+            for token, filho in self._transicoes[estado].items():
+                fila.append(filho)
+
+                falha = self._falha[estado]
+                while falha and token not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                destino = self._transicoes[falha].get(token, 0)
+                self._falha[filho] = destino if destino != filho else 0
+                self._saida[filho] = (
+                    self._saida[filho] + self._saida[self._falha[filho]]
+                )
+
+    # --------------------------------------------------------
+    # Consultas
+    # --------------------------------------------------------
+    def ocorrencias(
+        self,
+        texto: str,
+        normalizado: bool = False,
+    ) -> Iterator[Tuple[int, int, int]]:
+        """
+        Percorre o texto uma única vez e gera todas as ocorrências.
+
+        Args:
+            texto: Texto do versículo
+            normalizado: True se o texto já está normalizado
+
+        Yields:
+            tuple: (índice do termo, início, fim) em offsets de caractere
+        """
+        palavras = tokenizar_com_posicoes(texto, normalizado=normalizado)
+        transicoes = self._transicoes
+        falha = self._falha
+        saida = self._saida
+
+        estado = 0
+        for posicao, (token, _, fim) in enumerate(palavras):
+            while estado and token not in transicoes[estado]:
+                estado = falha[estado]
+            estado = transicoes[estado].get(token, 0)
+
+            for indice in saida[estado]:
+                primeira = posicao - self._comprimentos[indice] + 1
+                yield indice, palavras[primeira][1], fim
+
+    def encontrados(self, texto: str, normalizado: bool = False) -> Set[int]:
+        """Índices dos termos presentes no texto."""
+        return {indice for indice, _, _ in self.ocorrencias(texto, normalizado)}
+
+    def contagens(self, texto: str, normalizado: bool = False) -> List[int]:
+        """Número de ocorrências de cada termo no texto."""
+        contagem = [0] * len(self.termos)
+        for indice, _, _ in self.ocorrencias(texto, normalizado):
+            contagem[indice] += 1
+        return contagem
+
+    def todos(self, texto: str, normalizado: bool = False) -> bool:
+        """True se TODOS os termos aparecem no texto (operador E)."""
+        if not self._validos:
+            return False
+        return len(self.encontrados(texto, normalizado)) == self._validos
+
+    def algum(self, texto: str, normalizado: bool = False) -> bool:
+        """True se QUALQUER termo aparece no texto (operador OU)."""
+        return next(self.ocorrencias(texto, normalizado), None) is not None
+
+
+# ============================================================
+# Trechos para destaque
+# ============================================================
+@lru_cache(maxsize=64)
+def localizar_trechos(
+    termos: Tuple[str, ...],
+) -> Callable[[str], List[Tuple[int, int, int]]]:
+    """
+    Função que acha os trechos dos termos em um texto.
+
+    O localizador (e as regex dos curingas) é montado uma vez por
+    conjunto de termos; cada chamada faz uma passada pelo texto.
+
+    Exemplo:
+        >>> trechos = localizar_trechos(("amor", "salv*"))
+        >>> trechos("O Amor que salva")
+        [(2, 6, 0), (11, 16, 1)]
+
+    Args:
+        termos: Palavras, frases ou curingas (`salv*`, `am?r`)
+
+    Returns:
+        Callable: Recebe o texto e devolve os trios (início, fim,
+                  termo) ordenados, com `termo` = índice em `termos`
+                  e offsets no texto como foi recebido
+    """
+    comuns = [i for i, t in enumerate(termos) if not tem_curinga(t)]
+    localizador = LocalizadorTermos([termos[i] for i in comuns])
+    curingas = [
+        (i, re.compile(rf"\b{regex_curinga(t)}\b"))
+        for i, t in enumerate(termos)
+        if tem_curinga(t)
+    ]
+
+    def trechos(texto: str) -> List[Tuple[int, int, int]]:
+        texto_norm = normalizar_texto(texto)
+        encontrados = {
+            (inicio, fim, comuns[idx])
+            for idx, inicio, fim in localizador.ocorrencias(
+                texto_norm, normalizado=True
+            )
+        }
+        for termo, regex in curingas:
+            encontrados.update(
+                (*m.span(), termo) for m in regex.finditer(texto_norm)
+            )
+        mapa = mapa_nfc(texto)
+        if mapa is not None:
+            encontrados = {(mapa[i], mapa[f], t) for i, f, t in encontrados}
+        return sorted(encontrados)
+
+    return trechos
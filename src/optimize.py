@@ -2,7 +2,12 @@
 Módulo de Otimização do Banco de Dados.
 
 Este módulo contém funções para criar índices e otimizar
-a performance das consultas SQL nos bancos de dados SQLite.
+a performance das consultas SQL nos bancos de dados SQLite,
+incluindo o índice de texto completo (FTS5) e a coluna de texto
+normalizado (sem acentos, minúsculas) usados pelas buscas.
+
+Também compila cada banco no arquivo binário do corpus em memória
+(`ACF.sqlite` → `ACF.corpus`, ver `corpus`), aberto com `np.memmap`.
 
 Autor: Edson Deveza
 Data: 2024
@@ -11,8 +16,73 @@ Versão: 2.1
 
 import sqlite3
 import os
+from pathlib import Path
 from typing import Dict, List
 
+from .text_utils import normalizar_texto
+
+
+# Tabela virtual FTS5 espelhando verse.text (external content)
+TABELA_FTS = "verse_fts"
+
+# Tokenizer do FTS5: remove acentos e ignora maiúsculas ("fe" acha "fé")
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+
+# Tabela-sombra com o texto normalizado de cada versículo
+TABELA_NORMALIZADA = "verse_norm"
+
+FTS_SQL: List[str] = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_FTS} USING fts5(
+        text,
+        content='verse',
+        content_rowid='id',
+        tokenize='{FTS_TOKENIZER}'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_ai AFTER INSERT ON verse BEGIN
+        INSERT INTO {TABELA_FTS}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_ad AFTER DELETE ON verse BEGIN
+        INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_au AFTER UPDATE ON verse BEGIN
+        INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO {TABELA_FTS}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+
+# Triggers que descartam a linha de `verse_norm` de um versículo
+# inserido, alterado ou excluído. A normalização é feita em Python e
+# não existe em SQL puro, então o trigger não regrava o texto: quem lê
+# a tabela (LEFT JOIN) normaliza `verse.text` quando a linha falta, e o
+# otimizador volta a preenchê-la na próxima execução.
+NORMALIZADO_SQL: List[str] = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TABELA_NORMALIZADA}_ai AFTER INSERT ON verse BEGIN
+        DELETE FROM {TABELA_NORMALIZADA} WHERE id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TABELA_NORMALIZADA}_ad AFTER DELETE ON verse BEGIN
+        DELETE FROM {TABELA_NORMALIZADA} WHERE id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TABELA_NORMALIZADA}_au AFTER UPDATE ON verse BEGIN
+        DELETE FROM {TABELA_NORMALIZADA} WHERE id IN (old.id, new.id);
+    END
+    """,
+]
+
 
 # ============================================================
 # 🔧 1. Criar índices otimizados
@@ -22,7 +92,7 @@ def criar_indices(caminho_banco: str) -> bool:
     Cria índices otimizados no banco de dados SQLite.
 
     Os índices melhoram significativamente a performance de:
-    - Buscas por texto (em alguns casos)
+    - Buscas por palavra e frase (índice FTS5 `verse_fts`)
     - Navegação por livro/capítulo
     - Filtros por testamento
 
@@ -57,6 +127,16 @@ def criar_indices(caminho_banco: str) -> bool:
             except sqlite3.Error as e:
                 print(f"⚠️ Erro ao criar índice em {caminho_banco}: {e}")
 
+        try:
+            criar_texto_normalizado(conexao)
+        except sqlite3.Error as e:
+            print(f"⚠️ Erro ao criar texto normalizado em {caminho_banco}: {e}")
+
+        try:
+            criar_indice_fts(conexao)
+        except sqlite3.Error as e:
+            print(f"⚠️ Erro ao criar índice FTS5 em {caminho_banco}: {e}")
+
         # Melhora consultas internas do SQLite
         try:
             cursor.execute("PRAGMA optimize;")
@@ -78,17 +158,114 @@ def criar_indices(caminho_banco: str) -> bool:
 
 
 # ============================================================
-# 🔧 2. Otimizar TODOS bancos da pasta /data
+# 🔧 2. Índice de texto completo (FTS5)
+# ============================================================
+def criar_indice_fts(conexao: sqlite3.Connection) -> None:
+    """
+    Cria a tabela virtual FTS5 `verse_fts` e os triggers que a mantêm
+    sincronizada com a tabela `verse`.
+
+    A tabela usa "external content": o texto não é duplicado, apenas
+    o índice invertido. Na primeira criação o índice é populado com
+    o comando `rebuild`; nas execuções seguintes é apenas otimizado.
+    Um índice criado com outro tokenizer é descartado e recriado.
+
+    Args:
+        conexao: Conexão aberta (com permissão de escrita) com o banco
+
+    Raises:
+        sqlite3.Error: Se o SQLite não suportar FTS5 ou a criação falhar
+    """
+    cursor = conexao.cursor()
+
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (TABELA_FTS,),
+    )
+    linha = cursor.fetchone()
+    ja_existia = linha is not None
+
+    if ja_existia and FTS_TOKENIZER not in (linha[0] or ""):
+        for sufixo in ("ai", "ad", "au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {TABELA_FTS}_{sufixo}")
+        cursor.execute(f"DROP TABLE {TABELA_FTS}")
+        ja_existia = False
+
+    for sql in FTS_SQL:
+        cursor.execute(sql)
+
+    if ja_existia:
+        cursor.execute(
+            f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('optimize')"
+        )
+    else:
+        cursor.execute(
+            f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('rebuild')"
+        )
+
+    conexao.commit()
+
+
+# ============================================================
+# 🔧 3. Texto normalizado (sem acentos / minúsculas)
+# ============================================================
+def criar_texto_normalizado(conexao: sqlite3.Connection) -> None:
+    """
+    Cria (ou recria) a tabela-sombra `verse_norm` com o texto de cada
+    versículo já normalizado por `text_utils.normalizar_texto`.
+
+    As buscas comparam o termo normalizado com essa coluna, sem
+    converter o texto a cada consulta. O texto original continua
+    em `verse.text` e é o único exibido ao usuário.
+
+    A tabela é regravada inteira a cada execução do otimizador e os
+    triggers de `NORMALIZADO_SQL` descartam a linha de um versículo
+    alterado depois disso, para que ela nunca fique desatualizada
+    (as buscas normalizam o texto dos versículos sem linha).
+
+    Args:
+        conexao: Conexão aberta (com permissão de escrita) com o banco
+    """
+    cursor = conexao.cursor()
+
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_NORMALIZADA} (
+            id INTEGER PRIMARY KEY,
+            text_norm TEXT NOT NULL
+        )
+        """
+    )
+    cursor.execute(f"DELETE FROM {TABELA_NORMALIZADA}")
+
+    linhas = conexao.execute("SELECT id, text FROM verse").fetchall()
+    cursor.executemany(
+        f"INSERT INTO {TABELA_NORMALIZADA} (id, text_norm) VALUES (?, ?)",
+        ((rowid, normalizar_texto(texto or "")) for rowid, texto in linhas),
+    )
+    for sql in NORMALIZADO_SQL:
+        cursor.execute(sql)
+
+    conexao.commit()
+
+
+# ============================================================
+# 🔧 4. Otimizar TODOS bancos da pasta /data
 # ============================================================
 def otimizar_todos_bancos(pasta_data: str) -> Dict[str, str]:
     """
     Otimiza todos os bancos de dados SQLite em uma pasta.
 
+    Depois dos índices, compila o corpus binário de cada banco (a
+    criação dos índices altera o .sqlite e desatualizaria um corpus
+    compilado antes).
+
     Args:
         pasta_data: Caminho para a pasta contendo os arquivos .sqlite
 
     Returns:
-        dict: {"ACF.sqlite": "✅ Otimizado", "NVI.sqlite": "❌ Erro"}
+        dict: {"ACF.sqlite": "✅ Otimizado", "NVI.sqlite": "❌ Erro",
+               "ARA.sqlite": "⚠️ Otimizado (sem corpus)"}
     """
     if not os.path.isdir(pasta_data):
         return {"erro": f"❌ Pasta não encontrada: {pasta_data}"}
@@ -105,14 +282,18 @@ def otimizar_todos_bancos(pasta_data: str) -> Dict[str, str]:
 
     for arquivo in arquivos_sqlite:
         caminho = os.path.join(pasta_data, arquivo)
-        sucesso = criar_indices(caminho)
-        resultados[arquivo] = "✅ Otimizado" if sucesso else "❌ Erro"
+        if not criar_indices(caminho):
+            resultados[arquivo] = "❌ Erro"
+        elif not compilar_corpus(caminho):
+            resultados[arquivo] = "⚠️ Otimizado (sem corpus)"
+        else:
+            resultados[arquivo] = "✅ Otimizado"
 
     return resultados
 
 
 # ============================================================
-# 🔧 3. Verificar índices existentes
+# 🔧 5. Verificar índices existentes
 # ============================================================
 def verificar_indices_existentes(caminho_banco: str) -> Dict[str, bool]:
     """
@@ -122,7 +303,8 @@ def verificar_indices_existentes(caminho_banco: str) -> Dict[str, bool]:
         caminho_banco: Caminho completo para o arquivo .sqlite
 
     Returns:
-        dict: {"idx_verse_text": True/False, ...}
+        dict: {"idx_verse_text": True/False, ..., "verse_fts": True/False,
+               "verse_norm": True/False}
     """
     try:
         conexao = sqlite3.connect(caminho_banco)
@@ -137,10 +319,19 @@ def verificar_indices_existentes(caminho_banco: str) -> Dict[str, bool]:
 
         existentes = {row[0] for row in cursor.fetchall()}
 
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name IN (?, ?)",
+            (TABELA_FTS, TABELA_NORMALIZADA),
+        )
+        existentes.update(row[0] for row in cursor.fetchall())
+
         indices_esperados = [
             "idx_verse_text",
             "idx_verse_book_chapter",
             "idx_book_testament",
+            TABELA_FTS,
+            TABELA_NORMALIZADA,
         ]
 
         return {
@@ -157,3 +348,44 @@ def verificar_indices_existentes(caminho_banco: str) -> Dict[str, bool]:
             conexao.close()
         except:
             pass
+
+
+# ============================================================
+# 🔧 6. Compilar o corpus binário (memmap)
+# ============================================================
+def compilar_corpus(caminho_banco: str) -> bool:
+    """
+    Compila o banco no arquivo binário do corpus (`<versão>.corpus`).
+
+    O arquivo guarda a impressão digital do .sqlite (tamanho e data
+    de modificação); se o banco mudar depois, o corpus é ignorado até
+    ser compilado de novo.
+
+    Args:
+        caminho_banco: Caminho completo para o arquivo .sqlite
+
+    Returns:
+        bool: True se o corpus foi gravado, False caso contrário
+    """
+    # Importado aqui: corpus → search_index → optimize (ciclo)
+    from .corpus import Corpus, caminho_corpus, salvar_corpus
+
+    try:
+        info = os.stat(caminho_banco)
+        uri = Path(caminho_banco).resolve().as_uri() + "?mode=ro"
+        conexao = sqlite3.connect(uri, uri=True)
+        try:
+            corpus = Corpus.construir(conexao)
+        finally:
+            conexao.close()
+
+        salvar_corpus(
+            corpus,
+            caminho_corpus(caminho_banco),
+            origem=(info.st_size, info.st_mtime_ns),
+        )
+        return True
+
+    except (OSError, sqlite3.Error, ValueError) as e:
+        print(f"❌ Erro ao compilar corpus de {caminho_banco}: {e}")
+        return False
@@ -0,0 +1,271 @@
+"""
+Módulo de Referências Bíblicas.
+
+Interpreta referências digitadas pelo usuário ("Jo 3:16", "Sl 23",
+"Rm 8:28-39", "1 Co 13", "Gênesis 1.1") e as converte em livro,
+capítulo e faixa de versículos.
+
+Nomes e abreviações dos 66 livros ficam em uma árvore de prefixos
+(trie) montada uma única vez na importação do módulo. Além dos
+apelidos exatos, qualquer prefixo que leve a um único livro também
+é aceito ("Gên", "Apoc", "Filem").
+
+Os livros são identificados pela ordem canônica (1 = Gênesis,
+66 = Apocalipse); a tradução para o book_id de cada banco é feita
+pelo nome do livro em `database.buscar_referencia`.
+
+Autor: Edson Deveza
+Data: 2025
+Versão: 2.1
+Compatível: Python 3.12
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .text_utils import normalizar_texto
+
+# ============================================================
+# Livros (ordem canônica) e abreviações
+# ============================================================
+# Apelidos podem repetir o nome em outras grafias usadas pelas
+# traduções ("Cantares de Salomão", "Oseias"...)
+LIVROS: List[Tuple[str, List[str]]] = [
+    ("Gênesis", ["gn", "gen"]),
+    ("Êxodo", ["ex", "êx"]),
+    ("Levítico", ["lv", "lev"]),
+    ("Números", ["nm", "num"]),
+    ("Deuteronômio", ["dt", "deut"]),
+    ("Josué", ["js", "jos"]),
+    ("Juízes", ["jz", "juiz"]),
+    ("Rute", ["rt"]),
+    ("1 Samuel", ["1sm", "1sam"]),
+    ("2 Samuel", ["2sm", "2sam"]),
+    ("1 Reis", ["1rs"]),
+    ("2 Reis", ["2rs"]),
+    ("1 Crônicas", ["1cr", "1cro"]),
+    ("2 Crônicas", ["2cr", "2cro"]),
+    ("Esdras", ["ed", "esd"]),
+    ("Neemias", ["ne", "nee"]),
+    ("Ester", ["et", "est"]),
+    ("Jó", ["jó", "job"]),
+    ("Salmos", ["sl", "sal", "salmo"]),
+    ("Provérbios", ["pv", "pr", "prov"]),
+    ("Eclesiastes", ["ec", "ecl"]),
+    ("Cânticos", ["ct", "cant", "cantares", "cântico dos cânticos",
+                  "cantares de salomão"]),
+    ("Isaías", ["is", "isa"]),
+    ("Jeremias", ["jr", "jer"]),
+    ("Lamentações", ["lm", "lam", "lamentações de jeremias"]),
+    ("Ezequiel", ["ez", "ezeq"]),
+    ("Daniel", ["dn", "dan"]),
+    ("Oséias", ["os"]),
+    ("Joel", ["jl"]),
+    ("Amós", ["am"]),
+    ("Obadias", ["ob", "obd", "abdias"]),
+    ("Jonas", ["jn"]),
+    ("Miquéias", ["mq"]),
+    ("Naum", ["na"]),
+    ("Habacuque", ["hc", "hab"]),
+    ("Sofonias", ["sf", "sof"]),
+    ("Ageu", ["ag"]),
+    ("Zacarias", ["zc", "zac"]),
+    ("Malaquias", ["ml", "mal"]),
+    ("Mateus", ["mt"]),
+    ("Marcos", ["mc"]),
+    ("Lucas", ["lc"]),
+    ("João", ["jo"]),
+    ("Atos", ["at", "atos dos apóstolos"]),
+    ("Romanos", ["rm", "rom"]),
+    ("1 Coríntios", ["1co", "1cor"]),
+    ("2 Coríntios", ["2co", "2cor"]),
+    ("Gálatas", ["gl", "gal"]),
+    ("Efésios", ["ef"]),
+    ("Filipenses", ["fp", "fl"]),
+    ("Colossenses", ["cl", "col"]),
+    ("1 Tessalonicenses", ["1ts"]),
+    ("2 Tessalonicenses", ["2ts"]),
+    ("1 Timóteo", ["1tm"]),
+    ("2 Timóteo", ["2tm"]),
+    ("Tito", ["tt", "tit"]),
+    ("Filemom", ["fm", "filemon"]),
+    ("Hebreus", ["hb"]),
+    ("Tiago", ["tg"]),
+    ("1 Pedro", ["1pe", "1pd"]),
+    ("2 Pedro", ["2pe", "2pd"]),
+    ("1 João", ["1jo"]),
+    ("2 João", ["2jo"]),
+    ("3 João", ["3jo"]),
+    ("Judas", ["jd"]),
+    ("Apocalipse", ["ap", "apoc"]),
+]
+
+# Livro + capítulo [+ : versículo [- versículo]]
+_RE_REFERENCIA = re.compile(
+    r"""^\s*
+    (?P<livro>(?:[123]\s*[ºª]?\s*)?[^\W\d_][^\d:]*?)\s*
+    (?P<capitulo>\d{1,3})
+    (?:\s*[:.,]\s*(?P<inicio>\d{1,3})
+       (?:\s*[-–]\s*(?P<fim>\d{1,3}))?
+    )?
+    \s*$""",
+    re.VERBOSE,
+)
+
+_RE_ROMANO = re.compile(r"^(iii|ii|i)\s+")
+_ROMANOS = {"i": "1", "ii": "2", "iii": "3"}
+
+
+def chave_livro(nome: str) -> str:
+    """
+    Forma canônica de um nome de livro para a árvore: minúsculas, sem
+    espaços, pontos e ordinais; "I Samuel" e "1º Samuel" viram "1samuel".
+
+    Os acentos são mantidos (ver `ArvoreApelidos.resolver`).
+    """
+    nome = nome.strip().lower()
+    nome = _RE_ROMANO.sub(lambda m: _ROMANOS[m.group(1)], nome)
+    return re.sub(r"[\s.ºª]", "", nome)
+
+
+# ============================================================
+# Árvore de prefixos
+# ============================================================
+class ArvoreApelidos:
+    """
+    Trie de nomes e abreviações de livros.
+
+    Cada nó guarda o livro do apelido que termina nele (se houver)
+    e o conjunto de livros alcançáveis a partir dele, o que permite
+    aceitar prefixos sem ambiguidade.
+
+    Exemplo:
+        >>> arvore = ArvoreApelidos()
+        >>> arvore.inserir("genesis", 1)
+        >>> arvore.resolver("gen")
+        1
+    """
+
+    _LIVRO = "\0livro"
+    _ALCANCE = "\0alcance"
+
+    def __init__(self) -> None:
+        self._raiz: Dict = {self._ALCANCE: set()}
+
+    def inserir(self, apelido: str, livro: int) -> None:
+        """
+        Insere um apelido; se já existir, o primeiro livro inserido
+        prevalece (ex.: "jo" é João, mesmo sem acento de Jó).
+        """
+        no = self._raiz
+        no[self._ALCANCE].add(livro)
+        for caractere in apelido:
+            no = no.setdefault(caractere, {self._ALCANCE: set()})
+            no[self._ALCANCE].add(livro)
+        no.setdefault(self._LIVRO, livro)
+
+    def resolver(self, chave: str, prefixo_minimo: int = 2) -> Optional[int]:
+        """
+        Livro de um apelido exato ou de um prefixo sem ambiguidade.
+
+        Args:
+            chave: Nome já passado por `chave_livro`
+            prefixo_minimo: Tamanho mínimo para aceitar um prefixo
+
+        Returns:
+            int | None: Número canônico do livro (1–66)
+        """
+        no = self._raiz
+        for caractere in chave:
+            no = no.get(caractere)
+            if no is None:
+                return None
+
+        livro = no.get(self._LIVRO)
+        if livro is not None:
+            return livro
+        alcance: Set[int] = no[self._ALCANCE]
+        if len(chave) >= prefixo_minimo and len(alcance) == 1:
+            return next(iter(alcance))
+        return None
+
+
+def _montar_arvore(
+    livros: Iterable[Tuple[str, List[str]]],
+) -> ArvoreApelidos:
+    """
+    Insere nomes e abreviações com acento e depois sem acento; assim
+    a grafia acentuada sempre vence ("jó" → Jó, "jo" → João).
+    """
+    livros = list(livros)
+    arvore = ArvoreApelidos()
+    for sem_acento in (False, True):
+        for numero, (nome, apelidos) in enumerate(livros, start=1):
+            for apelido in [nome, *apelidos]:
+                chave = chave_livro(apelido)
+                if sem_acento:
+                    chave = normalizar_texto(chave)
+                arvore.inserir(chave, numero)
+    return arvore
+
+
+ARVORE_APELIDOS = _montar_arvore(LIVROS)
+
+
+def resolver_livro(nome: str) -> Optional[int]:
+    """
+    Número canônico (1–66) de um nome ou abreviação de livro.
+
+    Exemplo: "Jo" → 43, "Jó" → 18, "1 Co" → 46, "Apoc" → 66
+    """
+    chave = chave_livro(nome)
+    if not chave:
+        return None
+    livro = ARVORE_APELIDOS.resolver(chave)
+    if livro is None:
+        livro = ARVORE_APELIDOS.resolver(normalizar_texto(chave))
+    return livro
+
+
+# ============================================================
+# Referências
+# ============================================================
+def interpretar_referencia(texto: str) -> Optional[Dict]:
+    """
+    Interpreta uma referência bíblica.
+
+    Exemplo:
+        >>> interpretar_referencia("Rm 8:28-39")
+        {'livro': 45, 'nome': 'Romanos', 'capitulo': 8, 'inicio': 28, 'fim': 39}
+
+    Args:
+        texto: Texto digitado ("Jo 3:16", "Sl 23", "Rm 8:28-39")
+
+    Returns:
+        dict | None: {'livro', 'nome', 'capitulo', 'inicio', 'fim'}
+                     ('inicio'/'fim' None = capítulo inteiro), ou None
+                     se o texto não é uma referência
+    """
+    encontrado = _RE_REFERENCIA.match(texto or "")
+    if not encontrado:
+        return None
+
+    livro = resolver_livro(encontrado.group("livro"))
+    capitulo = int(encontrado.group("capitulo"))
+    if livro is None or capitulo < 1:
+        return None
+
+    inicio = encontrado.group("inicio")
+    fim = encontrado.group("fim") or inicio
+    if inicio is not None:
+        inicio, fim = int(inicio), int(fim)
+        if inicio < 1 or fim < inicio:
+            return None
+
+    return {
+        "livro": livro,
+        "nome": LIVROS[livro - 1][0],
+        "capitulo": capitulo,
+        "inicio": inicio,
+        "fim": fim,
+    }
@@ -0,0 +1,1111 @@
+"""
+Módulo de Índice de Busca em Memória.
+
+Mantém, para cada versão da Bíblia, um índice invertido que mapeia
+cada palavra normalizada (sem acentos, minúsculas) para a lista
+ordenada dos versículos onde ela aparece (posting list em NumPy uint32).
+
+Consultas booleanas (E/OU/NÃO + filtros de testamento e livro) são
+avaliadas como operações bit a bit sobre máscaras NumPy com um
+elemento por versículo; as máscaras de termo ficam em cache (LRU).
+
+O índice também é posicional: guarda o ordinal de cada ocorrência
+da palavra no versículo, o que permite responder frases exatas e
+proximidade (PERTO/k) conferindo apenas os candidatos da palavra
+mais rara.
+
+Prefixos e curingas (`salv*`, `am?r`) são resolvidos no vocabulário
+ordenado da versão com busca binária (`bisect`) e expandidos para as
+posting lists das palavras encontradas.
+
+Para ordenar por relevância, o índice guarda o número de palavras de
+cada versículo; a frequência de cada palavra no versículo sai dos
+offsets CSR. A pontuação é BM25 e só os k melhores versículos são
+selecionados (heap), sem ordenar todos os resultados.
+
+O mesmo vocabulário ordenado, com a frequência de cada palavra,
+responde o autocompletar: a faixa do prefixo sai por busca binária e
+as palavras mais frequentes dela são devolvidas na grafia original.
+
+Para a busca por variações da palavra ("amar" → amou, amará,
+amando), cada palavra do vocabulário é reduzida ao radical (RSLP,
+ver `stemmer`) uma única vez na construção, e o índice guarda
+radical → palavras e radical → posting list. Nas consultas só o
+termo digitado é radicalizado.
+
+Para buscas sem resultado, o vocabulário agrupado por comprimento
+fornece sugestões ("você quis dizer") por distância de edição
+(RapidFuzz), sem reler o texto dos versículos.
+
+O índice é construído uma única vez por arquivo .sqlite e
+compartilhado entre todas as sessões do Streamlit via
+`st.cache_resource`. A chave do cache inclui tamanho e data de
+modificação do arquivo, então substituir um .sqlite gera um novo
+índice automaticamente.
+
+O índice pode ser desligado por versão com a variável de ambiente
+`BIBLIA_SEM_INDICE_MEMORIA` (nomes das versões separados por vírgula,
+ou `*` para todas), por exemplo em servidores com pouca memória. Sem
+índice, ou se a construção falhar, as buscas seguem pelo FTS5 do
+arquivo (ou pelo LIKE, se o arquivo não tiver FTS5).
+
+Autor: Edson Deveza
+Data: 2025
+Versão: 2.1
+Compatível: Python 3.12
+"""
+
+import difflib
+import heapq
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import streamlit as st
+
+try:
+    from rapidfuzz.distance import Levenshtein
+    from rapidfuzz.process import extract
+except ImportError:  # pragma: no cover - RapidFuzz é opcional
+    Levenshtein = None
+
+from .logger import log_erro
+from .optimize import TABELA_NORMALIZADA
+from .stemmer import radical
+from .text_utils import (
+    eh_prefixo,
+    mapa_nfc,
+    normalizar_texto,
+    prefixo_curinga,
+    regex_curinga,
+    tem_curinga,
+    texto_nfc,
+    tokenizar_com_posicoes,
+)
+
+
+_VAZIO = np.empty(0, dtype=np.uint32)
+
+# Máximo de máscaras de termo mantidas por índice (~31 KB cada)
+MAX_MASCARAS = 512
+
+# Parâmetros do BM25 (valores usuais da literatura)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Versões (nome do arquivo sem extensão) que não usam o índice em
+# memória; "*" desliga o índice para todas
+SEM_INDICE_MEMORIA = frozenset(
+    nome.strip().upper()
+    for nome in os.environ.get("BIBLIA_SEM_INDICE_MEMORIA", "").split(",")
+    if nome.strip()
+)
+
+
+def distancia_maxima(palavra: str) -> int:
+    """Erros de digitação tolerados na sugestão, conforme o tamanho."""
+    if len(palavra) <= 3:
+        return 0
+    if len(palavra) <= 5:
+        return 1
+    return 2
+
+
+# ============================================================
+# Operações sobre posting lists
+# ============================================================
+def intersectar(listas: List[np.ndarray]) -> np.ndarray:
+    """
+    Interseção de posting lists ordenadas.
+
+    As listas são intersectadas da menor para a maior, de modo que
+    o custo acompanha a lista mais rara.
+    """
+    if not listas:
+        return _VAZIO
+
+    listas = sorted(listas, key=len)
+    resultado = listas[0]
+    for lista in listas[1:]:
+        if not len(resultado):
+            break
+        resultado = np.intersect1d(resultado, lista, assume_unique=True)
+    return resultado
+
+
+def unir(listas: List[np.ndarray]) -> np.ndarray:
+    """União de posting lists ordenadas (resultado ordenado, sem repetição)."""
+    listas = [lista for lista in listas if len(lista)]
+    if not listas:
+        return _VAZIO
+    if len(listas) == 1:
+        return listas[0]
+    return np.unique(np.concatenate(listas))
+
+
+def contem_sequencia(ordinais: List[Iterable[int]]) -> bool:
+    """
+    Indica se há um ordinal p na 1ª lista tal que p + i está na
+    i-ésima lista (palavras consecutivas de uma frase).
+    """
+    inicios = set(int(p) for p in ordinais[0])
+    for deslocamento, lista in enumerate(ordinais[1:], start=1):
+        presentes = set(int(p) for p in lista)
+        inicios = {p for p in inicios if p + deslocamento in presentes}
+        if not inicios:
+            return False
+    return True
+
+
+def menor_janela(ordinais: List[Iterable[int]]) -> int:
+    """
+    Menor distância (último - primeiro ordinal) de uma janela que
+    contém ao menos uma ocorrência de cada lista.
+    """
+    eventos = sorted(
+        (int(p), indice)
+        for indice, lista in enumerate(ordinais)
+        for p in lista
+    )
+    necessarias = len(ordinais)
+    contagem = [0] * necessarias
+    cobertas = 0
+    melhor = None
+    esquerda = 0
+
+    for ordinal, indice in eventos:
+        if contagem[indice] == 0:
+            cobertas += 1
+        contagem[indice] += 1
+
+        while cobertas == necessarias:
+            inicio, indice_esq = eventos[esquerda]
+            largura = ordinal - inicio
+            if melhor is None or largura < melhor:
+                melhor = largura
+            contagem[indice_esq] -= 1
+            if contagem[indice_esq] == 0:
+                cobertas -= 1
+            esquerda += 1
+
+    return melhor if melhor is not None else 1 << 30
+
+
+def _chave(
+    livros: np.ndarray,
+    capitulos: np.ndarray,
+    versiculos: np.ndarray,
+) -> np.ndarray:
+    """Codifica (livro, capítulo, versículo) em um inteiro ordenável."""
+    return (
+        (livros.astype(np.uint64) << np.uint64(32))
+        | (capitulos.astype(np.uint64) << np.uint64(16))
+        | versiculos.astype(np.uint64)
+    )
+
+
+def _somente_leitura(mascara: np.ndarray) -> np.ndarray:
+    """Marca um array como somente leitura (compartilhado em cache)."""
+    mascara.flags.writeable = False
+    return mascara
+
+
+# ============================================================
+# Índice invertido
+# ============================================================
+class IndiceInvertido:
+    """
+    Índice invertido de uma versão da Bíblia.
+
+    Os versículos são numerados de 0 a N-1 na ordem canônica
+    (livro, capítulo, versículo). As posting lists guardam esses
+    números e o array `ids` traduz cada um para o rowid de `verse`.
+
+    Attributes:
+        ids: rowid de `verse` para cada versículo (uint32)
+        livros: book_id de cada versículo (uint16)
+        capitulos: capítulo de cada versículo (uint16)
+        versiculos: número de cada versículo (uint16)
+        testamentos: testament_reference_id de cada versículo (uint8)
+        comprimentos: número de palavras de cada versículo (uint16)
+        postings: {palavra: array uint32 ordenado de versículos}
+        ocorrencias: {palavra: (inicios, ordinais)} em formato CSR —
+                     os ordinais (uint16) da palavra no versículo
+                     `postings[palavra][j]` são
+                     `ordinais[inicios[j]:inicios[j + 1]]`
+        deslocamentos: {palavra: array uint16} — posição do 1º caractere
+                       de cada ocorrência, alinhada a `ocorrencias`
+                       (no texto em NFC)
+        mapas_nfc: {versículo: mapa} — para os textos gravados fora de
+                   NFC, converte os deslocamentos para o texto como
+                   está no banco (ver `text_utils.mapa_nfc`)
+        faixas_livro: {book_id: (início, fim)} — como os versículos estão
+                      em ordem canônica, cada livro é uma faixa contínua
+        vocabulario: Todas as palavras do índice em ordem alfabética
+        formas: {palavra: grafia original (com acentos, minúsculas)}
+        por_comprimento: {tamanho: palavras} — candidatas das sugestões
+        radicais: {radical: palavras} — palavras do vocabulário com o
+                  mesmo radical RSLP
+        postings_radical: {radical: posting list} — união das posting
+                          lists das palavras do radical
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        livros: np.ndarray,
+        capitulos: np.ndarray,
+        versiculos: np.ndarray,
+        testamentos: np.ndarray,
+        comprimentos: np.ndarray,
+        postings: Dict[str, np.ndarray],
+        ocorrencias: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        formas: Optional[Dict[str, str]] = None,
+        deslocamentos: Optional[Dict[str, np.ndarray]] = None,
+        mapas_nfc: Optional[Dict[int, List[int]]] = None,
+    ) -> None:
+        self.ids = ids
+        self.livros = livros
+        self.capitulos = capitulos
+        self.versiculos = versiculos
+        self.testamentos = testamentos
+        self.comprimentos = comprimentos
+        self.comprimento_medio = (
+            float(comprimentos.mean()) if len(comprimentos) else 0.0
+        )
+        self.postings = postings
+        self.ocorrencias = ocorrencias
+        self.vocabulario = sorted(postings)
+        self.formas = formas or {}
+        self.deslocamentos = deslocamentos or {}
+        self.mapas_nfc = mapas_nfc or {}
+
+        # Total de ocorrências de cada palavra, alinhado ao vocabulário
+        self._frequencias = np.array(
+            [len(ocorrencias[p][1]) for p in self.vocabulario], dtype=np.uint32
+        )
+
+        self.por_comprimento: Dict[int, List[str]] = defaultdict(list)
+        for palavra in self.vocabulario:
+            self.por_comprimento[len(palavra)].append(palavra)
+
+        # Radicais: cada palavra do vocabulário é reduzida uma única vez
+        radicais: Dict[str, List[str]] = defaultdict(list)
+        for palavra in self.vocabulario:
+            radicais[radical(palavra)].append(palavra)
+        self.radicais = dict(radicais)
+        self.postings_radical = {
+            raiz: unir([postings[p] for p in palavras])
+            for raiz, palavras in self.radicais.items()
+        }
+
+        # Máscaras de testamento pré-calculadas; livros são faixas contínuas
+        self._mascaras_testamento = {
+            int(t): _somente_leitura(testamentos == t)
+            for t in np.unique(testamentos)
+        }
+        ids_livro, inicios = np.unique(livros, return_index=True)
+        fins = list(inicios[1:]) + [len(livros)]
+        self.faixas_livro = {
+            int(livro): (int(ini), int(fim))
+            for livro, ini, fim in zip(ids_livro, inicios, fins)
+        }
+
+        # Chave (livro, capítulo, versículo) crescente, para paginação
+        self._chaves = _chave(livros, capitulos, versiculos)
+
+        self._mascaras: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # --------------------------------------------------------
+    # Construção
+    # --------------------------------------------------------
+    @classmethod
+    def construir(cls, conexao: sqlite3.Connection) -> "IndiceInvertido":
+        """
+        Constrói o índice lendo todos os versículos do banco.
+
+        Args:
+            conexao: Conexão com o banco da versão
+
+        Returns:
+            IndiceInvertido: Índice pronto para consultas
+        """
+        testamento_por_livro = dict(
+            conexao.execute("SELECT id, testament_reference_id FROM book")
+        )
+
+        # Usa o texto pré-normalizado pelo otimizador, se existir
+        tem_normalizado = conexao.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (TABELA_NORMALIZADA,),
+        ).fetchone() is not None
+
+        if tem_normalizado:
+            query = f"""
+                SELECT verse.id, verse.book_id, verse.chapter, verse.verse,
+                       verse.text, {TABELA_NORMALIZADA}.text_norm
+                FROM verse
+                LEFT JOIN {TABELA_NORMALIZADA}
+                       ON {TABELA_NORMALIZADA}.id = verse.id
+                ORDER BY verse.book_id, verse.chapter, verse.verse, verse.id
+            """
+        else:
+            query = """
+                SELECT id, book_id, chapter, verse, text, NULL
+                FROM verse
+                ORDER BY book_id, chapter, verse, id
+            """
+        cursor = conexao.execute(query)
+
+        ids: List[int] = []
+        livros: List[int] = []
+        capitulos: List[int] = []
+        versiculos: List[int] = []
+        comprimentos = array("H")
+
+        # Uma entrada por ocorrência: (id da palavra, versículo, ordinal,
+        # posição do 1º caractere no texto)
+        vocabulario: Dict[str, int] = {}
+        formas: Dict[str, str] = {}
+        ocorr_tokens = array("I")
+        ocorr_versiculos = array("I")
+        ocorr_ordinais = array("H")
+        ocorr_deslocamentos = array("H")
+        mapas_nfc: Dict[int, List[int]] = {}
+
+        for posicao, linha in enumerate(cursor):
+            rowid, livro, capitulo, versiculo, texto, texto_norm = linha
+            # Offsets valem para o texto em NFC (ver `normalizar_texto`);
+            # textos gravados de outra forma guardam o mapa de volta
+            mapa = mapa_nfc(texto or "")
+            if mapa is not None:
+                mapas_nfc[posicao] = mapa
+            texto = texto_nfc(texto or "")
+            ids.append(rowid)
+            livros.append(livro)
+            capitulos.append(capitulo)
+            versiculos.append(versiculo)
+
+            if texto_norm is not None:
+                palavras = tokenizar_com_posicoes(texto_norm, normalizado=True)
+            else:
+                palavras = tokenizar_com_posicoes(texto)
+            tokens = [palavra[0] for palavra in palavras]
+
+            tamanho_antes = len(vocabulario)
+            ocorr_tokens.extend(
+                [vocabulario.setdefault(t, len(vocabulario)) for t in tokens]
+            )
+
+            # Palavras novas: guarda a grafia original da 1ª ocorrência
+            # (a normalização preserva as posições no texto)
+            if len(vocabulario) > tamanho_antes and texto:
+                for token, inicio, fim in palavras:
+                    if token not in formas:
+                        formas[token] = texto[inicio:fim].lower()
+            comprimentos.append(min(len(tokens), 0xFFFF))
+            ocorr_versiculos.extend([posicao] * len(tokens))
+            ocorr_ordinais.extend(range(len(tokens)))
+            ocorr_deslocamentos.extend(
+                [min(palavra[1], 0xFFFF) for palavra in palavras]
+            )
+
+        livros_arr = np.array(livros, dtype=np.uint16)
+        testamentos = np.array(
+            [testamento_por_livro.get(livro, 0) for livro in livros],
+            dtype=np.uint8,
+        )
+
+        # Agrupa as ocorrências por palavra; a ordenação estável mantém
+        # versículos e ordinais crescentes dentro de cada palavra
+        tokens_arr = np.frombuffer(ocorr_tokens, dtype=np.uint32)
+        ordem = np.argsort(tokens_arr, kind="stable")
+        tokens_ord = tokens_arr[ordem]
+        versiculos_ord = np.frombuffer(ocorr_versiculos, dtype=np.uint32)[ordem]
+        ordinais_ord = np.frombuffer(ocorr_ordinais, dtype=np.uint16)[ordem]
+        deslocamentos_ord = np.frombuffer(ocorr_deslocamentos, dtype=np.uint16)[
+            ordem
+        ]
+
+        # Primeira ocorrência de cada par (palavra, versículo)
+        novo_par = np.ones(len(tokens_ord), dtype=bool)
+        novo_par[1:] = (tokens_ord[1:] != tokens_ord[:-1]) | (
+            versiculos_ord[1:] != versiculos_ord[:-1]
+        )
+        pares = np.flatnonzero(novo_par)
+        pares_versiculos = versiculos_ord[pares]
+
+        n_palavras = len(vocabulario)
+        ocorr_limites = np.searchsorted(tokens_ord, np.arange(n_palavras + 1))
+        pares_limites = np.searchsorted(
+            tokens_ord[pares], np.arange(n_palavras + 1)
+        )
+
+        postings: Dict[str, np.ndarray] = {}
+        ocorrencias: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        deslocamentos: Dict[str, np.ndarray] = {}
+        for token, tid in vocabulario.items():
+            o_ini, o_fim = ocorr_limites[tid], ocorr_limites[tid + 1]
+            p_ini, p_fim = pares_limites[tid], pares_limites[tid + 1]
+
+            postings[token] = pares_versiculos[p_ini:p_fim]
+            inicios = np.empty(p_fim - p_ini + 1, dtype=np.uint32)
+            inicios[:-1] = pares[p_ini:p_fim] - o_ini
+            inicios[-1] = o_fim - o_ini
+            ocorrencias[token] = (inicios, ordinais_ord[o_ini:o_fim])
+            deslocamentos[token] = deslocamentos_ord[o_ini:o_fim]
+
+        return cls(
+            ids=np.array(ids, dtype=np.uint32),
+            livros=livros_arr,
+            capitulos=np.array(capitulos, dtype=np.uint16),
+            versiculos=np.array(versiculos, dtype=np.uint16),
+            testamentos=testamentos,
+            comprimentos=np.frombuffer(comprimentos, dtype=np.uint16).copy(),
+            postings=postings,
+            ocorrencias=ocorrencias,
+            formas=formas,
+            deslocamentos=deslocamentos,
+            mapas_nfc=mapas_nfc,
+        )
+
+    # --------------------------------------------------------
+    # Consultas
+    # --------------------------------------------------------
+    def posting(self, token: str) -> np.ndarray:
+        """Retorna a posting list de uma palavra (vazia se não existir)."""
+        return self.postings.get(token, _VAZIO)
+
+    def expandir(self, padrao: str) -> List[str]:
+        """
+        Palavras do vocabulário que casam com um prefixo/curinga.
+
+        A parte literal antes do primeiro curinga delimita, por busca
+        binária, a faixa do vocabulário ordenado; só essa faixa é
+        conferida contra o padrão completo.
+
+        Args:
+            padrao: Ex.: "salv*" (salvação, salvador...), "am?r"
+
+        Returns:
+            list: Palavras normalizadas, em ordem alfabética
+        """
+        prefixo = prefixo_curinga(padrao)
+        inicio = bisect_left(self.vocabulario, prefixo)
+        fim = bisect_left(self.vocabulario, prefixo + "\U0010ffff")
+        candidatas = self.vocabulario[inicio:fim]
+
+        if eh_prefixo(padrao):
+            return candidatas
+
+        regex = re.compile(regex_curinga(padrao))
+        return [palavra for palavra in candidatas if regex.fullmatch(palavra)]
+
+    def forma(self, palavra: str) -> str:
+        """Grafia original de uma palavra normalizada (ex.: "fe" → "fé")."""
+        return self.formas.get(palavra, palavra)
+
+    def variantes(self, palavra: str) -> List[str]:
+        """
+        Palavras do vocabulário com o mesmo radical da palavra.
+
+        Exemplo: "amar" → ["amado", "amando", "amou", ...]
+        """
+        return self.radicais.get(radical(palavra), [])
+
+    def posting_radical(self, palavra: str) -> np.ndarray:
+        """Versículos com qualquer palavra de mesmo radical."""
+        return self.postings_radical.get(radical(palavra), _VAZIO)
+
+    def completar(self, prefixo: str, limite: int = 8) -> List[str]:
+        """
+        Palavras que começam com o prefixo, das mais frequentes para
+        as menos frequentes (autocompletar).
+
+        A faixa do prefixo no vocabulário ordenado sai por busca
+        binária; só ela é ordenada por frequência.
+
+        Args:
+            prefixo: Início da palavra (acentos/maiúsculas são ignorados)
+            limite: Máximo de palavras
+
+        Returns:
+            list: Palavras normalizadas (use `forma` para exibir)
+        """
+        prefixo = normalizar_texto(prefixo.strip())
+        if not prefixo or limite <= 0:
+            return []
+
+        inicio = bisect_left(self.vocabulario, prefixo)
+        fim = bisect_left(self.vocabulario, prefixo + "\U0010ffff")
+        if inicio == fim:
+            return []
+
+        # Mais frequente primeiro; a ordenação estável mantém os empates
+        # em ordem alfabética
+        frequencias = self._frequencias[inicio:fim].astype(np.int64)
+        melhores = np.argsort(-frequencias, kind="stable")[:limite]
+        return [self.vocabulario[inicio + j] for j in melhores.tolist()]
+
+    def posting_curinga(self, padrao: str) -> np.ndarray:
+        """Versículos com qualquer palavra que case com o curinga."""
+        return unir([self.posting(p) for p in self.expandir(padrao)])
+
+    def similares(self, palavra: str, limite: int = 5) -> List[str]:
+        """
+        Palavras do vocabulário mais próximas de uma palavra ausente.
+
+        Só são comparadas as palavras com comprimento compatível com
+        a distância tolerada (ver `distancia_maxima`); empates são
+        desfeitos pela frequência da palavra na versão.
+
+        Args:
+            palavra: Palavra normalizada (ex.: "ressureicao")
+            limite: Máximo de sugestões
+
+        Returns:
+            list: Palavras normalizadas, da mais para a menos provável
+        """
+        maximo = distancia_maxima(palavra)
+        if not maximo:
+            return []
+
+        tamanho = len(palavra)
+        candidatas = [
+            candidata
+            for n in range(tamanho - maximo, tamanho + maximo + 1)
+            for candidata in self.por_comprimento.get(n, ())
+            if candidata != palavra
+        ]
+
+        if Levenshtein is not None:
+            pontuadas = [
+                (distancia, candidata)
+                for candidata, distancia, _ in extract(
+                    palavra,
+                    candidatas,
+                    scorer=Levenshtein.distance,
+                    score_cutoff=maximo,
+                    limit=None,
+                )
+            ]
+        else:
+            proximas = difflib.get_close_matches(
+                palavra, candidatas, n=limite * 4, cutoff=0.75
+            )
+            pontuadas = list(enumerate(proximas))
+
+        pontuadas.sort(key=lambda par: (par[0], -len(self.posting(par[1]))))
+        return [candidata for _, candidata in pontuadas[:limite]]
+
+    def todos(self, tokens: Iterable[str]) -> np.ndarray:
+        """Versículos que contêm TODAS as palavras (interseção)."""
+        return intersectar([self.posting(t) for t in tokens])
+
+    def algum(self, tokens: Iterable[str]) -> np.ndarray:
+        """Versículos que contêm QUALQUER uma das palavras (união)."""
+        return unir([self.posting(t) for t in tokens])
+
+    def ordinais(self, token: str, posicoes: np.ndarray) -> List[np.ndarray]:
+        """
+        Ordinais da palavra em cada versículo informado.
+
+        Args:
+            token: Palavra normalizada
+            posicoes: Versículos (todos devem conter a palavra)
+
+        Returns:
+            list: Um array de ordinais por versículo, na mesma ordem
+        """
+        inicios, ordinais = self.ocorrencias[token]
+        indices = np.searchsorted(self.posting(token), posicoes)
+        return [ordinais[inicios[j]:inicios[j + 1]] for j in indices.tolist()]
+
+    def _ordinais_grupo(
+        self,
+        palavras: List[str],
+        posicoes: np.ndarray,
+    ) -> List[np.ndarray]:
+        """
+        Ordinais de qualquer uma das palavras em cada versículo
+        (todos devem conter ao menos uma delas).
+        """
+        if len(palavras) == 1:
+            return self.ordinais(palavras[0], posicoes)
+
+        por_palavra = [self._ocorrencias_em(p, posicoes) for p in palavras]
+        return [
+            np.sort(np.concatenate(
+                [o[j][0] for o in por_palavra if o[j] is not None]
+            ))
+            for j in range(len(posicoes))
+        ]
+
+    def _candidatos(
+        self,
+        tokens: List[str],
+        por_radical: bool,
+    ) -> Tuple[np.ndarray, List[List[str]]]:
+        """
+        Versículos com todas as palavras (ou variações) e o grupo de
+        palavras do vocabulário que representa cada token.
+        """
+        if por_radical:
+            candidatos = intersectar([self.posting_radical(t) for t in tokens])
+            return candidatos, [self.variantes(t) for t in tokens]
+        return self.todos(tokens), [[t] for t in tokens]
+
+    def frase(self, tokens: List[str], por_radical: bool = False) -> np.ndarray:
+        """
+        Versículos com as palavras consecutivas, na ordem dada.
+
+        Os candidatos saem da interseção das posting lists (custo da
+        palavra mais rara); só eles têm a adjacência conferida. Com
+        `por_radical`, cada palavra vale por qualquer variação dela.
+        """
+        candidatos, grupos = self._candidatos(tokens, por_radical)
+        if len(tokens) < 2 or not len(candidatos):
+            return candidatos
+
+        por_token = [self._ordinais_grupo(g, candidatos) for g in grupos]
+        mantidos = [
+            posicao
+            for j, posicao in enumerate(candidatos.tolist())
+            if contem_sequencia([listas[j] for listas in por_token])
+        ]
+        return np.array(mantidos, dtype=np.uint32)
+
+    def proximos(
+        self,
+        tokens: List[str],
+        distancia: int,
+        por_radical: bool = False,
+    ) -> np.ndarray:
+        """
+        Versículos em que todas as palavras aparecem com no máximo
+        `distancia` palavras entre a primeira e a última (PERTO/k).
+        """
+        if por_radical:
+            tokens = list({radical(t): t for t in tokens}.values())
+        else:
+            tokens = list(dict.fromkeys(tokens))
+        candidatos, grupos = self._candidatos(tokens, por_radical)
+        if len(tokens) < 2 or not len(candidatos):
+            return candidatos
+
+        por_token = [self._ordinais_grupo(g, candidatos) for g in grupos]
+        mantidos = [
+            posicao
+            for j, posicao in enumerate(candidatos.tolist())
+            if menor_janela([listas[j] for listas in por_token]) - 1 <= distancia
+        ]
+        return np.array(mantidos, dtype=np.uint32)
+
+    def posicao_apos(self, livro: int, capitulo: int, versiculo: int) -> int:
+        """
+        Primeira posição canônica depois de (livro, capítulo, versículo);
+        base da paginação por chave (keyset).
+        """
+        chave = _chave(
+            np.array([livro]), np.array([capitulo]), np.array([versiculo])
+        )
+        return int(np.searchsorted(self._chaves, chave[0], side="right"))
+
+    def chave(self, posicao: int) -> Tuple[int, int, int]:
+        """(book_id, capítulo, versículo) de uma posição do índice."""
+        return (
+            int(self.livros[posicao]),
+            int(self.capitulos[posicao]),
+            int(self.versiculos[posicao]),
+        )
+
+    def filtrar(
+        self,
+        posicoes: np.ndarray,
+        testamento_id: Optional[int] = None,
+        livro_id: Optional[int] = None,
+    ) -> np.ndarray:
+        """Restringe posições a um testamento e/ou livro."""
+        if testamento_id:
+            posicoes = posicoes[self.testamentos[posicoes] == testamento_id]
+        if livro_id:
+            posicoes = posicoes[self.livros[posicoes] == livro_id]
+        return posicoes
+
+    # --------------------------------------------------------
+    # Máscaras booleanas (um elemento por versículo)
+    # --------------------------------------------------------
+    def mascara_posicoes(self, posicoes: np.ndarray) -> np.ndarray:
+        """Converte uma lista de posições em máscara booleana."""
+        mascara = np.zeros(len(self), dtype=bool)
+        mascara[posicoes] = True
+        return _somente_leitura(mascara)
+
+    def mascara(self, token: str, por_radical: bool = False) -> np.ndarray:
+        """
+        Máscara dos versículos que contêm a palavra (com cache LRU).
+
+        Aceita também curingas (`salv*`), expandidos pelo vocabulário,
+        e, com `por_radical`, qualquer variação da palavra (a chave do
+        cache é o radical, então "amar" e "amou" dividem a máscara).
+        As máscaras retornadas são somente leitura, pois são
+        compartilhadas entre consultas e sessões.
+        """
+        chave = "~" + radical(token) if por_radical else token
+        with self._trava:
+            mascara = self._mascaras.get(chave)
+            if mascara is not None:
+                self._mascaras.move_to_end(chave)
+                return mascara
+
+        if por_radical:
+            mascara = self.mascara_posicoes(self.posting_radical(token))
+        elif tem_curinga(token):
+            mascara = self.mascara_posicoes(self.posting_curinga(token))
+        else:
+            mascara = self.mascara_posicoes(self.posting(token))
+
+        with self._trava:
+            self._mascaras[chave] = mascara
+            while len(self._mascaras) > MAX_MASCARAS:
+                self._mascaras.popitem(last=False)
+        return mascara
+
+    def mascara_testamento(self, testamento_id: int) -> np.ndarray:
+        """Máscara dos versículos de um testamento (pré-calculada)."""
+        mascara = self._mascaras_testamento.get(int(testamento_id))
+        if mascara is None:
+            return _somente_leitura(np.zeros(len(self), dtype=bool))
+        return mascara
+
+    def mascara_livro(self, livro_id: int) -> np.ndarray:
+        """Máscara dos versículos de um livro (faixa contínua)."""
+        mascara = np.zeros(len(self), dtype=bool)
+        faixa = self.faixas_livro.get(int(livro_id))
+        if faixa:
+            mascara[faixa[0]:faixa[1]] = True
+        return _somente_leitura(mascara)
+
+    def consultar(
+        self,
+        incluir: List[np.ndarray],
+        operador: str = "E",
+        excluir: Iterable[np.ndarray] = (),
+        testamento_id: Optional[int] = None,
+        livro_id: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Avalia uma consulta booleana com operações bit a bit.
+
+        Args:
+            incluir: Máscaras dos termos a combinar
+            operador: "E" (AND) ou "OU" (OR) entre os termos de `incluir`
+            excluir: Máscaras dos termos a excluir (NÃO)
+            testamento_id: Filtrar por testamento (opcional)
+            livro_id: Filtrar por livro (opcional)
+
+        Returns:
+            np.ndarray: Posições (uint32, ordenadas) dos versículos
+        """
+        if not incluir:
+            return _VAZIO
+
+        resultado = incluir[0].copy()
+        for mascara in incluir[1:]:
+            if operador.upper() == "E":
+                resultado &= mascara
+            else:
+                resultado |= mascara
+
+        for mascara in excluir:
+            resultado &= ~mascara
+
+        if testamento_id:
+            resultado &= self.mascara_testamento(testamento_id)
+
+        if livro_id:
+            faixa = self.faixas_livro.get(int(livro_id), (0, 0))
+            resultado[: faixa[0]] = False
+            resultado[faixa[1]:] = False
+
+        return np.flatnonzero(resultado).astype(np.uint32)
+
+    # --------------------------------------------------------
+    # Relevância (BM25)
+    # --------------------------------------------------------
+    def frequencias(self, token: str, posicoes: np.ndarray) -> np.ndarray:
+        """
+        Quantas vezes a palavra aparece em cada versículo informado
+        (0 onde não aparece), lida dos offsets CSR.
+        """
+        posting = self.posting(token)
+        frequencias = np.zeros(len(posicoes), dtype=np.float64)
+        if not len(posting) or not len(posicoes):
+            return frequencias
+
+        indices = np.searchsorted(posting, posicoes)
+        dentro = indices < len(posting)
+        presentes = dentro.copy()
+        presentes[dentro] = posting[indices[dentro]] == posicoes[dentro]
+
+        inicios, _ = self.ocorrencias[token]
+        frequencias[presentes] = np.diff(inicios)[indices[presentes]]
+        return frequencias
+
+    def pontuar(self, tokens: Iterable[str], posicoes: np.ndarray) -> np.ndarray:
+        """
+        Pontuação BM25 dos versículos para as palavras da consulta.
+
+        Args:
+            tokens: Palavras normalizadas da consulta
+            posicoes: Versículos a pontuar
+
+        Returns:
+            np.ndarray: Uma pontuação (float64) por versículo
+        """
+        posicoes = np.asarray(posicoes, dtype=np.uint32)
+        pontuacao = np.zeros(len(posicoes), dtype=np.float64)
+        if not len(posicoes):
+            return pontuacao
+
+        total = len(self.ids)
+        normalizacao = BM25_K1 * (
+            1 - BM25_B
+            + BM25_B * self.comprimentos[posicoes] / (self.comprimento_medio or 1)
+        )
+        for token in dict.fromkeys(tokens):
+            documentos = len(self.posting(token))
+            if not documentos:
+                continue
+            idf = np.log(1 + (total - documentos + 0.5) / (documentos + 0.5))
+            tf = self.frequencias(token, posicoes)
+            pontuacao += idf * tf * (BM25_K1 + 1) / (tf + normalizacao)
+        return pontuacao
+
+    def melhores(
+        self,
+        tokens: Iterable[str],
+        posicoes: np.ndarray,
+        k: int,
+    ) -> List[Tuple[int, float]]:
+        """
+        Os k versículos mais relevantes (BM25) entre os encontrados.
+
+        A seleção usa um heap de tamanho k; empates mantêm a ordem
+        canônica dos versículos.
+
+        Returns:
+            list: (posição, pontuação), da maior para a menor pontuação
+        """
+        pontuacao = self.pontuar(tokens, posicoes).tolist()
+        melhores = heapq.nlargest(
+            k, range(len(pontuacao)), key=pontuacao.__getitem__
+        )
+        return [(int(posicoes[j]), pontuacao[j]) for j in melhores]
+
+    # --------------------------------------------------------
+    # Destaques (trechos encontrados)
+    # --------------------------------------------------------
+    def _ocorrencias_em(
+        self,
+        token: str,
+        posicoes: np.ndarray,
+    ) -> List[Optional[Tuple[np.ndarray, np.ndarray]]]:
+        """(ordinais, deslocamentos) da palavra em cada versículo (ou None)."""
+        saida: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(
+            posicoes
+        )
+        posting = self.posting(token)
+        if not len(posting) or not len(posicoes):
+            return saida
+
+        inicios, ordinais = self.ocorrencias[token]
+        deslocamentos = self.deslocamentos[token]
+        indices = np.searchsorted(posting, posicoes)
+        limitados = np.minimum(indices, len(posting) - 1)
+        presentes = (indices < len(posting)) & (posting[limitados] == posicoes)
+
+        for j in np.flatnonzero(presentes).tolist():
+            ini, fim = inicios[indices[j]], inicios[indices[j] + 1]
+            saida[j] = (ordinais[ini:fim], deslocamentos[ini:fim])
+        return saida
+
+    def trechos(
+        self,
+        sequencias: List[Tuple[int, List[str]]],
+        posicoes: np.ndarray,
+    ) -> List[List[Tuple[int, int, int]]]:
+        """
+        Trechos encontrados em cada versículo, em offsets de caractere.
+
+        Os offsets vêm do índice (gravados na construção), então os
+        textos não precisam ser percorridos de novo para destacar.
+        Eles valem para o texto como está gravado em `verse.text`
+        (textos fora de NFC são convertidos por `mapas_nfc`).
+
+        Args:
+            sequencias: Pares (termo, palavras normalizadas); `termo`
+                        identifica o termo da busca que gerou a
+                        sequência, e uma frase só conta com as palavras
+                        consecutivas
+            posicoes: Versículos (ordem dos resultados)
+
+        Returns:
+            list: Para cada versículo, trios (início, fim, termo)
+                  ordenados, sem repetição; trechos de termos
+                  diferentes podem se sobrepor
+        """
+        posicoes = np.asarray(posicoes, dtype=np.uint32)
+        resultado: List[Set[Tuple[int, int, int]]] = [set() for _ in posicoes]
+
+        for termo, sequencia in sequencias:
+            if not sequencia:
+                continue
+            por_token = [self._ocorrencias_em(t, posicoes) for t in sequencia]
+            ultimo = len(sequencia) - 1
+
+            for j in range(len(posicoes)):
+                listas = [ocorrencias[j] for ocorrencias in por_token]
+                if any(lista is None for lista in listas):
+                    continue
+
+                if not ultimo:
+                    tamanho = len(sequencia[0])
+                    resultado[j].update(
+                        (d, d + tamanho, termo) for d in listas[0][1].tolist()
+                    )
+                    continue
+
+                mapas = [
+                    dict(zip(ordinais.tolist(), deslocamentos.tolist()))
+                    for ordinais, deslocamentos in listas
+                ]
+                for ordinal, inicio in mapas[0].items():
+                    if all(ordinal + k in mapas[k] for k in range(1, ultimo + 1)):
+                        fim = mapas[ultimo][ordinal + ultimo]
+                        resultado[j].add(
+                            (inicio, fim + len(sequencia[ultimo]), termo)
+                        )
+
+        saida = []
+        for posicao, trechos in zip(posicoes.tolist(), resultado):
+            mapa = self.mapas_nfc.get(posicao)
+            if mapa is not None:
+                trechos = {(mapa[i], mapa[f], t) for i, f, t in trechos}
+            saida.append(sorted(trechos))
+        return saida
+
+    def rowids(self, posicoes: np.ndarray) -> List[int]:
+        """Converte posições do índice em rowids da tabela `verse`."""
+        return self.ids[posicoes].tolist()
+
+
+# ============================================================
+# Cache compartilhado entre sessões
+# ============================================================
+def caminho_do_banco(conexao: sqlite3.Connection) -> Optional[str]:
+    """
+    Descobre o arquivo do banco principal de uma conexão.
+
+    Returns:
+        str | None: Caminho do arquivo ou None para bancos em memória
+    """
+    try:
+        for _, nome, arquivo in conexao.execute("PRAGMA database_list"):
+            if nome == "main":
+                return arquivo or None
+    except sqlite3.Error:
+        pass
+    return None
+
+
+def impressao_digital(caminho: str) -> Tuple[str, int, int]:
+    """
+    Identifica uma versão do arquivo: (caminho absoluto, tamanho, mtime).
+
+    Qualquer alteração ou substituição do .sqlite muda a impressão
+    digital e, portanto, as chaves de cache que a utilizam.
+    """
+    info = os.stat(caminho)
+    return os.path.abspath(caminho), info.st_size, info.st_mtime_ns
+
+
+# Impressões digitais de arquivos cujo índice não pôde ser construído
+_FALHAS_INDICE: set = set()
+_TRAVA_FALHAS = threading.Lock()
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _carregar_indice(
+    caminho: str,
+    tamanho: int,
+    mtime_ns: int,
+) -> IndiceInvertido:
+    """Constrói o índice de um arquivo (tamanho/mtime compõem a chave)."""
+    uri = Path(caminho).as_uri() + "?mode=ro"
+    conexao = sqlite3.connect(uri, uri=True)
+    try:
+        return IndiceInvertido.construir(conexao)
+    finally:
+        conexao.close()
+
+
+def obter_indice(conexao: sqlite3.Connection) -> Optional[IndiceInvertido]:
+    """
+    Retorna o índice em memória da versão ligada à conexão.
+
+    Retorna None (e as buscas seguem pelo FTS5 ou pelo LIKE) quando:
+    - o banco está em memória (sem identidade estável para
+      compartilhar entre sessões)
+    - a versão está em `SEM_INDICE_MEMORIA`
+    - a construção do índice falhou; a falha é registrada no log e
+      não é repetida enquanto o arquivo não mudar
+
+    Args:
+        conexao: Conexão com o banco da versão
+
+    Returns:
+        IndiceInvertido | None: Índice compartilhado ou None
+    """
+    caminho = caminho_do_banco(conexao)
+    if not caminho or not os.path.exists(caminho):
+        return None
+    if not indice_em_memoria_ativo(caminho):
+        return None
+
+    digital = impressao_digital(caminho)
+    if digital in _FALHAS_INDICE:
+        return None
+    try:
+        return _carregar_indice(*digital)
+    except (sqlite3.Error, MemoryError) as e:
+        log_erro("obter_indice", e, detalhes=f"caminho={caminho}")
+        with _TRAVA_FALHAS:
+            _FALHAS_INDICE.add(digital)
+        return None
+
+
+def indice_em_memoria_ativo(caminho: str) -> bool:
+    """
+    Indica se a versão do arquivo usa o índice em memória.
+
+    Args:
+        caminho: Caminho do arquivo .sqlite
+
+    Returns:
+        bool: False se a versão (ou "*") estiver em `SEM_INDICE_MEMORIA`
+    """
+    if "*" in SEM_INDICE_MEMORIA:
+        return False
+    return Path(caminho).stem.upper() not in SEM_INDICE_MEMORIA
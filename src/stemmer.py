@@ -0,0 +1,314 @@
+"""
+Módulo de Radicalização (Stemming) em Português.
+
+Implementa uma versão compacta do RSLP (Removedor de Sufixos da
+Língua Portuguesa, Orengo & Huyck, 2001), que reduz palavras ao seu
+radical aplicando, em ordem, regras de sufixo:
+
+1. Plural          (corações → coração)
+2. Feminino        (amada → amado)
+3. Aumentativo/diminutivo (filhinho → filh)
+4. Advérbio        (fielmente → fiel)
+5. Substantivo     (julgamento → julg)
+6. Verbo, se o passo 5 não removeu nada (amou → am)
+7. Vogal temática, se nem 5 nem 6 removeram nada (livro → livr)
+
+Cada regra tem o tamanho mínimo do radical que sobra e exceções.
+As exceções do RSLP foram completadas com palavras frequentes no
+texto bíblico que as regras reduziriam demais ("amor" não é "am",
+de amar; "coração" não é "cor").
+As regras trabalham sobre o texto já normalizado (sem acentos e
+em minúsculas, ver `text_utils.normalizar_texto`), o mesmo usado
+pelo índice de busca.
+
+O radical é calculado uma vez por palavra do vocabulário, na
+construção do índice; nas consultas só o termo digitado é reduzido.
+
+Autor: Edson Deveza
+Data: 2025
+Versão: 2.1
+Compatível: Python 3.12
+"""
+
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+
+# (sufixo, tamanho mínimo do radical, substituição, exceções)
+Regra = Tuple[str, int, str, FrozenSet[str]]
+
+
+def _regras(*regras) -> List[Regra]:
+    """Normaliza a tabela de regras e ordena do sufixo mais longo ao menor."""
+    tabela = []
+    for regra in regras:
+        sufixo, minimo = regra[0], regra[1]
+        substituicao = regra[2] if len(regra) > 2 else ""
+        excecoes = frozenset(regra[3]) if len(regra) > 3 else frozenset()
+        tabela.append((sufixo, minimo, substituicao, excecoes))
+    return sorted(tabela, key=lambda r: len(r[0]), reverse=True)
+
+
+# ============================================================
+# Tabelas de regras
+# ============================================================
+_PLURAL = _regras(
+    ("ns", 1, "m"),
+    ("oes", 3, "ao"),
+    ("aes", 1, "ao", ["maes"]),
+    ("ais", 1, "al", ["cais", "mais"]),
+    ("eis", 2, "el"),
+    ("ois", 2, "ol"),
+    ("is", 2, "il", ["lapis", "cais", "mais", "crucis", "biquinis",
+                     "pois", "depois", "dois", "leis", "reis"]),
+    ("les", 3, "l"),
+    ("res", 3, "r", ["arvores"]),
+    ("s", 2, "", ["alias", "pires", "lapis", "cais", "mais", "mas",
+                  "menos", "ferias", "fezes", "pesames", "crucis", "gas",
+                  "atras", "moises", "atraves", "convez", "pais", "apos",
+                  "ambas", "ambos", "messias", "depois", "deus", "jesus",
+                  "judas", "lucas", "tomas", "elias", "zacarias", "jonas",
+                  "barrabas", "tres", "seis", "vos", "nos", "pois"]),
+)
+
+_FEMININO = _regras(
+    ("ona", 3, "ao", ["abandona", "lona", "iona", "cortisona",
+                      "monotona", "maratona", "acetona", "detona",
+                      "carona"]),
+    ("ora", 3, "or"),
+    ("na", 4, "no", ["carona", "abandona", "lona", "iona", "cortisona",
+                     "monotona", "maratona", "acetona", "detona", "guiana",
+                     "campana", "grana", "caravana", "banana", "paisana"]),
+    ("inha", 3, "inho", ["rainha", "linha", "minha"]),
+    ("esa", 3, "es", ["mesa", "obesa", "princesa", "turquesa", "ilesa",
+                      "pesa", "presa"]),
+    ("osa", 3, "oso", ["mucosa", "prosa"]),
+    ("iaca", 3, "iaco"),
+    ("ica", 3, "ico", ["dica"]),
+    ("ada", 2, "ado", ["pitada"]),
+    ("ida", 3, "ido", ["vida"]),
+    ("ima", 3, "imo", ["vitima"]),
+    ("iva", 3, "ivo", ["saliva", "oliva"]),
+    ("eira", 3, "eiro", ["beira", "cadeira", "frigideira", "bandeira",
+                         "feira", "capoeira", "barreira", "fronteira",
+                         "besteira", "poeira"]),
+)
+
+_AUMENTATIVO = _regras(
+    ("dissimo", 5),
+    ("abilissimo", 5),
+    ("issimo", 3),
+    ("esimo", 3),
+    ("errimo", 4),
+    ("zinho", 2),
+    ("quinho", 4, "c"),
+    ("uinho", 4),
+    ("adinho", 3),
+    ("inho", 3, "", ["caminho", "cominho"]),
+    ("alhao", 4),
+    ("uca", 4),
+    ("aco", 4, "", ["antebraco"]),
+    ("adao", 4),
+    ("zao", 2),
+    ("arraz", 4),
+    ("arra", 3),
+    ("zarrao", 3),
+    ("aza", 3),
+)
+
+_ADVERBIO = _regras(
+    ("mente", 4, "", ["experimente"]),
+)
+
+_SUBSTANTIVO = _regras(
+    ("encialista", 4),
+    ("alista", 5),
+    ("agem", 3, "", ["coragem", "chantagem", "vantagem", "carruagem"]),
+    ("iamento", 4),
+    ("amento", 3, "", ["firmamento", "fundamento", "departamento"]),
+    ("imento", 3),
+    ("mento", 6, "", ["firmamento", "elemento", "complemento",
+                      "instrumento", "departamento"]),
+    ("alizado", 4),
+    ("atizado", 4),
+    ("tizado", 4, "", ["alfabetizado"]),
+    ("izado", 5, "", ["organizado", "pulverizado"]),
+    ("ativo", 4, "", ["pejorativo", "relativo"]),
+    ("tivo", 4, "", ["relativo"]),
+    ("ivo", 4, "", ["passivo", "possessivo", "pejorativo", "positivo"]),
+    ("ado", 2, "", ["grado"]),
+    ("ido", 3, "", ["candido", "consolido", "rapido", "decido", "timido",
+                    "duvido", "marido"]),
+    ("ador", 3),
+    ("edor", 3),
+    ("idor", 4, "", ["ouvidor"]),
+    ("dor", 4, "", ["ouvidor"]),
+    ("sor", 4, "", ["assessor"]),
+    ("atoria", 5),
+    ("tor", 3, "", ["benfeitor", "leitor", "editor", "pastor", "produtor",
+                    "promotor", "consultor"]),
+    ("or", 2, "", ["motor", "melhor", "redor", "rigor", "sensor", "tambor",
+                   "tumor", "assessor", "benfeitor", "senhor", "maior",
+                   "menor", "pior", "interior", "exterior", "superior",
+                   "inferior", "anterior", "posterior", "temor", "clamor",
+                   "amor", "favor", "valor", "calor", "furor", "vigor",
+                   "terror", "odor", "suor"]),
+    ("abilidade", 5),
+    ("icionista", 4),
+    ("cionista", 5),
+    ("ionista", 5),
+    ("ionar", 5),
+    ("ional", 4),
+    ("encia", 3),
+    ("ancia", 4, "", ["ambulancia"]),
+    ("edouro", 3),
+    ("queiro", 3, "c"),
+    ("adeiro", 4, "", ["desfiladeiro"]),
+    ("eiro", 3, "", ["desfiladeiro", "pioneiro", "mosteiro"]),
+    ("uoso", 3),
+    ("oso", 3, "", ["precioso"]),
+    ("alizacao", 5),
+    ("atizacao", 5),
+    ("izacao", 5),
+    ("acao", 3, "", ["equacao", "coracao"]),
+    ("icao", 3, "", ["eleicao"]),
+    ("ismo", 3, "", ["cinismo"]),
+    ("ario", 3, "", ["voluntario", "salario", "aniversario", "diario",
+                     "lionario", "armario"]),
+    ("atorio", 3),
+    ("rio", 5, "", ["voluntario", "salario", "aniversario", "diario",
+                    "compulsorio", "lionario", "proprio", "stereo",
+                    "armario"]),
+    ("erio", 6),
+    ("eza", 3),
+    ("ez", 4),
+    ("esco", 4),
+    ("ante", 2, "", ["gigante", "elefante", "adiante", "possante",
+                     "instante", "restaurante"]),
+    ("astico", 4, "", ["eclesiastico"]),
+    ("alistico", 3),
+    ("aceutico", 4),
+    ("eutico", 4),
+    ("atico", 3),
+    ("tico", 3, "", ["politico", "eclesiastico", "diagnostico", "pratico",
+                     "domestico", "identico", "alopatico", "artistico",
+                     "autentico", "ecletico", "critico"]),
+    ("ico", 4, "", ["tico", "publico", "explico"]),
+    ("ividade", 5),
+    ("idade", 4, "", ["autoridade", "comunidade"]),
+    ("oria", 4, "", ["categoria"]),
+    ("encial", 5),
+    ("ista", 4),
+    ("auta", 5),
+    ("quice", 4, "c"),
+    ("ice", 4, "", ["cumplice"]),
+    ("iaco", 3),
+    ("ente", 4, "", ["frequente", "alimente", "acrescente", "permanente",
+                     "oriente", "aparente"]),
+    ("ense", 5),
+    ("inal", 3),
+    ("ano", 4),
+    ("avel", 2, "", ["afavel", "razoavel", "potavel", "vulneravel"]),
+    ("ivel", 3, "", ["possivel"]),
+    ("vel", 5, "", ["possivel", "vulneravel", "potavel", "inflavel"]),
+    ("bil", 3, "vel"),
+    ("ura", 4, "", ["imatura", "acupuntura", "costura"]),
+    ("ural", 4),
+    ("ual", 3, "", ["bissexual", "virtual", "visual", "pontual"]),
+    ("ial", 3),
+    ("al", 4, "", ["afinal", "animal", "estatal", "bissexual", "desleal",
+                   "fiscal", "formal", "pessoal", "liberal", "postal",
+                   "virtual", "visual", "pontual", "sideral", "sucursal"]),
+    ("alismo", 4),
+    ("ivismo", 4),
+)
+
+_VERBO = _regras(
+    ("ariamo", 2), ("eriamo", 2), ("iriamo", 3),
+    ("assemo", 2), ("essemo", 2), ("issemo", 3),
+    ("ariamos", 2), ("eriamos", 2), ("iriamos", 3),
+    ("assemos", 2), ("essemos", 2), ("issemos", 3),
+    ("aramos", 2), ("eramos", 2), ("iramos", 3),
+    ("avamos", 2), ("aremos", 2), ("eremos", 2), ("iremos", 3),
+    ("ariam", 2), ("eriam", 2), ("iriam", 3),
+    ("assem", 2), ("essem", 2), ("issem", 3),
+    ("arias", 2), ("erias", 2), ("irias", 3),
+    ("ardes", 2), ("erdes", 2), ("irdes", 2),
+    ("asses", 2), ("esses", 2), ("isses", 3),
+    ("astes", 2), ("estes", 2), ("istes", 3),
+    ("areis", 2), ("ereis", 2), ("ireis", 3),
+    ("aveis", 2), ("iamos", 3), ("armos", 2), ("ermos", 2), ("irmos", 3),
+    ("aria", 2), ("eria", 2), ("iria", 3),
+    ("asse", 2), ("esse", 2), ("isse", 3),
+    ("aste", 2), ("este", 2, "", ["peste"]), ("iste", 4),
+    ("arei", 2), ("erei", 2), ("irei", 3),
+    ("aram", 2), ("eram", 2), ("iram", 3),
+    ("avam", 2), ("arem", 2), ("erem", 2), ("irem", 3),
+    ("ando", 2), ("endo", 3), ("indo", 3), ("ondo", 3),
+    ("arao", 2), ("erao", 2), ("irao", 3),
+    ("adas", 2), ("idas", 3), ("aras", 2), ("eras", 2), ("iras", 3),
+    ("avas", 2), ("ares", 2), ("eres", 2), ("ires", 3),
+    ("ados", 2), ("idos", 3), ("amos", 2), ("emos", 2), ("imos", 3),
+    ("ieis", 3), ("ada", 2), ("ida", 3), ("ara", 2), ("era", 2),
+    ("ira", 3, "", ["ira"]), ("ava", 2), ("iam", 3), ("ado", 2),
+    ("ido", 3), ("ias", 3), ("ais", 2), ("eis", 3),
+    ("ia", 3), ("ei", 3), ("am", 2), ("em", 2), ("ar", 2), ("er", 2),
+    ("ir", 3), ("as", 2), ("es", 2), ("is", 2), ("eu", 3), ("iu", 3),
+    ("ou", 2),
+)
+
+_VOGAL = _regras(
+    ("a", 3),
+    ("e", 3),
+    ("o", 3),
+)
+
+
+# ============================================================
+# Aplicação das regras
+# ============================================================
+def _aplicar(palavra: str, regras: List[Regra]) -> str:
+    """Aplica a primeira regra (sufixo mais longo) que casar; ou nada."""
+    for sufixo, minimo, substituicao, excecoes in regras:
+        if (
+            palavra.endswith(sufixo)
+            and len(palavra) - len(sufixo) >= minimo
+            and palavra not in excecoes
+        ):
+            return palavra[: -len(sufixo)] + substituicao
+    return palavra
+
+
+@lru_cache(maxsize=65536)
+def radical(palavra: str) -> str:
+    """
+    Reduz uma palavra normalizada ao seu radical (RSLP).
+
+    Exemplo:
+        >>> [radical(p) for p in ["amar", "amou", "amara", "amando"]]
+        ['am', 'am', 'am', 'am']
+
+    Args:
+        palavra: Palavra já normalizada (sem acentos, minúsculas)
+
+    Returns:
+        str: Radical da palavra
+    """
+    if len(palavra) < 3:
+        return palavra
+
+    if palavra.endswith("s"):
+        palavra = _aplicar(palavra, _PLURAL)
+    if palavra.endswith("a"):
+        palavra = _aplicar(palavra, _FEMININO)
+    palavra = _aplicar(palavra, _AUMENTATIVO)
+    palavra = _aplicar(palavra, _ADVERBIO)
+
+    sem_substantivo = _aplicar(palavra, _SUBSTANTIVO)
+    if sem_substantivo != palavra:
+        return sem_substantivo
+
+    sem_verbo = _aplicar(palavra, _VERBO)
+    if sem_verbo != palavra:
+        return sem_verbo
+
+    return _aplicar(palavra, _VOGAL)
@@ -0,0 +1,187 @@
+"""
+Utilitários de Texto.
+
+Normalização e tokenização compartilhadas pelo índice de busca
+em memória, pelo otimizador e pelas consultas, garantindo que o
+texto indexado e o termo digitado passem pelas mesmas regras.
+
+A normalização remove acentos e converte para minúsculas
+("Fé" → "fe", "Coração" → "coracao") preservando o comprimento
+do texto em NFC, de modo que posições calculadas no texto
+normalizado valem também para o texto original em NFC (e são
+convertidas por `mapa_nfc` quando o original não está em NFC).
+
+Autor: Edson Deveza
+Data: 2025
+Versão: 2.1
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# Palavra = sequência de letras/dígitos (Unicode), como o \b do regex
+_RE_TOKEN = re.compile(r"\w+")
+
+
+def _montar_tabela_dobra() -> Dict[int, str]:
+    """
+    Monta a tabela de `str.translate` que troca cada letra acentuada
+    latina pela letra base (á → a, Ç → C, õ → o, ...).
+    """
+    tabela: Dict[int, str] = {}
+    faixas = [range(0x00C0, 0x0250), range(0x1E00, 0x1F00)]
+    for faixa in faixas:
+        for codigo in faixa:
+            decomposto = unicodedata.normalize("NFD", chr(codigo))
+            base = decomposto[0]
+            if len(decomposto) > 1 and base.isascii() and all(
+                unicodedata.combining(c) for c in decomposto[1:]
+            ):
+                tabela[codigo] = base
+    return tabela
+
+
+_TABELA_DOBRA = _montar_tabela_dobra()
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza um texto para comparação: sem acentos e em minúsculas.
+
+    O texto é levado antes a NFC, e o resultado tem o mesmo
+    comprimento de `texto_nfc(texto)`, caractere a caractere. Para
+    textos já em NFC as posições valem também para o original; para
+    os demais, `mapa_nfc` faz a conversão.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        str: Texto normalizado
+    """
+    return texto_nfc(texto).translate(_TABELA_DOBRA).lower()
+
+
+def texto_nfc(texto: str) -> str:
+    """
+    Forma NFC (acentos compostos) do texto.
+
+    Em NFD "é" ocupa dois caracteres ("e" + acento); em NFC, um só.
+    Posições calculadas no texto normalizado valem para a forma NFC.
+    """
+    if unicodedata.is_normalized("NFC", texto):
+        return texto
+    return unicodedata.normalize("NFC", texto)
+
+
+def mapa_nfc(texto: str) -> Optional[List[int]]:
+    """
+    Posição no texto original de cada posição da forma NFC.
+
+    Offsets calculados no texto normalizado (que tem o comprimento
+    da forma NFC) são convertidos com `mapa[offset]` para o texto
+    como está gravado. O mapa tem uma entrada a mais, para o fim.
+
+    Cada letra base com os seus acentos (NFD) vira um bloco; os
+    caracteres NFC do bloco apontam para o início dele.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        list | None: Posições no original, ou None se o texto já
+                     está em NFC (as posições coincidem)
+    """
+    if unicodedata.is_normalized("NFC", texto):
+        return None
+
+    mapa: List[int] = []
+    inicio = 0
+    for fim in range(1, len(texto) + 1):
+        if fim < len(texto) and unicodedata.combining(texto[fim]):
+            continue
+        composto = unicodedata.normalize("NFC", texto[inicio:fim])
+        mapa.extend(min(inicio + k, fim - 1) for k in range(len(composto)))
+        inicio = fim
+    mapa.append(len(texto))
+    return mapa
+
+
+def tokenizar(texto: str, normalizado: bool = False) -> List[str]:
+    """
+    Quebra um texto em palavras normalizadas.
+
+    Args:
+        texto: Texto original (versículo ou termo de busca)
+        normalizado: True se o texto já passou por `normalizar_texto`
+                     (ex.: coluna pré-calculada pelo otimizador)
+
+    Returns:
+        list: Palavras normalizadas, na ordem em que aparecem
+    """
+    if not normalizado:
+        texto = normalizar_texto(texto)
+    return _RE_TOKEN.findall(texto)
+
+
+def tokenizar_com_posicoes(
+    texto: str,
+    normalizado: bool = False,
+) -> List[Tuple[str, int, int]]:
+    """
+    Quebra um texto em palavras normalizadas com suas posições.
+
+    Args:
+        texto: Texto original (ou já normalizado, ver `normalizado`)
+        normalizado: True se o texto já passou por `normalizar_texto`
+
+    Returns:
+        list: Tuplas (palavra, início, fim) com offsets de caractere,
+              válidos também no texto original (normalização preserva
+              o comprimento)
+    """
+    if not normalizado:
+        texto = normalizar_texto(texto)
+    return [(m.group(), m.start(), m.end()) for m in _RE_TOKEN.finditer(texto)]
+
+
+# ============================================================
+# Curingas (* = qualquer sequência de letras, ? = uma letra)
+# ============================================================
+def tem_curinga(termo: str) -> bool:
+    """Indica se o termo é uma palavra única com curinga (`*` ou `?`)."""
+    termo = termo.strip()
+    return bool(termo) and not any(c.isspace() for c in termo) and (
+        "*" in termo or "?" in termo
+    )
+
+
+def prefixo_curinga(termo: str) -> str:
+    """Parte literal (normalizada) antes do primeiro curinga."""
+    return re.split(r"[*?]", normalizar_texto(termo.strip()), maxsplit=1)[0]
+
+
+def eh_prefixo(termo: str) -> bool:
+    """True para curingas do tipo `salv*` (só um `*` no final)."""
+    termo = termo.strip()
+    return tem_curinga(termo) and termo.endswith("*") and not tem_curinga(
+        termo[:-1]
+    )
+
+
+def regex_curinga(termo: str) -> str:
+    """
+    Converte um curinga em expressão regular sobre texto normalizado.
+
+    Exemplo: "salv*" → "salv\\w*"; "ama?" → "ama\\w"
+    """
+    partes = []
+    for caractere in normalizar_texto(termo.strip()):
+        if caractere == "*":
+            partes.append(r"\w*")
+        elif caractere == "?":
+            partes.append(r"\w")
+        else:
+            partes.append(re.escape(caractere))
+    return "".join(partes)
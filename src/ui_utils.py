@@ -97,3 +97,33 @@ def garantir_versao_selecionada() -> Path:
 
     # Neste ponto, já temos estado consistente
     return caminho_escolhido
+
+
+def seletor_completar(sugestoes: list[str], chave_campo: str, chave: str) -> None:
+    """
+    Caixa "Completar" ao lado de um campo de busca.
+
+    Mostra as sugestões para o texto atual do campo (ver
+    `database.autocompletar`); escolher uma substitui o texto do campo.
+
+    Args:
+        sugestoes: Textos completos sugeridos para o texto atual
+        chave_campo: Chave (session_state) do campo de texto
+        chave: Chave da caixa de seleção
+    """
+    vazio = "—"
+
+    def aplicar() -> None:
+        escolhida = st.session_state[chave]
+        if escolhida != vazio:
+            st.session_state[chave_campo] = escolhida
+            st.session_state[chave] = vazio
+
+    st.selectbox(
+        "Completar",
+        [vazio] + sugestoes,
+        key=chave,
+        on_change=aplicar,
+        disabled=not sugestoes,
+        help="Palavras da versão que começam com o que foi digitado.",
+    )
@@ -8,9 +8,16 @@ Autor: Edson Deveza
 Data: 2024
 """
 
+import html
+import os
 import sqlite3
+import threading
+import time
+import unicodedata
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pytest
 
 from src.database import (
@@ -19,19 +26,53 @@ from src.database import (
     carregar_todos_livros,
     carregar_capitulos,
     carregar_versiculos,
+    buscar_referencia,
     buscar_versiculos,
     buscar_versiculos_avancada,
+    sugerir_termos,
+    autocompletar,
+    buscar_em_todas_versoes,
+    buscar_lote,
+    buscar_versiculos_paginado,
+    buscar_versiculos_avancada_paginado,
+    codificar_cursor,
+    decodificar_cursor,
+    iterar_paginas,
+    comparar_capitulo,
     comparar_versoes,
+    estatisticas_livros,
     obter_info_livro,
 )
+import src.database as database
+from src.error_handler import validate_search_input
+from src.export import destacar_texto
+from src.matcher import LocalizadorTermos, localizar_trechos
+from src.optimize import (
+    compilar_corpus,
+    criar_indice_fts,
+    criar_indices,
+    criar_texto_normalizado,
+    otimizar_todos_bancos,
+    verificar_indices_existentes,
+)
+from src.cache_resultados import CACHE_RESULTADOS, CacheResultados
+from src.conexoes import PoolConexoes
+from src.corpus import Corpus, abrir_corpus, caminho_corpus, obter_corpus
+import src.corpus as corpus_mod
+from src.referencias import interpretar_referencia
+import src.search_index as search_index
+from src.search_index import IndiceInvertido, obter_indice
+import src.stemmer as stemmer
+from src.stemmer import radical
+from src.text_utils import normalizar_texto
 
 
-def criar_banco_teste() -> sqlite3.Connection:
+def criar_banco_teste(caminho: str = ":memory:") -> sqlite3.Connection:
     """
-    Cria um banco de dados em memória com dados mínimos
+    Cria um banco de dados (em memória por padrão) com dados mínimos
     para os testes.
     """
-    conn = sqlite3.connect(":memory:")
+    conn = sqlite3.connect(caminho)
     cur = conn.cursor()
 
     cur.executescript(
@@ -98,6 +139,49 @@ def conexao():
         conn.close()
 
 
+@pytest.fixture
+def caminho_banco(tmp_path):
+    """Banco de teste gravado em arquivo (necessário para o otimizador)."""
+    caminho = str(tmp_path / "TESTE.sqlite")
+    criar_banco_teste(caminho).close()
+    return caminho
+
+
+@pytest.fixture
+def conexao_arquivo(caminho_banco):
+    conn = sqlite3.connect(caminho_banco)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def conexao_fts(tmp_path, monkeypatch):
+    # Arquivo próprio, sem índice em memória, para exercitar o FTS5
+    caminho = str(tmp_path / "TESTE_FTS.sqlite")
+    criar_banco_teste(caminho).close()
+    assert criar_indices(caminho)
+    conn = sqlite3.connect(caminho)
+
+    # Versão configurada sem índice em memória (BIBLIA_SEM_INDICE_MEMORIA)
+    monkeypatch.setattr(
+        search_index, "SEM_INDICE_MEMORIA", frozenset({"TESTE_FTS"})
+    )
+    assert obter_indice(conn) is None
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@pytest.fixture(autouse=True)
+def cache_resultados_vazio():
+    CACHE_RESULTADOS.limpar()
+    yield
+    CACHE_RESULTADOS.limpar()
+
+
 def test_carregar_testamentos(conexao):
     df = carregar_testamentos(conexao)
     assert not df.empty
@@ -119,6 +203,109 @@ def test_carregar_todos_livros(conexao):
     assert set(df["name"]) == {"Gênesis", "João"}
 
 
+def test_corpus_igual_ao_banco(conexao, conexao_arquivo):
+    corpus = Corpus.construir(conexao)
+    assert len(corpus) == 4
+    assert corpus.livros.dtype == np.uint8
+    assert corpus.versiculos.dtype == np.uint16
+    assert corpus.faixa_capitulo(2, 3) == (2, 4)
+    assert corpus.faixa_capitulo(2, 9) == (0, 0)
+    assert corpus.texto_versiculo(1) == "A terra era sem forma e vazia."
+
+    tabela = corpus.tabela(np.array([3, 0]))
+    assert tabela["Livro"].tolist() == ["João", "Gênesis"]
+    assert tabela["Versículo"].tolist() == [17, 1]
+    assert corpus.tabela(np.array([3, 0]), "arrow").to_pandas().equals(tabela)
+
+    # Leituras do corpus (arquivo) iguais às do SQL (memória)
+    assert obter_corpus(conexao) is None
+    assert obter_corpus(conexao_arquivo) is obter_corpus(conexao_arquivo)
+    for formato in ("pandas", "arrow"):
+        esperado = carregar_versiculos(conexao, 2, 3, formato=formato)
+        obtido = carregar_versiculos(conexao_arquivo, 2, 3, formato=formato)
+        assert obtido.equals(esperado)
+
+    pd.testing.assert_frame_equal(
+        estatisticas_livros(conexao_arquivo),
+        estatisticas_livros(conexao),
+    )
+    assert estatisticas_livros(conexao)["Versículos"].tolist() == [2, 2]
+
+
+def test_corpus_compilado_aberto_com_memmap(caminho_banco, monkeypatch):
+    pasta = os.path.dirname(caminho_banco)
+    assert otimizar_todos_bancos(pasta) == {"TESTE.sqlite": "✅ Otimizado"}
+    binario = caminho_corpus(caminho_banco)
+    assert binario.endswith("TESTE.corpus")
+
+    info = os.stat(caminho_banco)
+    origem = (info.st_size, info.st_mtime_ns)
+    corpus = abrir_corpus(binario, origem=origem)
+    assert isinstance(corpus.texto, np.memmap)
+    conn = sqlite3.connect(caminho_banco)
+    try:
+        montado = Corpus.construir(conn)
+        for nome in ("ids", "livros", "capitulos", "versiculos", "texto"):
+            assert np.array_equal(getattr(corpus, nome), getattr(montado, nome))
+        assert corpus.nomes_livros == montado.nomes_livros
+        assert corpus.capitulo(2, 3).equals(montado.capitulo(2, 3))
+
+        # A busca usa o corpus mapeado do arquivo
+        assert isinstance(obter_corpus(conn).texto, np.memmap)
+        df = buscar_versiculos(conn, "mundo")
+        assert df["Versículo"].tolist() == [16, 17]
+    finally:
+        conn.close()
+
+    with pytest.raises(ValueError):
+        abrir_corpus(binario, origem=(info.st_size, info.st_mtime_ns + 1))
+
+    # Arquivo já conferido (gravado por este processo): o CRC não é
+    # recalculado a cada abertura
+    with monkeypatch.context() as m:
+        m.setattr(corpus_mod.zlib, "crc32", None)
+        abrir_corpus(binario, origem=origem)
+
+    # Byte alterado: checksum recusa o arquivo
+    dados = bytearray(open(binario, "rb").read())
+    dados[-1] ^= 0xFF
+    with open(binario, "wb") as arquivo:
+        arquivo.write(dados)
+    with pytest.raises(ValueError):
+        abrir_corpus(binario)
+    assert compilar_corpus(caminho_banco)
+    corpus = abrir_corpus(binario, origem=origem)
+    assert corpus.capitulo(1, 1)["Versículo"].tolist() == [1, 2]
+
+
+def test_listas_em_cache_separadas_por_versao(tmp_path):
+    caminhos = {}
+    for sigla, nome in (("ACF", "Gênesis"), ("NVI", "Genesis")):
+        caminhos[sigla] = str(tmp_path / f"{sigla}.sqlite")
+        conn = criar_banco_teste(caminhos[sigla])
+        conn.execute("UPDATE book SET name = ? WHERE id = 1", (nome,))
+        conn.commit()
+        conn.close()
+
+    for sigla, nome in (("ACF", "Gênesis"), ("NVI", "Genesis")):
+        conn = database.obter_conexao(caminhos[sigla])
+        assert carregar_todos_livros(conn)["name"].iloc[0] == nome
+        assert carregar_livros_testamento(conn, 1)["name"].tolist() == [nome]
+        assert carregar_capitulos(conn, 1)["chapter"].tolist() == [1]
+
+    # Arquivo alterado muda a impressão digital e a chave do cache
+    conn = sqlite3.connect(caminhos["ACF"])
+    conn.execute("INSERT INTO verse (book_id, chapter, verse, text) "
+                 "VALUES (1, 2, 1, 'Assim os céus e a terra foram acabados.')")
+    conn.commit()
+    conn.close()
+    info = os.stat(caminhos["ACF"])
+    os.utime(caminhos["ACF"], ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+    conn = database.obter_conexao(caminhos["ACF"])
+    assert carregar_capitulos(conn, 1)["chapter"].tolist() == [1, 2]
+    database.POOL_CONEXOES.fechar()
+
+
 def test_carregar_versiculos(conexao):
     df = carregar_versiculos(conexao, livro_id=2, capitulo=3)
     assert len(df) == 2
@@ -184,9 +371,851 @@ def test_comparar_versoes(conexao):
     assert df["Versículo"].iloc[0] == 16
 
 
+def test_comparar_capitulo_com_attach_em_lotes(tmp_path):
+    # Mais versões que o limite padrão de bancos anexados (10): dois lotes
+    bancos = {}
+    for i in range(12):
+        caminho = str(tmp_path / f"V{i}.sqlite")
+        conn = criar_banco_teste(caminho)
+        conn.execute(
+            "UPDATE verse SET text = ? WHERE verse = 16", (f"Texto V{i}",)
+        )
+        if i == 3:
+            conn.execute("DELETE FROM verse WHERE verse = 17")
+        conn.commit()
+        conn.close()
+        bancos[f"V{i}"] = caminho
+
+    df = comparar_capitulo(bancos, 2, 3)
+    assert df.columns.tolist() == ["Versículo"] + list(bancos)
+    assert df["Versículo"].tolist() == [16, 17]
+    assert df.iloc[0, 1:].tolist() == [f"Texto V{i}" for i in range(12)]
+    assert pd.isna(df.loc[1, "V3"]) and df.loc[1, "V11"].startswith("Porque")
+
+    df = comparar_capitulo(bancos, 2, 3, versiculo=17)
+    assert df["Versículo"].tolist() == [17]
+
+    conexoes = {v: sqlite3.connect(c) for v, c in list(bancos.items())[:2]}
+    try:
+        df = comparar_versoes(conexoes, 2, 3, 16)
+        assert df.columns.tolist() == ["Versículo", "V0", "V1"]
+        assert df.iloc[0, 1:].tolist() == ["Texto V0", "Texto V1"]
+    finally:
+        for conn in conexoes.values():
+            conn.close()
+
+
 def test_obter_info_livro(conexao):
     info = obter_info_livro(conexao, livro_id=2)
     assert info["nome"] == "João"
     assert info["testamento"] == "Novo Testamento"
     assert info["total_capitulos"] >= 1
     assert info["total_versiculos"] >= 2
+
+
+def test_criar_indices_cria_fts(caminho_banco):
+    assert criar_indices(caminho_banco)
+    # Rodar de novo não deve falhar (índice já existente é só otimizado)
+    assert criar_indices(caminho_banco)
+    assert verificar_indices_existentes(caminho_banco)["verse_fts"] is True
+
+
+def test_buscar_versiculos_fts_igual_ao_fallback(conexao, conexao_fts):
+    for termo in ["amou", "Deus", "terra"]:
+        df_like = buscar_versiculos(conexao, termo=termo)
+        df_fts = buscar_versiculos(conexao_fts, termo=termo)
+        assert sorted(df_fts["Texto"]) == sorted(df_like["Texto"])
+
+    # Palavra inteira: "mund" não deve casar com "mundo"
+    assert buscar_versiculos(conexao_fts, termo="mund").empty
+
+
+def test_falha_do_indice_em_memoria_cai_no_fts(tmp_path, monkeypatch):
+    caminho = str(tmp_path / "FALHA.sqlite")
+    criar_banco_teste(caminho).close()
+    assert criar_indices(caminho)
+
+    def sem_memoria(conexao):
+        raise MemoryError
+
+    monkeypatch.setattr(IndiceInvertido, "construir", sem_memoria)
+    conn = sqlite3.connect(caminho)
+    try:
+        assert obter_indice(conn) is None
+        df = buscar_versiculos(conn, termo="Deus amou")
+        assert df["Versículo"].tolist() == [16]
+    finally:
+        conn.close()
+
+
+def test_buscar_versiculos_fts_frase_e_testamento(conexao_fts):
+    df = buscar_versiculos(conexao_fts, termo="Deus amou")
+    assert list(df["Versículo"]) == [16]
+
+    df_vt = buscar_versiculos(conexao_fts, termo="Deus", testamento_id=1)
+    assert set(df_vt["Livro"]) == {"Gênesis"}
+
+
+def test_fts_sincronizado_por_triggers(conexao_fts):
+    conexao_fts.execute(
+        "INSERT INTO verse (book_id, chapter, verse, text) "
+        "VALUES (2, 3, 18, 'Quem crê nele não é condenado.')"
+    )
+    conexao_fts.commit()
+    df = buscar_versiculos(conexao_fts, termo="condenado")
+    assert list(df["Versículo"]) == [18]
+
+
+def test_buscar_versiculos_avancada_fts(conexao_fts):
+    df_and = buscar_versiculos_avancada(conexao_fts, ["Deus", "mundo"], "E")
+    assert set(df_and["Versículo"]) == {16, 17}
+
+    df_or = buscar_versiculos_avancada(conexao_fts, ["amou", "vazia"], "OU")
+    assert set(df_or["Versículo"]) == {16, 2}
+
+    df_exata = buscar_versiculos_avancada(
+        conexao_fts, ["seu Filho"], busca_exata=True
+    )
+    assert list(df_exata["Versículo"]) == [17]
+
+
+def test_indice_invertido_posting_lists(conexao):
+    indice = IndiceInvertido.construir(conexao)
+    assert len(indice) == 4
+    # Ordem canônica: Gn 1:1, Gn 1:2, Jo 3:16, Jo 3:17
+    assert indice.posting("deus").tolist() == [0, 2, 3]
+    assert indice.posting("inexistente").tolist() == []
+    assert indice.todos(["deus", "mundo"]).tolist() == [2, 3]
+    assert indice.algum(["vazia", "amou"]).tolist() == [1, 2]
+    assert indice.filtrar(indice.posting("deus"), testamento_id=1).tolist() == [0]
+
+
+def test_obter_indice_compartilhado_por_arquivo(conexao, conexao_arquivo):
+    # Banco em memória não tem arquivo: segue pelo caminho SQL
+    assert obter_indice(conexao) is None
+
+    indice = obter_indice(conexao_arquivo)
+    assert indice is not None
+    assert obter_indice(conexao_arquivo) is indice
+
+
+def test_buscas_indice_iguais_ao_fallback(conexao, conexao_arquivo):
+    for termo in ["amou", "Deus", "mund", "Deus amou", "seu filho"]:
+        df_like = buscar_versiculos(conexao, termo=termo)
+        df_indice = buscar_versiculos(conexao_arquivo, termo=termo)
+        assert list(df_indice.columns) == ["Livro", "Capítulo", "Versículo", "Texto"]
+        assert sorted(df_indice["Texto"]) == sorted(df_like["Texto"])
+
+    for termos, operador in [(["Deus", "mundo"], "E"), (["amou", "vazia"], "OU")]:
+        df_like = buscar_versiculos_avancada(conexao, termos, operador)
+        df_indice = buscar_versiculos_avancada(conexao_arquivo, termos, operador)
+        assert sorted(df_indice["Texto"]) == sorted(df_like["Texto"])
+
+    df = buscar_versiculos_avancada(conexao_arquivo, ["Deus"], livro_id=1)
+    assert list(df["Versículo"]) == [1]
+
+
+def test_busca_ignora_acentos_e_maiusculas(conexao_arquivo, conexao_fts):
+    for conn in (conexao_arquivo, conexao_fts):
+        df = buscar_versiculos(conn, termo="CEUS")
+        assert list(df["Versículo"]) == [1]
+        # Apenas o texto original é exibido
+        assert "céus" in df["Texto"].iloc[0]
+
+        df = buscar_versiculos_avancada(conn, ["principio", "terra"], "E")
+        assert list(df["Versículo"]) == [1]
+
+
+def test_fallback_like_usa_texto_normalizado(conexao):
+    # Sem a tabela-sombra, o LIKE compara pela função normalizar_texto
+    for termo in ("principio", "ceus"):
+        df = buscar_versiculos(conexao, termo=termo)
+        assert list(df["Texto"]) == ["No princípio criou Deus os céus e a terra."]
+    df = buscar_versiculos_avancada(conexao, ["No principio"], busca_exata=True)
+    assert df["Versículo"].tolist() == [1]
+
+    criar_texto_normalizado(conexao)
+    df = buscar_versiculos(conexao, termo="ceus")
+    assert list(df["Texto"]) == ["No princípio criou Deus os céus e a terra."]
+
+    df = buscar_versiculos_avancada(conexao, ["Ceus", "vazia"], "OU")
+    assert set(df["Versículo"]) == {1, 2}
+
+
+def test_texto_normalizado_acompanha_edicoes(conexao):
+    criar_texto_normalizado(conexao)
+    conexao.execute(
+        "UPDATE verse SET text = 'A terra era sem ordem e vazia.' WHERE verse = 2"
+    )
+    conexao.execute(
+        "INSERT INTO verse (book_id, chapter, verse, text) "
+        "VALUES (2, 3, 18, 'Quem crê não é condenado.')"
+    )
+    conexao.execute("DELETE FROM verse WHERE verse = 17")
+    conexao.commit()
+
+    linhas = conexao.execute("SELECT count(*) FROM verse_norm").fetchone()[0]
+    assert linhas == 2  # alterado, inserido e excluído foram descartados
+    assert buscar_versiculos(conexao, termo="forma").empty
+    assert buscar_versiculos(conexao, termo="ordem")["Versículo"].tolist() == [2]
+    assert buscar_versiculos(conexao, termo="condenado")["Versículo"].tolist() == [18]
+    assert buscar_versiculos(conexao, termo="enviou").empty
+
+
+def test_criar_indice_fts_recria_tokenizer_antigo(conexao):
+    conexao.execute(
+        "CREATE VIRTUAL TABLE verse_fts USING fts5("
+        "text, content='verse', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 0')"
+    )
+    criar_indice_fts(conexao)
+    sql = conexao.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'verse_fts'"
+    ).fetchone()[0]
+    assert "remove_diacritics 2" in sql
+
+
+def test_localizador_termos_uma_passada():
+    localizador = LocalizadorTermos(["amor", "amor de Deus", "de Deus pai", "mund"])
+    texto = "O Amor de Deus Pai, e o mundo."
+
+    ocorrencias = sorted(localizador.ocorrencias(texto))
+    trechos = [(i, texto[ini:fim]) for i, ini, fim in ocorrencias]
+    # Termos sobrepostos são todos reportados; "mund" não casa com "mundo"
+    assert trechos == [(0, "Amor"), (1, "Amor de Deus"), (2, "de Deus Pai")]
+
+    assert localizador.contagens(texto) == [1, 1, 1, 0]
+    assert localizador.algum(texto)
+    assert not localizador.todos(texto)
+    assert LocalizadorTermos(["fe", "graca"]).todos("Pela graça, mediante a fé")
+
+
+def test_busca_avancada_fallback_com_localizador(conexao):
+    df = buscar_versiculos_avancada(
+        conexao, ["Deus enviou", "terra"], operador="OU"
+    )
+    assert set(df["Versículo"]) == {1, 2, 17}
+
+
+def test_indice_consulta_booleana_por_mascaras(conexao):
+    indice = IndiceInvertido.construir(conexao)
+    deus, mundo, amou = (indice.mascara(t) for t in ["deus", "mundo", "amou"])
+
+    assert indice.consultar([deus, mundo], "E").tolist() == [2, 3]
+    assert indice.consultar([amou, indice.mascara("vazia")], "OU").tolist() == [1, 2]
+    assert indice.consultar([deus], excluir=[amou]).tolist() == [0, 3]
+    assert indice.consultar([deus], testamento_id=2).tolist() == [2, 3]
+    assert indice.consultar([deus], livro_id=1).tolist() == [0]
+    assert indice.faixas_livro == {1: (0, 2), 2: (2, 4)}
+
+    # Máscaras em cache são compartilhadas e não podem ser alteradas
+    assert indice.mascara("deus") is deus
+    assert not deus.flags.writeable
+
+
+def test_indice_posicional_frase_e_proximidade(conexao):
+    indice = IndiceInvertido.construir(conexao)
+    assert indice.frase(["deus", "amou"]).tolist() == [2]
+    assert indice.frase(["amou", "deus"]).tolist() == []
+    # Jo 3:16: 2 palavras entre "Deus" e "mundo"; Jo 3:17: 4 palavras
+    assert indice.proximos(["deus", "mundo"], 2).tolist() == [2]
+    assert indice.proximos(["mundo", "deus"], 4).tolist() == [2, 3]
+    assert indice.proximos(["deus", "mundo"], 1).tolist() == []
+
+
+def test_radical_rslp_agrupa_variacoes():
+    assert {radical(p) for p in ["amar", "amou", "amara", "amando"]} == {"am"}
+    assert radical("coracoes") == radical("coracao")
+    assert radical("deus") == "deus"
+    assert radical("jesus") == "jesus"
+
+    # Exceções do RSLP: o substantivo não vira o radical de outra palavra
+    assert radical("amor") == radical("amores") != radical("amar")
+    assert radical("coracoes") != radical("cor")
+    assert radical("arvores") == radical("arvore")
+    assert radical("reis") == radical("rei") == "rei"
+    assert radical("leis") == radical("lei")
+    assert radical("frequente") == "frequent"
+
+
+def test_tabelas_do_stemmer_normalizadas_e_sem_repeticao():
+    # As regras comparam com o texto normalizado: exceções com acento
+    # nunca casariam, e sufixos repetidos nunca seriam alcançados
+    for regras in (
+        stemmer._PLURAL, stemmer._FEMININO, stemmer._AUMENTATIVO,
+        stemmer._ADVERBIO, stemmer._SUBSTANTIVO, stemmer._VERBO,
+        stemmer._VOGAL,
+    ):
+        sufixos = [sufixo for sufixo, *_ in regras]
+        assert len(sufixos) == len(set(sufixos))
+        for _, _, _, excecoes in regras:
+            assert all(normalizar_texto(e) == e for e in excecoes)
+
+
+def test_busca_avancada_com_exclusao_nos_tres_caminhos(
+    conexao, conexao_arquivo, conexao_fts
+):
+    casos = [
+        (dict(termos=["Deus", "-mundo"]), [1]),
+        (dict(termos=["terra", "Deus", "-mundo"], operador="OU"), [1, 2]),
+        (dict(termos=["Deus", "-am*"]), [1, 17]),
+        (dict(termos=["Deus enviou", "-filho"], busca_exata=True), []),
+        (dict(termos=["-mundo"]), []),
+    ]
+    for conn in (conexao, conexao_arquivo, conexao_fts):
+        for parametros, esperado in casos:
+            df = buscar_versiculos_avancada(conn, **parametros)
+            assert df["Versículo"].tolist() == esperado, (conn, parametros)
+
+    pagina, _ = buscar_versiculos_avancada_paginado(
+        conexao_arquivo, ["Deus", "-mundo"]
+    )
+    assert pagina["Versículo"].tolist() == [1]
+    for conn in (conexao, conexao_arquivo):
+        (lote,) = buscar_lote(conn, [{"termos": ["Deus", "-amou"]}])
+        assert lote["Versículo"].tolist() == [1, 17]
+
+
+def test_busca_regex_filtrada_no_sqlite(conexao, conexao_arquivo, caminho_banco):
+    conn = database.conectar_banco(caminho_banco)
+    try:
+        assert conn.execute(
+            "SELECT count(*) FROM verse WHERE text REGEXP ?", [r"\bdeus\b"]
+        ).fetchone() == (3,)
+    finally:
+        conn.close()
+
+    for conn in (conexao, conexao_arquivo):
+        df = buscar_versiculos_avancada(
+            conn, [r"\bDeus (amou|enviou)\b"], operador="REGEX", destaques=True
+        )
+        assert df["Versículo"].tolist() == [16, 17]
+        assert _trechos(df) == [["Deus amou"], ["Deus enviou"]]
+
+        df = buscar_versiculos_avancada(
+            conn, [r"terra\.$"], operador="REGEX", testamento_id=1
+        )
+        assert df["Versículo"].tolist() == [1]
+
+        with pytest.raises(ValueError):
+            buscar_versiculos_avancada(conn, ["(deus"], operador="REGEX")
+        # Frase exata não se combina com REGEX, em nenhuma das entradas
+        with pytest.raises(ValueError):
+            buscar_versiculos_avancada(
+                conn, ["Deus amou"], operador="REGEX", busca_exata=True
+            )
+        with pytest.raises(ValueError):
+            buscar_versiculos_avancada_paginado(
+                conn, ["Deus amou"], operador="REGEX", busca_exata=True
+            )
+        with pytest.raises(ValueError):
+            buscar_lote(
+                conn,
+                [{"termos": "Deus amou", "operador": "REGEX", "busca_exata": True}],
+            )
+
+        pagina, proximo = buscar_versiculos_avancada_paginado(
+            conn, [r"\bDeus (amou|enviou)\b"], operador="REGEX", tamanho_pagina=1
+        )
+        assert pagina["Versículo"].tolist() == [16] and proximo is not None
+
+        regex, simples = buscar_lote(
+            conn,
+            [
+                {"termos": [r"-?\bdeus\b"], "operador": "regex", "livro_id": 2},
+                "Deus",
+            ],
+        )
+        assert regex["Versículo"].tolist() == [16, 17]
+        assert simples["Versículo"].tolist() == [1, 16, 17]
+
+
+def test_busca_regex_catastrofica_respeita_limite(conexao, monkeypatch):
+    monkeypatch.setattr(database, "LIMITE_TEMPO_BUSCA", 0.3)
+    conexao.execute(
+        "INSERT INTO verse (book_id, chapter, verse, text) VALUES (1, 1, 2, ?)",
+        ["a" * 80 + "b"],
+    )
+
+    inicio = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        buscar_versiculos_avancada(conexao, [r"(a|aa)+$"], operador="REGEX")
+    assert time.perf_counter() - inicio < 2
+
+    with pytest.raises(ValueError):
+        buscar_versiculos_avancada(
+            conexao, ["a" * (database.MAX_TAMANHO_REGEX + 1)], operador="REGEX"
+        )
+
+
+def test_pool_conexoes_somente_leitura_reaproveitadas(caminho_banco):
+    pool = PoolConexoes(inicializar=database.registrar_regexp)
+    try:
+        conn = pool.obter(caminho_banco)
+        assert pool.obter(caminho_banco) is conn
+        assert conn.execute("PRAGMA query_only").fetchone() == (1,)
+        assert conn.execute("PRAGMA temp_store").fetchone() == (2,)
+        assert conn.execute(
+            "SELECT count(*) FROM verse WHERE text REGEXP 'deus'"
+        ).fetchone() == (3,)
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM verse")
+
+        # Outra thread recebe conexão própria e a devolve ao terminar
+        outras = []
+        for _ in range(2):
+            thread = threading.Thread(
+                target=lambda: outras.append(pool.obter(caminho_banco))
+            )
+            thread.start()
+            thread.join()
+        assert outras[0] is not conn and outras[1] is outras[0]
+        assert pool.abertas == 2 and pool.reaproveitadas == 1
+
+        # Conexão fechada por engano ou arquivo alterado: nova conexão
+        conn.close()
+        nova = pool.obter(caminho_banco)
+        assert nova is not conn
+        assert nova.execute("SELECT count(*) FROM verse").fetchone() == (4,)
+        info = os.stat(caminho_banco)
+        os.utime(caminho_banco, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+        assert pool.obter(caminho_banco) is not nova
+    finally:
+        pool.fechar()
+
+
+def test_obter_conexao_arquivo_inexistente(tmp_path):
+    caminho = tmp_path / "NAO_EXISTE.sqlite"
+    with pytest.raises(OSError):
+        database.obter_conexao(str(caminho))
+    assert not caminho.exists()
+
+
+def test_varredura_interrompida_pelo_limite_de_tempo(conexao):
+    consulta = """
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n)
+        SELECT count(*) FROM n
+    """
+    with pytest.raises(TimeoutError):
+        with database._limite_tempo(conexao, 0.01):
+            conexao.execute(consulta).fetchone()
+
+    # O handler é removido ao sair do bloco
+    assert conexao.execute("SELECT count(*) FROM verse").fetchone() == (4,)
+
+
+def test_buscar_lote_igual_as_buscas_individuais(conexao, conexao_arquivo):
+    consultas = [
+        "Deus",
+        "salv*",
+        {"termos": "terra", "testamento_id": 1},
+        {"termos": ["Deus enviou", "terra"], "operador": "OU"},
+        {"termos": ["mundo", "deus"], "operador": "PERTO", "distancia": 2},
+        {"termos": "Deus amou", "busca_exata": True},
+        {"termos": ""},
+    ]
+    esperados = [[1, 16, 17], [], [1, 2], [1, 2, 17], [16], [16], []]
+
+    for conn in (conexao, conexao_arquivo):
+        resultados = buscar_lote(conn, consultas)
+        assert [r["Versículo"].tolist() for r in resultados] == esperados
+        assert list(resultados[0].columns) == [
+            "Livro", "Capítulo", "Versículo", "Texto"
+        ]
+
+    individual = buscar_versiculos_avancada(
+        conexao_arquivo, ["Deus enviou", "terra"], operador="OU"
+    )
+    pd.testing.assert_frame_equal(buscar_lote(conexao_arquivo, consultas)[3], individual)
+
+    with pytest.raises(ValueError):
+        buscar_lote(conexao, [{"termos": "fé", "operadr": "E"}])
+
+
+def test_resultados_em_arrow_iguais_ao_pandas(conexao, conexao_arquivo):
+    tabela = carregar_versiculos(conexao, 2, 3, formato="arrow")
+    assert isinstance(tabela, pa.Table)
+    pd.testing.assert_frame_equal(
+        tabela.to_pandas(), carregar_versiculos(conexao, 2, 3)
+    )
+
+    for conn in (conexao, conexao_arquivo):
+        tabela = buscar_versiculos(conn, "Deus", formato="arrow", destaques=True)
+        esperado = buscar_versiculos(conn, "Deus", destaques=True)
+        assert tabela.column_names == list(esperado.columns)
+        assert tabela.column("Versículo").to_pylist() == [1, 16, 17]
+        assert [
+            [tuple(t) for t in trechos]
+            for trechos in tabela.column("Destaques").to_pylist()
+        ] == esperado["Destaques"].tolist()
+
+    vazia = buscar_versiculos_avancada(conexao_arquivo, ["inexistente"], formato="arrow")
+    assert vazia.num_rows == 0
+    assert vazia.schema.field("Texto").type == pa.string()
+
+    with pytest.raises(ValueError):
+        buscar_versiculos(conexao, "Deus", formato="polars")
+
+
+@pytest.mark.parametrize(
+    "texto, esperado",
+    [
+        ("Jo 3:16", (43, 3, 16, 16)),
+        ("Jó 1", (18, 1, None, None)),
+        ("Sl 23", (19, 23, None, None)),
+        ("Rm 8:28-39", (45, 8, 28, 39)),
+        ("1 Co 13", (46, 13, None, None)),
+        ("I Samuel 3.4", (9, 3, 4, 4)),
+        ("Apoc 22:21", (66, 22, 21, 21)),
+    ],
+)
+def test_interpretar_referencia(texto, esperado):
+    referencia = interpretar_referencia(texto)
+    assert (
+        referencia["livro"],
+        referencia["capitulo"],
+        referencia["inicio"],
+        referencia["fim"],
+    ) == esperado
+
+
+@pytest.mark.parametrize("texto", ["amor", "amor 2", "Ju 1", "Jo 3:17-16", ""])
+def test_interpretar_referencia_rejeita_termos(texto):
+    assert interpretar_referencia(texto) is None
+
+
+def test_buscar_referencia(conexao):
+    assert buscar_referencia(conexao, "Jo 3:16")["Versículo"].tolist() == [16]
+    assert buscar_referencia(conexao, "João 3")["Versículo"].tolist() == [16, 17]
+    assert buscar_referencia(conexao, "Gn 1:1-2")["Versículo"].tolist() == [1, 2]
+    # Livro que não existe no banco de teste
+    assert buscar_referencia(conexao, "Ex 1").empty
+    assert buscar_referencia(conexao, "amor de Deus") is None
+
+
+def test_buscar_referencia_resolve_livros_uma_vez_por_versao(
+    conexao_arquivo, monkeypatch
+):
+    chamadas = []
+    resolver = database.resolver_livro
+
+    def contar(nome):
+        chamadas.append(nome)
+        return resolver(nome)
+
+    monkeypatch.setattr(database, "resolver_livro", contar)
+    assert buscar_referencia(conexao_arquivo, "Jo 3:16")["Versículo"].tolist() == [16]
+    assert buscar_referencia(conexao_arquivo, "Gn 1")["Versículo"].tolist() == [1, 2]
+    # Os nomes do banco foram resolvidos só na primeira referência
+    assert sorted(chamadas) == ["Gênesis", "João"]
+
+
+def test_busca_por_radical_no_indice(conexao, conexao_arquivo):
+    indice = IndiceInvertido.construir(conexao)
+    assert indice.variantes("amar") == ["amou"]
+    assert indice.posting_radical("amando").tolist() == [2]
+    assert indice.frase(["deus", "amar"], por_radical=True).tolist() == [2]
+    assert indice.proximos(["mundos", "deus"], 2, por_radical=True).tolist() == [2]
+    assert indice.mascara("amar", por_radical=True) is indice.mascara(
+        "amou", por_radical=True
+    )
+
+    assert buscar_versiculos(conexao_arquivo, "amar").empty
+    df = buscar_versiculos(conexao_arquivo, "amar", por_radical=True, destaques=True)
+    assert df["Versículo"].tolist() == [16]
+    inicio, fim, termo = df["Destaques"][0][0]
+    assert (df["Texto"][0][inicio:fim], termo) == ("amou", 0)
+
+    df = buscar_versiculos_avancada(
+        conexao_arquivo, ["Deus amar"], busca_exata=True, por_radical=True
+    )
+    assert df["Versículo"].tolist() == [16]
+
+    # As versões paginadas (usadas pelas páginas) aceitam as variações
+    pagina, _ = buscar_versiculos_paginado(conexao_arquivo, "amar", por_radical=True)
+    assert pagina["Versículo"].tolist() == [16]
+    pagina, _ = buscar_versiculos_avancada_paginado(
+        conexao_arquivo, ["Deus amar"], busca_exata=True, por_radical=True
+    )
+    assert pagina["Versículo"].tolist() == [16]
+
+
+def test_busca_perto_igual_nos_tres_caminhos(conexao, conexao_arquivo, conexao_fts):
+    for conn in (conexao, conexao_arquivo, conexao_fts):
+        for distancia, esperado in [(1, set()), (2, {16}), (4, {16, 17})]:
+            df = buscar_versiculos_avancada(
+                conn, ["Deus", "mundo"], operador="PERTO", distancia=distancia
+            )
+            assert set(df["Versículo"]) == esperado
+
+    # Frase exata pelo índice posicional respeita a ordem das palavras
+    df = buscar_versiculos_avancada(conexao_arquivo, ["amou Deus"], busca_exata=True)
+    assert df.empty
+
+
+def test_indice_expande_curingas(conexao):
+    indice = IndiceInvertido.construir(conexao)
+    assert indice.expandir("mund*") == ["mundo"]
+    assert indice.expandir("terr?") == ["terra"]
+    assert indice.expandir("c*s") == ["ceus"]
+    assert indice.posting_curinga("porq*").tolist() == [2, 3]
+
+
+def test_busca_curinga_igual_nos_tres_caminhos(conexao, conexao_arquivo, conexao_fts):
+    for conn in (conexao, conexao_arquivo, conexao_fts):
+        df = buscar_versiculos(conn, "mund*")
+        assert set(df["Versículo"]) == {16, 17}
+        df = buscar_versiculos(conn, "terr?")
+        assert set(df["Versículo"]) == {1, 2}
+        df = buscar_versiculos(conn, "c?us")
+        assert set(df["Versículo"]) == {1}
+
+        df = buscar_versiculos_avancada(conn, ["Deus", "env*"], operador="E")
+        assert set(df["Versículo"]) == {17}
+        df = buscar_versiculos_avancada(conn, ["vaz*", "am?u"], operador="OU")
+        assert set(df["Versículo"]) == {2, 16}
+
+
+def test_sugestoes_voce_quis_dizer(conexao, conexao_arquivo):
+    indice = obter_indice(conexao_arquivo)
+    assert indice.similares("munndo") == ["mundo"]
+    assert indice.similares("fe") == []  # curta demais para corrigir
+
+    assert buscar_versiculos(conexao_arquivo, "ceos").empty
+    assert sugerir_termos(conexao_arquivo, "ceos") == ["céus"]
+    assert sugerir_termos(conexao_arquivo, "Deus amoou") == ["deus amou"]
+    # Termo encontrado ou sem índice em memória: nada a sugerir
+    assert sugerir_termos(conexao_arquivo, "mundo") == []
+    assert sugerir_termos(conexao, "ceos") == []
+
+
+def test_relevancia_bm25_top_k_nos_tres_caminhos(conexao, conexao_arquivo, conexao_fts):
+    for conn in (conexao, conexao_arquivo, conexao_fts):
+        # Mesma frequência: versículos mais curtos pontuam mais
+        df = buscar_versiculos(conn, "Deus", relevancia=True, limite=2)
+        assert df["Versículo"].tolist() == [17, 16]
+        assert df["Relevância"].is_monotonic_decreasing
+
+        df = buscar_versiculos_avancada(
+            conn, ["terra", "mundo"], operador="OU", relevancia=True, limite=10
+        )
+        assert len(df) == 4
+        assert set(df["Versículo"].head(3)) == {2, 16, 17}
+
+
+def test_indice_frequencias_e_melhores(conexao):
+    indice = IndiceInvertido.construir(conexao)
+    assert indice.comprimentos.tolist() == [9, 7, 8, 7]
+    posicoes = np.arange(4, dtype=np.uint32)
+    assert indice.frequencias("deus", posicoes).tolist() == [1, 0, 1, 1]
+    melhores = indice.melhores(["deus"], indice.posting("deus"), 2)
+    assert [posicao for posicao, _ in melhores] == [3, 2]
+
+
+def test_paginacao_por_cursor_nos_tres_caminhos(conexao, conexao_arquivo, conexao_fts):
+    for conn in (conexao, conexao_arquivo, conexao_fts):
+        pagina, cursor = buscar_versiculos_paginado(conn, "Deus", tamanho_pagina=2)
+        assert pagina["Versículo"].tolist() == [1, 16]
+        assert cursor is not None
+
+        pagina, cursor = buscar_versiculos_paginado(
+            conn, "Deus", cursor=cursor, tamanho_pagina=2
+        )
+        assert pagina["Versículo"].tolist() == [17]
+        assert cursor is None
+
+        lotes = list(
+            iterar_paginas(
+                buscar_versiculos_avancada_paginado,
+                conn,
+                ["terra", "mundo"],
+                operador="OU",
+                tamanho_pagina=1,
+            )
+        )
+        assert [lote["Versículo"].tolist() for lote in lotes] == [[1], [2], [16], [17]]
+
+
+def test_cursor_opaco_e_validado():
+    cursor = codificar_cursor(43, 3, 16)
+    assert "43" not in cursor
+    assert decodificar_cursor(cursor) == (43, 3, 16)
+    with pytest.raises(ValueError):
+        decodificar_cursor("nao-e-um-cursor")
+
+
+def test_cache_resultados_lru_limitado_por_bytes():
+    df = pd.DataFrame({"Texto": ["x" * 100] * 10})
+    tamanho = int(df.memory_usage(deep=True).sum())
+    cache = CacheResultados(max_bytes=2 * tamanho)
+
+    cache.guardar("a", df)
+    cache.guardar("b", df)
+    assert cache.obter("a") is not None  # "a" passa a ser o mais recente
+    cache.guardar("c", df)  # estoura o limite: sai "b"
+
+    assert cache.obter("b") is None
+    assert cache.obter("c") is not None
+    assert cache.estatisticas()["entradas"] == 2
+    assert (cache.acertos, cache.falhas) == (2, 1)
+
+    # Quem recebe o resultado pode alterá-lo sem afetar o cache
+    copia = cache.obter("c")
+    copia["Texto"] = "alterado"
+    assert cache.obter("c")["Texto"].iloc[0] == "x" * 100
+
+
+def test_cache_resultados_copia_e_mede_destaques():
+    trechos = [[(i, i + 4) for i in range(0, 400, 5)]] * 10
+    df = pd.DataFrame({"Texto": ["x" * 100] * 10, "Destaques": trechos})
+    cache = CacheResultados()
+
+    cache.guardar("a", df)
+    sem_conteudo = int(df.memory_usage(deep=True).sum())
+    assert cache.estatisticas()["bytes"] > sem_conteudo + 10 * 80 * 56
+
+    # Nem quem guardou nem quem recebeu alteram as listas em cache
+    df["Destaques"].iloc[0].append((0, 1))
+    copia = cache.obter("a")
+    copia["Destaques"].iloc[1].clear()
+    assert [len(t) for t in cache.obter("a")["Destaques"]] == [80] * 10
+
+
+def test_buscas_usam_cache_por_versao(conexao, conexao_arquivo):
+    buscar_versiculos(conexao_arquivo, "Deus")
+    df = buscar_versiculos(conexao_arquivo, "DEUS")  # mesma busca normalizada
+    assert CACHE_RESULTADOS.acertos == 1
+    assert len(df) == 3
+
+    buscar_versiculos_avancada(conexao_arquivo, ["Deus", "mundo"], operador="OU")
+    buscar_versiculos_avancada(conexao_arquivo, ["Deus", "mundo"], operador="E")
+    assert CACHE_RESULTADOS.acertos == 1  # operador faz parte da chave
+
+    # Arquivo alterado: nova impressão digital, nada de resultado antigo
+    conexao_arquivo.execute(
+        "INSERT INTO verse (book_id, chapter, verse, text) "
+        "VALUES (2, 3, 18, 'Deus não enviou o Filho para condenar.')"
+    )
+    conexao_arquivo.commit()
+    assert len(buscar_versiculos(conexao_arquivo, "Deus")) == 4
+
+    # Bancos em memória não entram no cache
+    entradas = len(CACHE_RESULTADOS)
+    buscar_versiculos(conexao, "Deus")
+    assert len(CACHE_RESULTADOS) == entradas
+
+
+def test_buscar_em_todas_versoes(tmp_path):
+    bancos = {}
+    for versao in ["AAA", "BBB"]:
+        bancos[versao] = tmp_path / f"{versao}.sqlite"
+        criar_banco_teste(str(bancos[versao])).close()
+
+    conn = sqlite3.connect(bancos["BBB"])
+    conn.execute("UPDATE verse SET text = 'Sem a palavra.' WHERE verse = 17")
+    conn.commit()
+    conn.close()
+
+    bancos["QUEBRADO"] = tmp_path / "QUEBRADO.sqlite"
+    bancos["QUEBRADO"].write_text("não é um banco")
+
+    contagens, resultados = buscar_em_todas_versoes("mundo", bancos=bancos)
+    assert contagens == {"AAA": 2, "BBB": 1}
+    assert list(resultados.columns) == [
+        "Versão", "Livro", "Capítulo", "Versículo", "Texto"
+    ]
+    assert resultados.groupby("Versão")["Versículo"].apply(list).to_dict() == {
+        "AAA": [16, 17],
+        "BBB": [16],
+    }
+
+
+def test_autocompletar_por_frequencia(conexao, conexao_arquivo):
+    indice = obter_indice(conexao_arquivo)
+    # "porque" (2x) vem antes de "principio" (1x)
+    assert indice.completar("p") == ["porque", "principio"]
+    assert indice.completar("PRÍN") == ["principio"]
+    assert indice.forma("principio") == "princípio"
+    assert indice.completar("x") == []
+
+    assert autocompletar(conexao_arquivo, "No prin") == ["No princípio"]
+    assert autocompletar(conexao_arquivo, "mu", limite=1) == ["mundo"]
+    # Palavra já terminada, prefixo curto ou banco sem índice
+    assert autocompletar(conexao_arquivo, "mundo ") == []
+    assert autocompletar(conexao_arquivo, "m") == []
+    assert autocompletar(conexao, "mu") == []
+
+
+def _trechos(df):
+    return [
+        [texto[inicio:fim] for inicio, fim, _ in destaques]
+        for texto, destaques in zip(df["Texto"], df["Destaques"])
+    ]
+
+
+def test_destaques_iguais_nos_tres_caminhos(conexao, conexao_arquivo, conexao_fts):
+    for conn in (conexao, conexao_arquivo, conexao_fts):
+        df = buscar_versiculos(conn, "deus", destaques=True)
+        assert _trechos(df) == [["Deus"], ["Deus"], ["Deus"]]
+
+        df = buscar_versiculos(conn, "amou o mundo", destaques=True)
+        assert _trechos(df) == [["amou o mundo"]]
+
+        df = buscar_versiculos(conn, "c?us", destaques=True)
+        assert _trechos(df) == [["céus"]]
+
+        df = buscar_versiculos_avancada(
+            conn, ["mundo", "Deus"], operador="PERTO", destaques=True
+        )
+        assert _trechos(df) == [["Deus", "mundo"], ["Deus", "mundo"]]
+
+        df = buscar_versiculos(
+            conn, "Deus", relevancia=True, limite=1, destaques=True
+        )
+        assert df["Destaques"].tolist() == [[(7, 11, 0)]]
+
+
+def test_destacar_texto_com_trechos_da_busca():
+    texto = "Porque Deus amou o <mundo>."
+    assert destacar_texto(texto, [(7, 11)], "**", "**") == (
+        "Porque **Deus** amou o <mundo>."
+    )
+    assert destacar_texto(
+        texto, [(7, 11), (19, 26)], "<mark>", "</mark>", escapar=html.escape
+    ) == "Porque <mark>Deus</mark> amou o <mark>&lt;mundo&gt;</mark>."
+    assert destacar_texto(texto, None, "**", "**") == texto
+    # Trechos de termos diferentes que se sobrepõem viram uma marcação
+    assert destacar_texto(
+        texto, [(7, 11, 0), (7, 16, 1), (12, 16, 2)], "**", "**"
+    ) == "Porque **Deus amou** o <mundo>."
+
+
+def test_destaques_valem_para_o_texto_gravado_fora_de_nfc(conexao):
+    nfd = unicodedata.normalize("NFD", "No princípio criou Deus os céus e a terra.")
+    conexao.execute("UPDATE verse SET text = ? WHERE verse = 1", [nfd])
+    criar_texto_normalizado(conexao)
+    # O otimizador não regrava o texto (nem muda a impressão digital)
+    (texto,) = conexao.execute("SELECT text FROM verse WHERE verse = 1").fetchone()
+    assert texto == nfd
+
+    indice = IndiceInvertido.construir(conexao)
+    (no_indice,) = indice.trechos(
+        [(0, ["principio"]), (1, ["ceus"]), (2, ["deus", "os", "ceus"])],
+        np.array([0], dtype=np.uint32),
+    )
+    localizados = localizar_trechos(("principio", "c?us", "Deus os céus"))(nfd)
+    assert no_indice == localizados
+    assert [(nfd[i:f], t) for i, f, t in no_indice] == [
+        (unicodedata.normalize("NFD", "princípio"), 0),
+        (unicodedata.normalize("NFD", "Deus os céus"), 2),
+        (unicodedata.normalize("NFD", "céus"), 1),
+    ]
+    assert destacar_texto(nfd, no_indice, "**", "**") == unicodedata.normalize(
+        "NFD", "No **princípio** criou **Deus os céus** e a terra."
+    )
+
+
+def test_validacao_da_busca_aceita_curingas_e_referencias():
+    for termo in ("salv*", "am?r", "Jo 3:16", "Rm 8:28-39", "amor -irmão"):
+        assert validate_search_input(termo) == (True, "")
+    assert not validate_search_input("amor'; DROP TABLE verse")[0]